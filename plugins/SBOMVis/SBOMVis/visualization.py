@@ -47,7 +47,7 @@ def generate_dependency_graph(
     sbomDict: SBOM,
     enableCulling: bool = False,
 ) -> networkx.graph:
-    g = sbomDict["sbom"].graph
+    g = sbomDict["sbom"].graph.to_networkx()
 
     # Add attributes to nodes
     for nodeID, attrib in g.nodes(data=True):
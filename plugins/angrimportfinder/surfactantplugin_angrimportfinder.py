@@ -14,6 +14,12 @@ import surfactant.plugin
 from surfactant.sbomtypes import SBOM, Software
 
 
+@surfactant.plugin.hookimpl
+def path_dependent_extraction() -> bool:
+    # the name of each copy of a file is added to the output file
+    return True
+
+
 @surfactant.plugin.hookimpl(specname="extract_file_info")
 # extract_strings(sbom: SBOM, software: Software, filename: str, filetype: str):
 # def angrimport_finder(filename: str, filetype: str, filehash: str):
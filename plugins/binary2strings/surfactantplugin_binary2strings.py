@@ -4,23 +4,45 @@
 # SPDX-License-Identifier: MIT
 import json
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import binary2strings as b2s
 from loguru import logger
 
 import surfactant.plugin
+from surfactant.fileinfo import FileContent
 from surfactant.sbomtypes import SBOM, Software
 
 
+def read_file_data(filename: Path, file_content: Optional[FileContent] = None) -> bytes:
+    """Get the contents of a file, using the shared file contents if available."""
+    if file_content is not None:
+        return file_content.read()
+    with open(filename, "rb") as f_bin:
+        return f_bin.read()
+
+
+@surfactant.plugin.hookimpl
+def path_dependent_extraction() -> bool:
+    # the name of each copy of a file is added to the output file
+    return True
+
+
 @surfactant.plugin.hookimpl(specname="extract_file_info")
-def extract_strings(sbom: SBOM, software: Software, filename: str, filetype: List[str]):
+def extract_strings(
+    sbom: SBOM,
+    software: Software,
+    filename: str,
+    filetype: List[str],
+    file_content: Optional[FileContent],
+):
     """
     Extract ASCII strings from a binary file using binary2strings.
     :param sbom(SBOM): The SBOM that the software entry/file is being added to. Can be used to add observations or analysis data.
     :param software(Software): The software entry associated with the file to extract information from.
     :param filename (str): The full path to the file to extract information from.
     :param filetype (List[str]): File type information based on magic bytes.
+    :param file_content (Optional[FileContent]): Shared contents of the file, used instead of reading it again.
     """
     shaHash = str(software.sha256)
     min_len = 4
@@ -55,13 +77,12 @@ def extract_strings(sbom: SBOM, software: Software, filename: str, filetype: Lis
 
             existing_data["strings"] = []
             # Extract and write strings using binary2strings
-            with open(filename, "rb") as f_bin:
-                data = f_bin.read()
-                for string, _encoding, _span, _is_interesting in b2s.extract_all_strings(
-                    data, only_interesting=True
-                ):
-                    if len(string) >= min_len:
-                        existing_data["strings"].append(string)
+            data = read_file_data(filename, file_content)
+            for string, _encoding, _span, _is_interesting in b2s.extract_all_strings(
+                data, only_interesting=True
+            ):
+                if len(string) >= min_len:
+                    existing_data["strings"].append(string)
             # Write the string_dict to the output JSON file
             with open(output_name, "w") as json_file:
                 json.dump(existing_data, json_file, indent=4)
@@ -79,14 +100,13 @@ def extract_strings(sbom: SBOM, software: Software, filename: str, filetype: Lis
         string_dict["strings"] = []
 
         # Extract and write strings using binary2strings
-        with open(filename, "rb") as f_bin:
-            data = f_bin.read()
-            for string, _encoding, _span, _is_interesting in b2s.extract_all_strings(
-                data, only_interesting=True
-            ):
-                # you might adjust the condition below to filter strings based on your needs
-                if len(string) >= min_len:
-                    string_dict["strings"].append(string)
+        data = read_file_data(filename, file_content)
+        for string, _encoding, _span, _is_interesting in b2s.extract_all_strings(
+            data, only_interesting=True
+        ):
+            # you might adjust the condition below to filter strings based on your needs
+            if len(string) >= min_len:
+                string_dict["strings"].append(string)
 
         # Write the string_dict to the output JSON file
         with open(output_path, "w") as json_file:
@@ -6,7 +6,7 @@
 
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 try:
     import ssdeep
@@ -18,6 +18,7 @@ except ImportError:
 import tlsh
 
 import surfactant.plugin
+from surfactant.fileinfo import FileContent
 from surfactant.sbomtypes import SBOM, Software
 
 
@@ -30,13 +31,20 @@ def do_ssdeep(bin_data: bytes):
 
 
 @surfactant.plugin.hookimpl(specname="extract_file_info")
-def fuzzyhashes(sbom: SBOM, software: Software, filename: str, filetype: List[str]):
+def fuzzyhashes(
+    sbom: SBOM,
+    software: Software,
+    filename: str,
+    filetype: List[str],
+    file_content: Optional[FileContent],
+):
     """
     Generate TLSH and potentially SSDEEP fuzzy hashes for the provided files.
     :param sbom(SBOM): The SBOM that the software entry/file is being added to. Can be used to add observations or analysis data.
     :param software(Software): The software entry associated with the file to extract information from.
     :param filename (str): The full path to the file to extract information from.
     :param filetype (List[str]): File type information based on magic bytes.
+    :param file_content (Optional[FileContent]): Shared contents of the file, used instead of reading it again.
     """
 
     hashdata = [(do_tlsh, "tlsh")]
@@ -51,8 +59,11 @@ def fuzzyhashes(sbom: SBOM, software: Software, filename: str, filetype: List[st
     if all(hashname in existing_data for _, hashname in hashdata):
         # if everything is already in there, we just want to terminate without writing
         return None
-    with open(filename, "rb") as f_bin:
-        bin_data = f_bin.read()
+    if file_content is not None:
+        bin_data = file_content.read()
+    else:
+        with open(filename, "rb") as f_bin:
+            bin_data = f_bin.read()
 
     for hashfunc, hashname in hashdata:
         if hashname in existing_data:
@@ -11,6 +11,7 @@ import sys
 import click
 from loguru import logger
 
+from surfactant.cmd.cache import cache_prune_cmd, cache_stats_cmd
 from surfactant.cmd.cli import (
     handle_cli_add,
     handle_cli_edit,
@@ -29,6 +30,8 @@ from surfactant.cmd.plugin import (
     plugin_uninstall_cmd,
     plugin_update_db_cmd,
 )
+from surfactant.cmd.profile import profile
+from surfactant.cmd.reduce import reduce_command
 from surfactant.cmd.stat import stat
 from surfactant.cmd.tui import tui
 
@@ -71,12 +74,19 @@ def plugin():
     """Manage plugins."""
 
 
+@main.group("cache")
+def cache():
+    """Manage the cache of info extractor results."""
+
+
 # Main Commands
 main.add_command(generate)
 main.add_command(version)
 main.add_command(config)
 main.add_command(stat)
+main.add_command(profile)
 main.add_command(merge_command)
+main.add_command(reduce_command)
 main.add_command(plugin)
 main.add_command(tui)
 
@@ -95,6 +105,10 @@ plugin.add_command(plugin_install_cmd)
 plugin.add_command(plugin_uninstall_cmd)
 plugin.add_command(plugin_update_db_cmd)
 
+# Cache Subcommands
+cache.add_command(cache_stats_cmd)
+cache.add_command(cache_prune_cmd)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,41 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+from typing import Optional
+
+import click
+
+from surfactant.extraction_cache import ExtractionCache
+
+
+@click.command(name="stats")
+def cache_stats_cmd():
+    """Prints statistics on the info extractor result cache."""
+    with ExtractionCache() as cache:
+        stats = cache.stats()
+        click.echo(f"Location: {cache.path}")
+        click.echo(f"Entries: {stats['entries']}")
+        click.echo(
+            f"Size: {stats['size'] / (1024 * 1024):.1f} MiB of {cache.max_size / (1024 * 1024):.1f} MiB"
+        )
+        for plugin_name, count in stats["plugins"].items():
+            click.echo(f"\t{plugin_name}: {count}")
+
+
+@click.command(name="prune")
+@click.option(
+    "--max_size_mb",
+    type=int,
+    default=None,
+    help="Size to reduce the cache to, in MiB; defaults to the cache.max_size_mb setting",
+)
+@click.option("--all", "remove_all", is_flag=True, default=False, help="Remove all cached results")
+def cache_prune_cmd(max_size_mb: Optional[int], remove_all: bool):
+    """Removes the least recently used results from the info extractor result cache."""
+    with ExtractionCache() as cache:
+        if remove_all:
+            removed = cache.clear()
+        else:
+            removed = cache.prune(max_size_mb * 1024 * 1024 if max_size_mb is not None else None)
+        click.echo(f"Removed {removed} cached results")
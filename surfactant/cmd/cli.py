@@ -1,15 +1,21 @@
 import hashlib
+import shutil
 import sys
 from pathlib import Path
+from typing import Iterable, Optional
 
 import click
 from loguru import logger
 
 from surfactant.cmd.cli_commands import Load, Save
 from surfactant.configmanager import ConfigManager
+from surfactant.input_readers import sqlite_reader
+from surfactant.output import sqlite_writer
 from surfactant.plugin.manager import find_io_plugin, get_plugin_manager
+from surfactant.sbomtypes import SBOMStore
 from surfactant.sbomtypes._relationship import Relationship
 from surfactant.sbomtypes._sbom import SBOM
+from surfactant.sbomtypes._sbom_store import PATH_FIELDS
 from surfactant.sbomtypes._software import Software
 
 
@@ -62,11 +68,16 @@ def handle_cli_find(sbom, output_format, input_format, **kwargs):
     pm = get_plugin_manager()
     output_writer = find_io_plugin(pm, output_format, "write_sbom")
     input_reader = find_io_plugin(pm, input_format, "read_sbom")
-    in_sbom = input_reader.read_sbom(sbom)
 
     # Remove None values
     filtered_kwargs = dict({(k, v) for k, v in kwargs.items() if v is not None})
-    out_sbom = cli_find().execute(in_sbom, **filtered_kwargs)
+    if input_reader is sqlite_reader:
+        # only load the entries that could match from the SBOM store
+        with SBOMStore(sbom.name) as store:
+            out_sbom = cli_find().execute_store(store, **filtered_kwargs)
+    else:
+        in_sbom = input_reader.read_sbom(sbom)
+        out_sbom = cli_find().execute(in_sbom, **filtered_kwargs)
     if not out_sbom.software:
         logger.warning("No software matches found with given parameters.")
     output_writer.write_sbom(out_sbom, sys.stdout)
@@ -107,10 +118,17 @@ def handle_cli_add(sbom, output, output_format, input_format, **kwargs):
     pm = get_plugin_manager()
     output_writer = find_io_plugin(pm, output_format, "write_sbom")
     input_reader = find_io_plugin(pm, input_format, "read_sbom")
-    with open(Path(sbom), "r") as f:
-        in_sbom = input_reader.read_sbom(f)
     # Remove None values
     filtered_kwargs = dict({(k, v) for k, v in kwargs.items() if v is not None})
+    if input_reader is sqlite_reader and output_writer is sqlite_writer:
+        # update the SBOM store in place, instead of loading and rewriting all of it
+        if output is not None:
+            shutil.copyfile(sbom, output)
+        with SBOMStore(output or sbom) as store:
+            cli_add().execute_store(store, **filtered_kwargs)
+        return
+    with open(Path(sbom), "r") as f:
+        in_sbom = input_reader.read_sbom(f)
     out_sbom = cli_add().execute(in_sbom, **filtered_kwargs)
     # Write to the input file if no output specified
     if output is None:
@@ -158,6 +176,7 @@ class cli_add:
     camel_case_conversions: dict
     match_functions: dict
     sbom: SBOM
+    store: Optional[SBOMStore] = None
 
     def __init__(self):
         """Initializes the cli_add class"""
@@ -197,22 +216,51 @@ class cli_add:
                 logger.warning(f"Paramter {key} is not supported")
         return self.sbom
 
+    def execute_store(self, store: SBOMStore, **kwargs):
+        """Executes the main functionality of the cli_add class on an SBOM store, changing it in place
+        and only loading the software entries that are changed
+        param: store    The SBOM store to add entries to
+        param: kwargs:  Dictionary of key/value pairs indicating what features to match on
+        """
+        self.store = store
+        return self.execute(SBOM(), **kwargs)
+
     def add_relationship(self, value: dict) -> bool:
-        self.sbom.add_relationship(Relationship(**value))
+        rel = Relationship(**value)
+        if self.store:
+            self.store.add_relationship(rel.xUUID, rel.yUUID, rel.relationship)
+        else:
+            self.sbom.add_relationship(rel)
 
     def add_file(self, path):
-        self.sbom.software.append(Software.create_software_from_file(path))
+        self._add_software(Software.create_software_from_file(path))
 
     def add_entry(self, entry):
-        self.sbom.software.append(Software.from_dict(entry))
+        self._add_software(Software.from_dict(entry))
+
+    def _add_software(self, sw: Software):
+        if self.store:
+            self.store.add_software(sw)
+        else:
+            self.sbom.add_software(sw)
 
     def add_installpath(self, prefixes: tuple):
         cleaned_prefixes = (p.rstrip("/") for p in prefixes)
         containerPathPrefix, installPathPrefix = cleaned_prefixes
-        for sw in self.sbom.software:
+        if self.store:
+            software = self.store.find_software_by_path(
+                "containerPath", containerPathPrefix, match="prefix"
+            )
+        else:
+            software = self.sbom.software
+        for sw in software:
+            changed = False
             for path in sw.containerPath:
                 if containerPathPrefix in path:
                     sw.installPath.append(path.replace(containerPathPrefix, installPathPrefix))
+                    changed = True
+            if changed and self.store:
+                self.store.add_software(sw)
 
 
 class cli_find:
@@ -268,19 +316,55 @@ class cli_find:
         converted_kwargs = self.handle_kwargs(kwargs)
 
         for sw in input_sbom.software:
-            match = True
-            for k, v in converted_kwargs.items():
-                if k == "file":
-                    entry_value = {"sha256": sw.sha256, "sha1": sw.sha1, "md5": sw.md5}
-                else:
-                    entry_value = vars(sw)[k] if k in vars(sw) else None
-                if not self.match_functions[type(entry_value)](entry_value, v):
-                    match = False
-                    break
-            if match:
+            if self.matches(sw, converted_kwargs):
+                self.sbom.add_software(sw)
+        return self.sbom
+
+    def execute_store(self, store: SBOMStore, **kwargs):
+        """Executes the main functionality of the cli_find class on an SBOM store, only loading the
+        entries that could match (found using the indexes for UUIDs, hashes, and paths) from it
+        param: store    The SBOM store to find matches within
+        param: kwargs:  Dictionary of key/value pairs indicating what features to match on
+        """
+        converted_kwargs = self.handle_kwargs(kwargs)
+
+        for sw in self._store_candidates(store, converted_kwargs):
+            if self.matches(sw, converted_kwargs):
                 self.sbom.add_software(sw)
         return self.sbom
 
+    @staticmethod
+    def _store_candidates(store: SBOMStore, converted_kwargs: dict) -> Iterable[Software]:
+        if "UUID" in converted_kwargs:
+            sw = store.get_software(converted_kwargs["UUID"])
+            return [sw] if sw else []
+        if "sha256" in converted_kwargs:
+            return store.find_software_by_hash(sha256=converted_kwargs["sha256"])
+        if "file" in converted_kwargs:
+            return store.find_software_by_hash(**converted_kwargs["file"])
+        # paths match anywhere in a value (see match_array_value), which the path index can't help with
+        for field_name in PATH_FIELDS:
+            if isinstance(converted_kwargs.get(field_name), str):
+                return store.find_software_by_path(
+                    field_name, converted_kwargs[field_name], match="contains"
+                )
+        return store.iter_software()
+
+    def matches(self, sw: Software, converted_kwargs: dict) -> bool:
+        """Checks if a software entry matches all of the given values
+        param: sw                The software entry to check
+        param: converted_kwargs: Dictionary of key/value pairs to match, with keys converted by handle_kwargs
+        returns:                 bool, True if a match, False if not
+        """
+        for k, v in converted_kwargs.items():
+            if k == "file":
+                entry_value = {"sha256": sw.sha256, "sha1": sw.sha1, "md5": sw.md5}
+            else:
+                entry_value = getattr(sw, k, None)
+            if not self.match_functions[type(entry_value)](entry_value, v):
+                return False
+        return True
+
     def match_single_value(self, first, second) -> bool:
         """Matches sbom entry on single value
         param: first   The entry value to match
@@ -1,11 +1,10 @@
-import dataclasses
-import pickle
-from dataclasses import Field
+from pathlib import Path
+from typing import Optional, Union
 
 from loguru import logger
 
 from surfactant.configmanager import ConfigManager
-from surfactant.sbomtypes._sbom import SBOM
+from surfactant.sbomtypes import SBOM, SBOMStore
 
 
 class Cli:
@@ -37,43 +36,32 @@ class Cli:
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
     @staticmethod
-    def serialize(sbom: SBOM) -> str:
-        """Serializes a given sbom.
+    def save_sbom(sbom: SBOM, path: Union[str, Path]) -> None:
+        """Saves an SBOM between cli commands, as an SBOM store (a SQLite database), replacing any SBOM
+        previously saved to the path.
 
         Args:
-            bom (SBOM): An instance of an SBOM to serialize
-
-        Returns:
-            bytes: A binary representation of the serialized SBOM.
+            sbom (SBOM): The SBOM to save.
+            path (Union[str, Path]): Location to save the SBOM to.
         """
-        # NOTE: python pickle cannot pickle MappingProxyType, which is inherently included in the Field type.
-        # Pickling is much faster than converting to json or msgpack (see MR for timings: https://github.com/LLNL/Surfactant/pull/261
-        # To workaround the issue we replace the metadata attribute of the Field type (which is default mappingproxytype) with an empty dict
-        # Upon deserialization, we recreate the class with dataclasses.replace() to ensure the unpickled class instance is intact. Without this,
-        # the class function to_json() and to_dict() does not work as the Field type is no longer recongized.
-        if isinstance(sbom, SBOM):
-            for _, v in sbom.__dataclass_fields__.items():
-                if isinstance(v, Field):
-                    v.metadata = {}
-            return pickle.dumps(sbom)
-        logger.error(f"Could not serialize sbom - {type(sbom)} is not of type SBOM")
-        return None
+        # start from a new file, in case the path holds an SBOM saved by an older version of Surfactant
+        Path(path).unlink(missing_ok=True)
+        with SBOMStore(path) as store:
+            store.save(sbom)
 
     @staticmethod
-    def deserialize(data) -> SBOM:
-        """Deserializes the given data and saves them in the SBOM class instance
+    def load_sbom(path: Union[str, Path]) -> Optional[SBOM]:
+        """Loads an SBOM saved with `save_sbom`.
 
         Args:
-            data (bytes): The data to deserialize into an SBOM type
+            path (Union[str, Path]): Location the SBOM was saved to.
 
         Returns:
-            SBOM: An SBOM instance.
+            Optional[SBOM]: The SBOM, or None if it couldn't be loaded.
         """
         try:
-            sbom = pickle.loads(data)
-            return dataclasses.replace(
-                sbom
-            )  # Create a copy to repopulate anything that got messed up in serialization
-        except pickle.UnpicklingError as e:
-            logger.error(f"Could not deserialize sbom from given data - {e}")
+            with SBOMStore(path) as store:
+                return store.load()
+        except ValueError as e:
+            logger.error(f"Could not load sbom - {e}")
             return None
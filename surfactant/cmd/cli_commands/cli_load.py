@@ -31,6 +31,4 @@ class Load(Cli):
         input_reader = find_io_plugin(pm, self.input_format, "read_sbom")
         self.sbom = input_reader.read_sbom(input_file)
 
-        serialized_sbom = Cli.serialize(self.sbom)
-        with open(Path(self.data_dir, self.sbom_filename), "wb") as f:
-            f.write(serialized_sbom)
+        Cli.save_sbom(self.sbom, Path(self.data_dir, self.sbom_filename))
@@ -2,22 +2,50 @@
 # See the top-level LICENSE file for details.
 #
 # SPDX-License-Identifier: MIT
+# pylint: disable=too-many-lines
+import contextlib
 import os
 import pathlib
 import queue
 import re
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import click
 from loguru import logger
 
 from surfactant import ContextEntry
-from surfactant.cmd.internal.generate_utils import SpecimenContextParamType
+from surfactant.cmd.internal.checkpoint import (
+    CHECKPOINT_BATCH_SIZE,
+    DEFAULT_CHECKPOINT_INTERVAL,
+    Checkpointer,
+    EntryProgress,
+    GenerateState,
+    load_checkpoint,
+)
+from surfactant.cmd.internal.file_walker import FileFilter, walk_dir
+from surfactant.cmd.internal.generate_utils import Shard, ShardParamType, SpecimenContextParamType
+from surfactant.cmd.internal.hash_cache import FileHashCache
+from surfactant.cmd.internal.incremental import FileManifest, ManifestEntry
 from surfactant.configmanager import ConfigManager
-from surfactant.fileinfo import sha256sum
-from surfactant.plugin.manager import call_init_hooks, find_io_plugin, get_plugin_manager
+from surfactant.extraction_cache import ExtractionCache, open_extraction_cache
+from surfactant.extractor_watchdog import ExtractorWatchdog, open_extractor_watchdog
+from surfactant.fileinfo import FileContent
+from surfactant.infoextractors import file_decompression
+from surfactant.plugin.manager import (
+    call_hookimpl,
+    call_init_hooks,
+    find_io_plugin,
+    get_hookimpls_in_call_order,
+    get_plugin_manager,
+    is_hook_implemented,
+)
+from surfactant.profiling import FileProfile, Profiler
 from surfactant.relationships import parse_relationships
-from surfactant.sbomtypes import SBOM, Software
+from surfactant.sbomtypes import SBOM, MetadataSpool, MetadataStore, Software
 
 
 # Converts from a true path to an install path
@@ -28,6 +56,34 @@ def real_path_to_install_path(root_path: str, install_path: str, filepath: str)
     return re.sub("^" + root_path, install_path, filepath)
 
 
+def extract_path_dependent_info(pluginmanager, hook_kwargs: Dict[str, Any]) -> List[object]:
+    """Call only the `extract_file_info` hook implementations from plugins that need to run on
+    every copy of a file, for a file with the same contents as one already processed.
+
+    Args:
+        pluginmanager (pluggy.PluginManager): The plugin manager used to call hooks.
+        hook_kwargs (Dict[str, Any]): The arguments for the `extract_file_info` hook.
+
+    Returns:
+        List[object]: The non-None results from the hook implementations that were called.
+    """
+    hookimpls = get_hookimpls_in_call_order(pluginmanager.hook.extract_file_info)
+    # hook wrappers could depend on every implementation being called, so just call them all
+    if hookimpls is None:
+        return pluginmanager.hook.extract_file_info(**hook_kwargs)
+    results: List[object] = []
+    for hookimpl in hookimpls:
+        plugin = hookimpl.plugin
+        if (
+            is_hook_implemented(pluginmanager, plugin, "path_dependent_extraction")
+            and plugin.path_dependent_extraction()
+        ):
+            result = call_hookimpl(hookimpl, hook_kwargs)
+            if result is not None:
+                results.append(result)
+    return results
+
+
 def get_software_entry(
     context_queue,
     current_context,
@@ -43,8 +99,53 @@ def get_software_entry(
     omit_unrecognized_types=False,
     skip_extraction=False,
     container_prefix=None,
+    file_content: Optional[FileContent] = None,
+    extraction_cache: Optional[ExtractionCache] = None,
+    manifest_entry: Optional[ManifestEntry] = None,
+    stat_result: Optional[os.stat_result] = None,
+    file_hashes: Optional[Dict[str, Optional[str]]] = None,
+    seen_hashes: Optional[Set[str]] = None,
+    profiler: Optional[Profiler] = None,
+    watchdog: Optional[ExtractorWatchdog] = None,
 ) -> Tuple[Software, List[Software]]:
-    sw_entry = Software.create_software_from_file(filepath)
+    # read the file once, sharing the contents between hashing and info extractors
+    if file_content is None:
+        with FileContent(filepath) as content:
+            return get_software_entry(
+                context_queue,
+                current_context,
+                pluginmanager,
+                parent_sbom,
+                filepath,
+                filetype=filetype,
+                container_uuid=container_uuid,
+                root_path=root_path,
+                install_path=install_path,
+                user_institution_name=user_institution_name,
+                omit_unrecognized_types=omit_unrecognized_types,
+                skip_extraction=skip_extraction,
+                container_prefix=container_prefix,
+                file_content=content,
+                extraction_cache=extraction_cache,
+                manifest_entry=manifest_entry,
+                stat_result=stat_result,
+                file_hashes=file_hashes,
+                seen_hashes=seen_hashes,
+                profiler=profiler,
+                watchdog=watchdog,
+            )
+    if profiler and profiler.current:
+        profiler.current.filetype = filetype or []
+    with profiler.time_hashing() if profiler else contextlib.nullcontext():
+        sw_entry = Software.create_software_from_file(
+            filepath,
+            file_content=file_content,
+            file_hashes=manifest_entry.hashes if manifest_entry else file_hashes,
+            stat_result=stat_result,
+        )
+    if manifest_entry:
+        # keep the same UUID for a file that is unchanged since a previous incremental run
+        sw_entry.UUID = manifest_entry.UUID
     if root_path is not None and install_path is not None:
         sw_entry.installPath = [real_path_to_install_path(root_path, install_path, filepath)]
     if root_path is not None and container_uuid is not None:
@@ -63,21 +164,36 @@ def get_software_entry(
 
     # for unsupported file types, details are just empty; this is the case for archive files (e.g. zip, tar, iso)
     # as well as intel hex or motorola s-rec files
-    extracted_info_results: List[object] = (
-        pluginmanager.hook.extract_file_info(
-            sbom=parent_sbom,
-            software=sw_entry,
-            filename=filepath,
-            filetype=filetype,
-            context_queue=context_queue,
-            current_context=current_context,
-            children=sw_children,
-            software_field_hints=sw_field_hints,
-            omit_unrecognized_types=omit_unrecognized_types,
-        )
-        if not skip_extraction
-        else []
-    )
+    extracted_info_results: List[object] = []
+    if not skip_extraction:
+        hook_kwargs = {
+            "sbom": parent_sbom,
+            "software": sw_entry,
+            "filename": filepath,
+            "filetype": filetype,
+            "context_queue": context_queue,
+            "current_context": current_context,
+            "children": sw_children,
+            "software_field_hints": sw_field_hints,
+            "omit_unrecognized_types": omit_unrecognized_types,
+            "file_content": file_content,
+        }
+        if watchdog:
+            watchdog.start_file()
+        # a copy of a file already processed only needs the info that depends on its path; the rest
+        # is already in the SBOM (or will be, when entries are added) and would be merged away anyway
+        if parent_sbom.find_software(sw_entry.sha256) or (
+            seen_hashes is not None and sw_entry.sha256 in seen_hashes
+        ):
+            extracted_info_results = extract_path_dependent_info(pluginmanager, hook_kwargs)
+        elif extraction_cache is not None:
+            extracted_info_results = extraction_cache.extract_file_info(
+                pluginmanager, **hook_kwargs
+            )
+        else:
+            extracted_info_results = pluginmanager.hook.extract_file_info(**hook_kwargs)
+        if seen_hashes is not None:
+            seen_hashes.add(sw_entry.sha256)
     # add metadata extracted from the file
     for file_details in extracted_info_results:
         # None as details doesn't add any useful info...
@@ -114,7 +230,10 @@ def get_software_entry(
             # add any new vendors detected to the list
             for vendor in value:
                 if vendor not in sw_entry.vendor:
-                    sw_entry.vendor.append(vendor)
+                    # the same few vendor names are found for many files, so share one copy of each
+                    sw_entry.vendor.append(
+                        sys.intern(vendor) if isinstance(vendor, str) else vendor
+                    )
         elif field == "description" and not sw_entry.description:
             sw_entry.description = value
         elif field == "comments" and not sw_entry.comments:
@@ -122,6 +241,397 @@ def get_software_entry(
     return (sw_entry, sw_children)
 
 
+def process_file(
+    context_queue,
+    current_context: ContextEntry,
+    pluginmanager,
+    parent_sbom: SBOM,
+    filepath: str,
+    *,  # arguments past this point are keyword-only
+    root_path: str,
+    container_uuid: Optional[str] = None,
+    install_path: Optional[str] = None,
+    user_institution_name: str = "",
+    omit_unrecognized_types: bool = False,
+    extraction_cache: Optional[ExtractionCache] = None,
+    manifest_entry: Optional[ManifestEntry] = None,
+    stat_result: Optional[os.stat_result] = None,
+    file_filter: Optional[FileFilter] = None,
+    file_hashes: Optional[Dict[str, Optional[str]]] = None,
+    hash_cache: Optional[FileHashCache] = None,
+    seen_hashes: Optional[Set[str]] = None,
+    profiler: Optional[Profiler] = None,
+    watchdog: Optional[ExtractorWatchdog] = None,
+) -> Optional[Tuple[Software, List[Software]]]:
+    """Identify the type of a file found in an extract path and, unless the context entry settings
+    filter it out, create a software entry for it.
+
+    Args:
+        context_queue (Queue[ContextEntry]): Queue that info extractors can add new context entries to.
+        current_context (ContextEntry): The context entry the file was found in.
+        pluginmanager (pluggy.PluginManager): The plugin manager used to call hooks.
+        parent_sbom (SBOM): The SBOM passed to info extractors.
+        filepath (str): The path to the file to process.
+        root_path (str): The extract path the file was found in.
+        container_uuid (Optional[str]): UUID of the archive the file came from, used for the containerPath.
+        install_path (Optional[str]): The install prefix to use in place of root_path for the installPath.
+        user_institution_name (str): Name of the institution recording the SBOM.
+        omit_unrecognized_types (bool): Whether files with unrecognized types should be left out.
+        extraction_cache (Optional[ExtractionCache]): Cache of info extractor results to use, if any.
+        manifest_entry (Optional[ManifestEntry]): Hashes and UUID recorded for the file if it is unchanged
+            since a previous incremental run.
+        stat_result (Optional[os.stat_result]): Stat results for the file, if already known from walking the
+            extract path.
+        file_filter (Optional[FileFilter]): The prepared file filters for current_context; created from it if
+            not given.
+        file_hashes (Optional[Dict[str, Optional[str]]]): Hashes already calculated for the file, if any.
+        hash_cache (Optional[FileHashCache]): Cache of hashes for hardlinked files and symlink targets, looked
+            up if file_hashes isn't given and updated with the file's hashes.
+        seen_hashes (Optional[Set[str]]): SHA256 hashes of files already processed; only info extractors that
+            depend on the file path are run on files with one of these hashes.
+        profiler (Optional[Profiler]): Profiler to record the time spent on the file with, if any.
+        watchdog (Optional[ExtractorWatchdog]): Watchdog limiting the time info extractors spend on the file,
+            if any.
+
+    Returns:
+        Optional[Tuple[Software, List[Software]]]: The software entry for the file and any child entries, or
+        None if the file was filtered out.
+    """
+    if file_filter is None:
+        file_filter = FileFilter.from_context(current_context)
+    if file_filter.is_excluded(filepath):
+        return None
+    if file_hashes is None and hash_cache is not None:
+        file_hashes = hash_cache.get(stat_result)
+    with FileContent(filepath) as file_content:
+        ftype = pluginmanager.hook.identify_file_type(
+            filepath=filepath, context=current_context, file_content=file_content
+        )
+        if not (ftype or not omit_unrecognized_types or file_filter.is_included(filepath)):
+            return None
+        try:
+            sw_entry, sw_children = get_software_entry(
+                context_queue,
+                current_context,
+                pluginmanager,
+                parent_sbom,
+                filepath,
+                filetype=ftype or [],
+                root_path=root_path,
+                container_uuid=container_uuid,
+                install_path=install_path,
+                user_institution_name=user_institution_name,
+                omit_unrecognized_types=omit_unrecognized_types,
+                container_prefix=current_context.containerPrefix,
+                file_content=file_content,
+                extraction_cache=extraction_cache,
+                manifest_entry=manifest_entry,
+                stat_result=stat_result,
+                file_hashes=file_hashes,
+                seen_hashes=seen_hashes,
+                profiler=profiler,
+                watchdog=watchdog,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Unable to process: {filepath}") from e
+    if hash_cache is not None:
+        hash_cache.add_software(stat_result, sw_entry)
+    return sw_entry, sw_children
+
+
+@dataclass
+class FileTask:
+    """A file found while walking an extract path, and the details needed to process it."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    filepath: str
+    context: ContextEntry
+    root_path: str
+    container_uuid: Optional[str] = None
+    install_path: Optional[str] = None
+    omit_unrecognized_types: bool = False
+    file_filter: Optional[FileFilter] = None
+    # the file's stat results from walking the extract path
+    stat_result: Optional[os.stat_result] = None
+    # for incremental runs, the recorded details for the file if it is unchanged
+    manifest_entry: Optional[ManifestEntry] = None
+    # hashes of the file found in the main process' hash cache, e.g. for a symlink target
+    file_hashes: Optional[Dict[str, Optional[str]]] = None
+    # an existing software entry for the file that is used instead of processing it
+    software: Optional[Software] = None
+
+
+@dataclass
+class FileTaskResult:
+    """The outcome of processing a FileTask in a worker process.
+
+    Attributes:
+        software (Optional[Software]): The software entry for the file, or None if it was filtered out.
+        children (List[Software]): Additional software entries added by info extractors.
+        context_entries (List[ContextEntry]): Context entries info extractors queued for further processing.
+        extract_dirs (Dict[str, Any]): Extraction directories the worker created, keyed by archive hash.
+        profile (Optional[FileProfile]): Time spent processing the file, if profiling.
+    """
+
+    software: Optional[Software] = None
+    children: List[Software] = dataclass_field(default_factory=list)
+    context_entries: List[ContextEntry] = dataclass_field(default_factory=list)
+    extract_dirs: Dict[str, Any] = dataclass_field(default_factory=dict)
+    profile: Optional[FileProfile] = None
+
+
+# Per-process state for worker processes used by `generate --jobs`
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    user_institution_name: str, use_extraction_cache: bool = False, profile: bool = False
+) -> None:
+    pm = get_plugin_manager()
+    call_init_hooks(
+        pm, hook_filter=["identify_file_type", "extract_file_info"], command_name="generate"
+    )
+    # each worker gets its own sandbox process for info extractors with a time budget
+    _worker_state["watchdog"] = open_extractor_watchdog(pm)
+    _worker_state["profiler"] = Profiler() if profile else None
+    if _worker_state["profiler"]:
+        _worker_state["profiler"].instrument(pm)
+    _worker_state["pm"] = pm
+    _worker_state["recorded_institution"] = user_institution_name
+    _worker_state["extraction_cache"] = (
+        open_extraction_cache(True) if use_extraction_cache else None
+    )
+    # files are given to workers largest first, but copies of a file are the same size so they keep the
+    # order they were walked in; the first copy of a file a worker sees is never after the first copy in
+    # the SBOM, and later copies only need path dependent info
+    _worker_state["seen_hashes"] = set()
+    _worker_state["hash_cache"] = FileHashCache()
+
+
+def _process_file_tasks(tasks: List[FileTask]) -> List[FileTaskResult]:
+    return [_process_file_task(task) for task in tasks]
+
+
+def _process_file_task(task: FileTask) -> FileTaskResult:
+    # info extractors get a worker-local queue and SBOM; anything queued is sent back to the main process
+    local_queue: queue.Queue[ContextEntry] = queue.Queue()
+    known_extract_dirs = set(file_decompression.EXTRACT_DIRS)
+    profiler: Optional[Profiler] = _worker_state["profiler"]
+    if profiler:
+        profiler.start_file(task.filepath)
+    processed = process_file(
+        local_queue,
+        task.context,
+        _worker_state["pm"],
+        SBOM(),
+        task.filepath,
+        root_path=task.root_path,
+        container_uuid=task.container_uuid,
+        install_path=task.install_path,
+        user_institution_name=_worker_state["recorded_institution"],
+        omit_unrecognized_types=task.omit_unrecognized_types,
+        extraction_cache=_worker_state["extraction_cache"],
+        manifest_entry=task.manifest_entry,
+        stat_result=task.stat_result,
+        file_filter=task.file_filter,
+        file_hashes=task.file_hashes,
+        hash_cache=_worker_state["hash_cache"],
+        seen_hashes=_worker_state["seen_hashes"],
+        profiler=profiler,
+        watchdog=_worker_state["watchdog"],
+    )
+    # workers aren't shut down cleanly, so save cached results as each file is finished
+    if _worker_state["extraction_cache"] is not None:
+        _worker_state["extraction_cache"].commit()
+    result = FileTaskResult()
+    if profiler:
+        result.profile = profiler.stop_file()
+    if processed:
+        result.software, result.children = processed
+    while not local_queue.empty():
+        result.context_entries.append(local_queue.get())
+    # hand ownership of new extraction directories to the main process, which cleans them up on exit
+    for key in set(file_decompression.EXTRACT_DIRS) - known_extract_dirs:
+        result.extract_dirs[key] = file_decompression.EXTRACT_DIRS.pop(key)
+    return result
+
+
+def schedule_file_tasks(tasks: List[FileTask], jobs: int) -> List[List[int]]:
+    """Split files into the batches sent to worker processes, largest files first, so that the last
+    batches to finish are small ones instead of one worker being left with a huge file while the
+    rest sit idle. Each batch holds at most a quarter of a worker's share of the total bytes (so very
+    large files are sent on their own) and at most 64 files, to cut down on inter-process
+    communication overhead for small files.
+
+    Args:
+        tasks (List[FileTask]): The files to process.
+        jobs (int): The number of worker processes.
+
+    Returns:
+        List[List[int]]: Indexes into tasks for each batch, in the order to submit them.
+    """
+    sizes = [task.stat_result.st_size if task.stat_result else 0 for task in tasks]
+    max_files = max(1, min(64, len(tasks) // (jobs * 4)))
+    max_bytes = max(1, sum(sizes) // (jobs * 4))
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    batch_bytes = 0
+    # sorted is stable, so files of the same size keep the order they were walked in
+    for index in sorted(range(len(tasks)), key=lambda i: -sizes[i]):
+        batch.append(index)
+        batch_bytes += sizes[index]
+        if len(batch) >= max_files or batch_bytes >= max_bytes:
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def run_file_tasks(
+    tasks: List[FileTask],
+    context_queue,
+    pluginmanager,
+    parent_sbom: SBOM,
+    *,  # arguments past this point are keyword-only
+    user_institution_name: str = "",
+    executor: Optional[Executor] = None,
+    jobs: int = 1,
+    extraction_cache: Optional[ExtractionCache] = None,
+    seen_hashes: Optional[Set[str]] = None,
+    hash_cache: Optional[FileHashCache] = None,
+    profiler: Optional[Profiler] = None,
+    watchdog: Optional[ExtractorWatchdog] = None,
+) -> Iterator[Tuple[FileTask, Software, List[Software]]]:
+    """Process files, yielding their software entries in the same order as the given tasks.
+    Tasks that already have a software entry are passed through without being processed.
+
+    Args:
+        tasks (List[FileTask]): The files to process.
+        context_queue (Queue[ContextEntry]): Queue that context entries added by info extractors are put in.
+        pluginmanager (pluggy.PluginManager): The plugin manager used when processing files in this process.
+        parent_sbom (SBOM): The SBOM passed to info extractors run in this process.
+        user_institution_name (str): Name of the institution recording the SBOM.
+        executor (Optional[Executor]): Worker pool to process files with; files are processed serially if None.
+        jobs (int): The number of workers in the executor, used to size batches of files sent to workers.
+        extraction_cache (Optional[ExtractionCache]): Cache of info extractor results used when processing
+            files in this process.
+        seen_hashes (Optional[Set[str]]): SHA256 hashes of files already processed in this process, updated
+            as files are processed; worker processes keep their own.
+        hash_cache (Optional[FileHashCache]): Cache of hashes for hardlinked files and symlink targets, updated
+            as files are processed; worker processes keep their own, in addition to hashes given with tasks.
+        profiler (Optional[Profiler]): Profiler to add the time spent on each file to, if any.
+        watchdog (Optional[ExtractorWatchdog]): Watchdog limiting the time info extractors spend on files
+            processed in this process, if any; worker processes create their own.
+
+    Yields:
+        Tuple[FileTask, Software, List[Software]]: The task, software entry, and child entries for each file that
+        wasn't filtered out.
+    """
+    if executor is None:
+        for task in tasks:
+            if task.software:
+                yield task, task.software, []
+                continue
+            if profiler:
+                profiler.start_file(task.filepath)
+            processed = process_file(
+                context_queue,
+                task.context,
+                pluginmanager,
+                parent_sbom,
+                task.filepath,
+                root_path=task.root_path,
+                container_uuid=task.container_uuid,
+                install_path=task.install_path,
+                user_institution_name=user_institution_name,
+                omit_unrecognized_types=task.omit_unrecognized_types,
+                extraction_cache=extraction_cache,
+                manifest_entry=task.manifest_entry,
+                stat_result=task.stat_result,
+                file_filter=task.file_filter,
+                file_hashes=task.file_hashes,
+                hash_cache=hash_cache,
+                seen_hashes=seen_hashes,
+                profiler=profiler,
+                watchdog=watchdog,
+            )
+            if profiler:
+                profiler.add_file(profiler.stop_file())
+            if processed:
+                yield task, processed[0], processed[1]
+        return
+
+    pending = [task for task in tasks if not task.software]
+    # all batches are submitted up front, so whichever worker is free picks up the next one
+    futures: List[Future] = []
+    # for each pending task, the future for its batch and its position in the batch
+    result_locations: List[Tuple[int, int]] = [(0, 0)] * len(pending)
+    for batch in schedule_file_tasks(pending, jobs):
+        for position, index in enumerate(batch):
+            result_locations[index] = (len(futures), position)
+        futures.append(executor.submit(_process_file_tasks, [pending[i] for i in batch]))
+    pending_index = 0
+    for task in tasks:
+        if task.software:
+            yield task, task.software, []
+            continue
+        # results are used in the order tasks were given, keeping the SBOM contents deterministic
+        future_index, position = result_locations[pending_index]
+        pending_index += 1
+        result = futures[future_index].result()[position]
+        file_decompression.register_extract_dirs(result.extract_dirs)
+        if profiler and result.profile:
+            profiler.add_file(result.profile)
+        for new_entry in result.context_entries:
+            context_queue.put(new_entry)
+        if result.software:
+            if hash_cache is not None:
+                hash_cache.add_software(task.stat_result, result.software)
+            yield task, result.software, result.children
+
+
+def add_file_tasks(
+    tasks: List[FileTask],
+    context_queue,
+    pluginmanager,
+    parent_sbom: SBOM,
+    *,  # arguments past this point are keyword-only
+    parent_entry: Optional[Software] = None,
+    manifest: Optional[FileManifest] = None,
+    **run_kwargs: Any,
+) -> None:
+    """Process files and add their software entries to the SBOM, in the same order as the given tasks.
+
+    Args:
+        tasks (List[FileTask]): The files to process.
+        context_queue (Queue[ContextEntry]): Queue that context entries added by info extractors are put in.
+        pluginmanager (pluggy.PluginManager): The plugin manager used when processing files in this process.
+        parent_sbom (SBOM): The SBOM to add the software entries to.
+        parent_entry (Optional[Software]): Software entry for the archive the files came from, if any.
+        manifest (Optional[FileManifest]): Manifest to record the processed files in, for incremental runs.
+        **run_kwargs (Any): Keyword arguments for `run_file_tasks`.
+    """
+    entries: List[Software] = []
+    processed_files: List[Tuple[FileTask, Software]] = []
+    for task, sw_parent, sw_children in run_file_tasks(
+        tasks, context_queue, pluginmanager, parent_sbom, **run_kwargs
+    ):
+        entries.append(sw_parent)
+        entries.extend(sw_children if sw_children else [])
+        processed_files.append((task, sw_parent))
+    parent_sbom.add_software_entries(entries, parent_entry=parent_entry)
+    if manifest:
+        for task, sw_parent in processed_files:
+            if task.stat_result:
+                manifest.record(
+                    task.filepath,
+                    task.stat_result,
+                    parent_sbom.find_software(sw_parent.sha256) or sw_parent,
+                )
+
+
 def print_output_formats(ctx, _, value):
     if not value or ctx.resilient_parsing:
         return
@@ -264,6 +774,70 @@ def get_default_from_config(option: str, fallback: Optional[Any] = None) -> Any:
     required=False,
     help="Omit files with unrecognized types from the generated SBOM.",
 )
+@click.option(
+    "--jobs",
+    type=int,
+    default=get_default_from_config("jobs", fallback=1),
+    show_default=True,
+    help="Number of worker processes used to gather file information; 0 uses one per CPU core",
+)
+@click.option(
+    "--cache/--no_cache",
+    default=None,
+    required=False,
+    help="Use and update the persistent cache of info extractor results; defaults to the cache.enabled setting",
+)
+@click.option(
+    "--incremental",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Manifest of scanned files to update; files unchanged since the last run using it aren't hashed again",
+)
+@click.option(
+    "--streaming",
+    is_flag=True,
+    default=False,
+    required=False,
+    help="Keep software metadata in a temporary file instead of memory, and write the SBOM one entry at a time",
+)
+@click.option(
+    "--low_memory",
+    is_flag=True,
+    default=False,
+    required=False,
+    help="Like --streaming, but move software metadata to an on-disk database after each batch of files",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a report of the time spent hashing files and in each plugin to the given JSON file",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Periodically save progress to the given file, so an interrupted run can be continued with --resume",
+)
+@click.option(
+    "--checkpoint_interval",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_CHECKPOINT_INTERVAL,
+    show_default=True,
+    help="Minimum number of seconds between checkpoints",
+)
+@click.option(
+    "--resume",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Continue an interrupted run from a checkpoint file saved with --checkpoint",
+)
+@click.option(
+    "--shard",
+    type=ShardParamType(),
+    default=None,
+    help="Only process shard i of N (given as i/N) of the files found, writing a partial SBOM for `surfactant reduce`",
+)
 # Disable positional argument linter check -- could make keyword-only, but then defaults need to be set
 # pylint: disable-next=too-many-positional-arguments
 def sbom(
@@ -277,10 +851,21 @@ def sbom(
     output_format: str,
     input_format: str,
     omit_unrecognized_types: bool,
+    jobs: int,
+    cache: Optional[bool],
+    incremental: Optional[str],
+    streaming: bool,
+    low_memory: bool,
+    profile: Optional[str],
+    checkpoint: Optional[str],
+    checkpoint_interval: float,
+    resume: Optional[str],
+    shard: Optional[Shard],
 ):
     """Generate a sbom based on SPECIMEN_CONTEXT and output to SBOM_OUTPUT.
 
     An optional INPUT_SBOM can be supplied to use as a base for subsequent operations.
+    When resuming from a checkpoint, the context and SBOM saved in the checkpoint are used instead.
     """
 
     pm = get_plugin_manager()
@@ -289,89 +874,236 @@ def sbom(
     )
     output_writer = find_io_plugin(pm, output_format, "write_sbom")
     input_reader = find_io_plugin(pm, input_format, "read_sbom")
+    # time limits for info extractors, from the timeouts settings
+    watchdog = open_extractor_watchdog(pm)
+    profiler = Profiler() if profile else None
+    if profiler:
+        profiler.instrument(pm)
+
+    # state saved by an interrupted run, which replaces the specimen context and input SBOM
+    resume_state: Optional[GenerateState] = None
+    if resume:
+        logger.info(f"Resuming from checkpoint {resume}")
+        resume_state = load_checkpoint(resume)
+        # manifest entries recorded before the checkpoint are only in the checkpoint until the run
+        # finishes, so they can't be dropped or added to a manifest that wasn't part of the run
+        if not skip_gather and bool(incremental) == (resume_state.manifest is None):
+            raise click.UsageError(
+                "--incremental must be given when resuming an incremental run, and only then"
+            )
+        file_decompression.register_extract_dirs(resume_state.extract_dirs)
+    # checkpoints are saved to the file being resumed from unless told otherwise
+    checkpoint = checkpoint or resume
+    checkpointer = Checkpointer(checkpoint, checkpoint_interval) if checkpoint else None
 
     contextQ: queue.Queue[ContextEntry] = queue.Queue()
 
-    for cfg_entry in specimen_context:
-        contextQ.put(ContextEntry(**cfg_entry))
+    # ids of the queued entries whose files are split between shards: the entries from the specimen context
+    # and the ones queued for the archives they name. Entries added for archives found among the files are
+    # processed in full, since only the shard that processed the archive has them.
+    sharded_entry_ids: Set[int] = set()
+    for cfg_entry in specimen_context if resume_state is None else []:
+        context_entry = ContextEntry(**cfg_entry)
+        contextQ.put(context_entry)
+        sharded_entry_ids.add(id(context_entry))
+    if resume_state:
+        sharded_flags = resume_state.sharded_entries or [True] * len(resume_state.context_queue)
+        for context_entry, sharded in zip(resume_state.context_queue, sharded_flags):
+            contextQ.put(context_entry)
+            if sharded:
+                sharded_entry_ids.add(id(context_entry))
 
     # define the new_sbom variable type
     new_sbom: SBOM
     # Click has Sentinel.UNSET type that doesn't have READ attribute, which may appear when running regression test script
-    if not input_sbom or not hasattr(input_sbom, "read"):
+    if resume_state:
+        new_sbom = resume_state.sbom
+    elif not input_sbom or not hasattr(input_sbom, "read"):
         new_sbom = SBOM()
     else:
         new_sbom = input_reader.read_sbom(input_sbom)
 
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    # with streaming enabled, metadata is moved to disk as each context entry is finished; in low
+    # memory mode it is moved to a database keyed by UUID after each batch of files instead
+    metadata_spool: Optional[Union[MetadataSpool, MetadataStore]] = None
+    if low_memory:
+        metadata_spool = MetadataStore()
+    elif streaming:
+        metadata_spool = MetadataSpool()
+    # number of software entries in the SBOM that have had their metadata spooled
+    spooled_count = 0
+    # hashes of files processed in this process, so info extractors can be skipped for more copies of them
+    seen_hashes: Set[str] = set()
+    # hashes of hardlinked files and symlink targets, so they are only read and hashed once
+    hash_cache = FileHashCache()
+
     # gather metadata for files and add/augment software entries in the sbom
     if not skip_gather:
+        # results from info extractors saved by previous runs, keyed by file hash
+        extraction_cache = open_extraction_cache(cache)
+        # details recorded for files scanned by a previous incremental run
+        manifest = FileManifest(incremental) if incremental else None
+        if manifest and resume_state and resume_state.manifest:
+            manifest.restore_state(resume_state.manifest)
+        # worker processes for hashing, identifying, and running info extractors on files in parallel
+        executor: Optional[ProcessPoolExecutor] = None
+        if jobs > 1:
+            logger.info(f"Processing files using {jobs} worker processes")
+            executor = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(recorded_institution, extraction_cache is not None, profiler is not None),
+            )
         # List of directory symlinks; 2-sized tuples with (source, dest)
-        dir_symlinks: List[Tuple[str, str]] = []
+        dir_symlinks: List[Tuple[str, str]] = resume_state.dir_symlinks if resume_state else []
         # List of file install path symlinks; keys are SHA256 hashes, values are source paths
-        file_symlinks: Dict[str, List[str]] = {}
+        file_symlinks: Dict[str, List[str]] = resume_state.file_symlinks if resume_state else {}
         # List of filename symlinks; keys are SHA256 hashes, values are file names
-        filename_symlinks: Dict[str, List[str]] = {}
-        while not contextQ.empty():
-            entry: ContextEntry = contextQ.get()
-            if entry.archive:
-                logger.info("Processing parent container " + str(entry.archive))
-                # TODO: if the parent archive has an info extractor that does unpacking interally, should the children be added to the SBOM?
-                # current thoughts are (Syft) doesn't provide hash information for a proper SBOM software entry, so exclude these
-                # extractor plugins meant to unpack files could be okay when used on an "archive", but then extractPaths should be empty
-                parent_entry, _ = get_software_entry(
-                    contextQ,
-                    entry,
-                    pm,
+        filename_symlinks: Dict[str, List[str]] = (
+            resume_state.filename_symlinks if resume_state else {}
+        )
+        # arguments for processing the files found in extract paths
+        run_kwargs: Dict[str, Any] = {
+            "user_institution_name": recorded_institution,
+            "executor": executor,
+            "jobs": jobs,
+            "extraction_cache": extraction_cache,
+            "seen_hashes": seen_hashes,
+            "hash_cache": hash_cache,
+            "profiler": profiler,
+            "watchdog": watchdog,
+        }
+        # files to process between checkpoints (or moving metadata out of memory), enough to keep every worker busy
+        file_batch_size = CHECKPOINT_BATCH_SIZE * jobs
+
+        def spool_new_entries() -> None:
+            nonlocal spooled_count
+            # new entries are only appended, so just those need to be spooled
+            if metadata_spool:
+                metadata_spool.spool(new_sbom.software[spooled_count:])
+                spooled_count = len(new_sbom.software)
+
+        def save_checkpoint(current: Optional[EntryProgress] = None) -> None:
+            if extraction_cache is not None:
+                extraction_cache.commit()
+            checkpointer.save(
+                GenerateState(
                     new_sbom,
-                    entry.archive,
-                    filetype=pm.hook.identify_file_type(filepath=entry.archive, context=entry)
-                    or [],
-                    user_institution_name=recorded_institution,
-                    skip_extraction=entry.skipProcessingArchive,
-                    container_prefix=entry.containerPrefix,
+                    context_queue=list(contextQ.queue),
+                    current=current,
+                    dir_symlinks=dir_symlinks,
+                    file_symlinks=file_symlinks,
+                    filename_symlinks=filename_symlinks,
+                    extract_dirs=dict(file_decompression.EXTRACT_DIRS),
+                    sharded_entries=[id(e) in sharded_entry_ids for e in contextQ.queue],
+                    manifest=manifest.get_state() if manifest else None,
                 )
-                archive_entry = new_sbom.find_software(parent_entry.sha256)
-                if (
-                    archive_entry
-                    and parent_entry
-                    and Software.check_for_hash_collision(archive_entry, parent_entry)
-                ):
-                    logger.warning(
-                        f"Hash collision between {archive_entry.name} and {parent_entry.name}; unexpected results may occur"
-                    )
-                if archive_entry:
-                    parent_entry = archive_entry
-                else:
-                    new_sbom.add_software(parent_entry)
-                parent_uuid = parent_entry.UUID
+            )
+
+        # progress through the context entry that was being processed when the checkpoint was saved
+        resume_progress = resume_state.current if resume_state else None
+        while resume_progress or not contextQ.empty():
+            entry: ContextEntry
+            # index of the first extract path to walk, and directories in it that are already done
+            first_extract_path = 0
+            completed_dirs: Set[str] = set()
+            if resume_progress:
+                # the archive and prefixes were already handled before the checkpoint was saved
+                entry = resume_progress.entry
+                parent_entry = new_sbom.find_software(resume_progress.parent_sha256)
+                parent_uuid = parent_entry.UUID if parent_entry else None
+                first_extract_path = resume_progress.extract_path_index
+                completed_dirs.update(resume_progress.completed_dirs)
+                entry_sharded = resume_progress.sharded
+                resume_progress = None
             else:
-                parent_entry = None
-                parent_uuid = None
-
-            # If an installPrefix was given, clean it up some
-            if entry.installPrefix:
-                if not entry.installPrefix.endswith(("/", "\\")):
-                    # Make sure the installPrefix given ends with a "/" (or Windows backslash path, but users should avoid those)
-                    logger.warning(
-                        "Fixing installPrefix in config file entry (include the trailing /)"
+                entry = contextQ.get()
+                entry_sharded = id(entry) in sharded_entry_ids
+                sharded_entry_ids.discard(id(entry))
+                if entry.archive:
+                    logger.info("Processing parent container " + str(entry.archive))
+                    # TODO: if the parent archive has an info extractor that does unpacking interally, should the children be added to the SBOM?
+                    # current thoughts are (Syft) doesn't provide hash information for a proper SBOM software entry, so exclude these
+                    # extractor plugins meant to unpack files could be okay when used on an "archive", but then extractPaths should be empty
+                    archive_stat, archive_manifest_entry, _ = (
+                        manifest.check(entry.archive, new_sbom) if manifest else (None, None, None)
                     )
-                    entry.installPrefix += "/"
-                if "\\" in entry.installPrefix:
-                    # Using an install prefix with backslashes can result in a gradual reduction of the number of backslashes... and weirdness
-                    # Ideally even on a Windows "/" should be preferred instead in file paths, but "\" can be a valid character in Linux folder names
-                    logger.warning(
-                        "Fixing installPrefix with Windows-style backslash path separator in config file (ideally use / as path separator instead of \\, even for Windows"
-                    )
-                    entry.installPrefix = entry.installPrefix.replace("\\", "\\\\")
+                    queued = contextQ.qsize()
+                    with FileContent(entry.archive) as archive_content:
+                        parent_entry, _ = get_software_entry(
+                            contextQ,
+                            entry,
+                            pm,
+                            new_sbom,
+                            entry.archive,
+                            filetype=pm.hook.identify_file_type(
+                                filepath=entry.archive, context=entry, file_content=archive_content
+                            )
+                            or [],
+                            user_institution_name=recorded_institution,
+                            skip_extraction=entry.skipProcessingArchive,
+                            container_prefix=entry.containerPrefix,
+                            file_content=archive_content,
+                            extraction_cache=extraction_cache,
+                            manifest_entry=archive_manifest_entry,
+                            profiler=profiler,
+                            watchdog=watchdog,
+                        )
+                    if entry_sharded:
+                        # the archive's contents are split between shards like its extract paths
+                        sharded_entry_ids.update(id(e) for e in list(contextQ.queue)[queued:])
+                    archive_entry = new_sbom.find_software(parent_entry.sha256)
+                    if (
+                        archive_entry
+                        and parent_entry
+                        and Software.check_for_hash_collision(archive_entry, parent_entry)
+                    ):
+                        logger.warning(
+                            f"Hash collision between {archive_entry.name} and {parent_entry.name}; unexpected results may occur"
+                        )
+                    if archive_entry:
+                        parent_entry = archive_entry
+                    else:
+                        new_sbom.add_software(parent_entry)
+                    parent_uuid = parent_entry.UUID
+                    if manifest and archive_stat:
+                        manifest.record(entry.archive, archive_stat, parent_entry)
+                else:
+                    parent_entry = None
+                    parent_uuid = None
 
-            # Clean up the container prefix if needed
-            entry.containerPrefix = (
-                entry.containerPrefix.strip("/") if entry.containerPrefix is not None else ""
-            )
-            if entry.containerPrefix != "":
-                entry.containerPrefix = "/" + entry.containerPrefix
+                # If an installPrefix was given, clean it up some
+                if entry.installPrefix:
+                    if not entry.installPrefix.endswith(("/", "\\")):
+                        # Make sure the installPrefix given ends with a "/" (or Windows backslash path, but users should avoid those)
+                        logger.warning(
+                            "Fixing installPrefix in config file entry (include the trailing /)"
+                        )
+                        entry.installPrefix += "/"
+                    if "\\" in entry.installPrefix:
+                        # Using an install prefix with backslashes can result in a gradual reduction of the number of backslashes... and weirdness
+                        # Ideally even on a Windows "/" should be preferred instead in file paths, but "\" can be a valid character in Linux folder names
+                        logger.warning(
+                            "Fixing installPrefix with Windows-style backslash path separator in config file (ideally use / as path separator instead of \\, even for Windows"
+                        )
+                        entry.installPrefix = entry.installPrefix.replace("\\", "\\\\")
+
+                # Clean up the container prefix if needed
+                entry.containerPrefix = (
+                    entry.containerPrefix.strip("/") if entry.containerPrefix is not None else ""
+                )
+                if entry.containerPrefix != "":
+                    entry.containerPrefix = "/" + entry.containerPrefix
 
-            for epath_str in entry.extractPaths:
+            # prepare the file filters once for all the files in the extract paths
+            file_filter = FileFilter.from_context(entry)
+
+            for epath_index, epath_str in enumerate(entry.extractPaths):
+                if epath_index < first_extract_path:
+                    continue
                 # convert to pathlib.Path, ensures trailing "/" won't be present and some more consistent path formatting
                 epath = pathlib.Path(epath_str)
                 install_prefix = determine_install_prefix(
@@ -382,41 +1114,112 @@ def sbom(
                 # variable used to track software entries to add to the SBOM
                 entries: List[Software]
 
+                # files are split between shards by their path relative to the extract path (or the
+                # archive they came from), which is the same for every run even if extracted elsewhere
+                shard_root = parent_entry.sha256 if parent_entry else epath.as_posix()
+                entry_shard = shard if entry_sharded else None
+
                 # handle individual file case, since os.walk doesn't
                 if epath.is_file():
+                    if entry_shard and not entry_shard.includes(
+                        f"{shard_root}/{epath.name}" if parent_entry else shard_root
+                    ):
+                        continue
                     entries = []
                     filepath = epath.as_posix()
+                    file_stat, manifest_entry, existing_entry = (
+                        manifest.check(filepath, new_sbom) if manifest else (None, None, None)
+                    )
+                    if profiler:
+                        profiler.start_file(filepath)
                     try:
-                        sw_parent, sw_children = get_software_entry(
-                            contextQ,
-                            entry,
-                            pm,
-                            new_sbom,
-                            filepath,
-                            filetype=pm.hook.identify_file_type(filepath=filepath, context=entry)
-                            or [],
-                            root_path=epath.parent.as_posix() if len(epath.parts) > 1 else "",
-                            container_uuid=parent_uuid,
-                            install_path=install_prefix,
-                            user_institution_name=recorded_institution,
-                            container_prefix=entry.containerPrefix,
-                        )
+                        if existing_entry:
+                            sw_parent, sw_children = existing_entry, []
+                        else:
+                            with FileContent(filepath) as file_content:
+                                sw_parent, sw_children = get_software_entry(
+                                    contextQ,
+                                    entry,
+                                    pm,
+                                    new_sbom,
+                                    filepath,
+                                    filetype=pm.hook.identify_file_type(
+                                        filepath=filepath, context=entry, file_content=file_content
+                                    )
+                                    or [],
+                                    root_path=epath.parent.as_posix()
+                                    if len(epath.parts) > 1
+                                    else "",
+                                    container_uuid=parent_uuid,
+                                    install_path=install_prefix,
+                                    user_institution_name=recorded_institution,
+                                    container_prefix=entry.containerPrefix,
+                                    file_content=file_content,
+                                    extraction_cache=extraction_cache,
+                                    manifest_entry=manifest_entry,
+                                    stat_result=file_stat,
+                                    profiler=profiler,
+                                    watchdog=watchdog,
+                                )
                     except Exception as e:
                         raise RuntimeError(f"Unable to process: {filepath}") from e
+                    if profiler:
+                        profiler.add_file(profiler.stop_file())
                     entries.append(sw_parent)
                     entries.extend(sw_children if sw_children else [])
                     new_sbom.add_software_entries(entries, parent_entry=parent_entry)
+                    if manifest and file_stat:
+                        manifest.record(
+                            filepath,
+                            file_stat,
+                            new_sbom.find_software(sw_parent.sha256) or sw_parent,
+                        )
                     # epath was a file, no need to walk the directory tree
                     continue
 
                 # epath is a directory, walk it
-                for cdir, dirs, files in os.walk(epath):
+                tasks: List[FileTask] = []
+                # directories whose files are all in the SBOM, and ones with files waiting in tasks
+                done_dirs = completed_dirs if epath_index == first_extract_path else set()
+                pending_dirs: List[str] = []
+                for cdir, dirs, files in walk_dir(epath, file_filter):
+                    if cdir in done_dirs:
+                        # processed before the checkpoint being resumed from was saved
+                        continue
+                    # when checkpointing, process files in batches so progress can be saved between them;
+                    # in low memory mode, so their metadata can be moved out of memory between them
+                    if (checkpointer or low_memory) and len(tasks) >= file_batch_size:
+                        add_file_tasks(
+                            tasks,
+                            contextQ,
+                            pm,
+                            new_sbom,
+                            parent_entry=parent_entry,
+                            manifest=manifest,
+                            **run_kwargs,
+                        )
+                        tasks = []
+                        done_dirs.update(pending_dirs)
+                        pending_dirs = []
+                        if low_memory:
+                            spool_new_entries()
+                        if checkpointer and checkpointer.due():
+                            save_checkpoint(
+                                EntryProgress(
+                                    entry,
+                                    parent_entry.sha256 if parent_entry else None,
+                                    epath_index,
+                                    sorted(done_dirs),
+                                    entry_sharded,
+                                )
+                            )
                     logger.info("Processing " + str(cdir))
+                    pending_dirs.append(cdir)
 
                     if entry.installPrefix:
-                        for dir_ in dirs:
-                            full_path = os.path.join(cdir, dir_)
-                            if os.path.islink(full_path):
+                        for dir_entry in dirs:
+                            full_path = dir_entry.path
+                            if dir_entry.is_symlink():
                                 dest = resolve_link(
                                     full_path, cdir, epath.as_posix(), entry.installPrefix
                                 )
@@ -429,15 +1232,14 @@ def sbom(
                                     )
                                     dir_symlinks.append((install_source, install_dest))
 
-                    entries = []
-                    for file in files:
+                    for file_entry in files:
                         # os.path.join will insert an OS specific separator between cdir and f
                         # need to make sure that separator is a / and not a \ on windows
-                        filepath = pathlib.Path(cdir, file).as_posix()
+                        filepath = pathlib.Path(cdir, file_entry.name).as_posix()
                         logger.debug(f"Processing filepath: {filepath}")
                         # TODO: add CI tests for generating SBOMs in scenarios with symlinks... (and just generally more CI tests overall...)
                         # Record symlink details but don't run info extractors on them
-                        if os.path.islink(filepath):
+                        if file_entry.is_symlink():
                             # NOTE: resolve_link function could print warning if symlink goes outside of extract path dir
                             true_filepath = resolve_link(
                                 filepath, cdir, epath.as_posix(), entry.installPrefix
@@ -446,8 +1248,17 @@ def sbom(
                             if true_filepath is None:
                                 continue
                             # Compute sha256 hash of the file; skip if the file pointed by the symlink can't be opened
+                            _, target_manifest_entry, _ = (
+                                manifest.check(true_filepath, new_sbom)
+                                if manifest
+                                else (None, None, None)
+                            )
                             try:
-                                true_file_sha256 = sha256sum(true_filepath)
+                                true_file_sha256 = (
+                                    target_manifest_entry.sha256
+                                    if target_manifest_entry
+                                    else hash_cache.sha256sum(true_filepath)
+                                )
                             except (FileNotFoundError, PermissionError):
                                 logger.warning(
                                     f"Unable to open symlink {filepath} pointing to {true_filepath}"
@@ -456,7 +1267,8 @@ def sbom(
                             # Record the symlink name to be added as a file name
                             # Dead links would appear as a file, so need to check the true path to see
                             # if the thing pointed to is a file or a directory
-                            if os.path.isfile(true_filepath):
+                            true_path_is_file = os.path.isfile(true_filepath)
+                            if true_path_is_file:
                                 if true_file_sha256 and true_file_sha256 not in filename_symlinks:
                                     filename_symlinks[true_file_sha256] = []
                                 symlink_base_name = pathlib.PurePath(filepath).name
@@ -472,7 +1284,7 @@ def sbom(
                                 )
                                 # A dead link shows as a file so need to test if it's a
                                 # file or a directory once rebased
-                                if os.path.isfile(true_filepath):
+                                if true_path_is_file:
                                     if true_file_sha256 and true_file_sha256 not in file_symlinks:
                                         file_symlinks[true_file_sha256] = []
                                     file_symlinks[true_file_sha256].append(install_filepath)
@@ -486,47 +1298,71 @@ def sbom(
                             # unpacking/installation?
                             continue
 
-                        if os.path.isfile(filepath):
-                            if not entry.includeFileExts:
-                                entry.includeFileExts = []
-                            if not entry.excludeFileExts:
-                                entry.excludeFileExts = []
-                            if (
-                                (
-                                    ftype := pm.hook.identify_file_type(
-                                        filepath=filepath, context=entry
-                                    )
-                                )
-                                or (not (omit_unrecognized_types or entry.omitUnrecognizedTypes))
-                                or (
-                                    os.path.splitext(filepath)[1].lower()
-                                    in [ext.lower() for ext in entry.includeFileExts]
+                        if file_entry.is_file():
+                            # excluded files are left out before doing any work on them
+                            if file_filter.is_excluded(filepath):
+                                continue
+                            if entry_shard and not entry_shard.includes(
+                                shard_root + filepath[len(epath.as_posix()) :]
+                            ):
+                                continue
+                            try:
+                                file_stat = file_entry.stat()
+                            except OSError as e:
+                                logger.warning(f"Unable to stat {filepath}: {e}")
+                                continue
+                            _, manifest_entry, existing_entry = (
+                                manifest.check(filepath, new_sbom, stat_result=file_stat)
+                                if manifest
+                                else (None, None, None)
+                            )
+                            tasks.append(
+                                FileTask(
+                                    filepath,
+                                    entry,
+                                    root_path=epath.as_posix(),
+                                    container_uuid=parent_uuid,
+                                    install_path=install_prefix,
+                                    omit_unrecognized_types=omit_unrecognized_types
+                                    or bool(entry.omitUnrecognizedTypes),
+                                    file_filter=file_filter,
+                                    stat_result=file_stat,
+                                    manifest_entry=manifest_entry,
+                                    file_hashes=hash_cache.get(file_stat)
+                                    if executor is not None and not manifest_entry
+                                    else None,
+                                    software=existing_entry,
                                 )
-                            ) and os.path.splitext(filepath)[1].lower() not in [
-                                ext.lower() for ext in entry.excludeFileExts
-                            ]:
-                                try:
-                                    sw_parent, sw_children = get_software_entry(
-                                        contextQ,
-                                        entry,
-                                        pm,
-                                        new_sbom,
-                                        filepath,
-                                        filetype=ftype or [],
-                                        root_path=epath.as_posix(),
-                                        container_uuid=parent_uuid,
-                                        install_path=install_prefix,
-                                        user_institution_name=recorded_institution,
-                                        omit_unrecognized_types=omit_unrecognized_types
-                                        or entry.omitUnrecognizedTypes,
-                                        container_prefix=entry.containerPrefix,
-                                    )
-                                except Exception as e:
-                                    raise RuntimeError(f"Unable to process: {filepath}") from e
+                            )
 
-                                entries.append(sw_parent)
-                                entries.extend(sw_children if sw_children else [])
-                    new_sbom.add_software_entries(entries, parent_entry=parent_entry)
+                # process the files found, adding entries to the SBOM in the order they were walked
+                add_file_tasks(
+                    tasks,
+                    contextQ,
+                    pm,
+                    new_sbom,
+                    parent_entry=parent_entry,
+                    manifest=manifest,
+                    **run_kwargs,
+                )
+
+            spool_new_entries()
+
+            if checkpointer and checkpointer.due():
+                save_checkpoint()
+
+        if executor is not None:
+            executor.shutdown()
+        if extraction_cache is not None:
+            extraction_cache.close()
+        if watchdog:
+            if watchdog.timeouts:
+                logger.warning(f"{watchdog.timeouts} info extractor calls ran out of time")
+            watchdog.close()
+        if manifest:
+            manifest.save()
+        if hash_cache.hits:
+            logger.info(f"Reused hashes for {hash_cache.hits} hardlinked files and symlink targets")
 
         # Add symlinks to install paths and file names
         for software in new_sbom.software:
@@ -556,6 +1392,8 @@ def sbom(
                 if symlinks_added:
                     # Store information on which install paths are symlinks
                     software.metadata.append({"installPathSymlinks": symlinks_added})
+            if software.sha256 in filename_symlinks or software.sha256 in file_symlinks:
+                new_sbom.reindex_software(software)
 
         # Add directory symlink destinations to extract/install paths
         for software in new_sbom.software:
@@ -577,24 +1415,37 @@ def sbom(
                     if software.metadata is None:
                         software.metadata = []
                     if isinstance(software.metadata, Iterable):
-                        for md in software.metadata:
+                        for md_index, md in enumerate(software.metadata):
                             if isinstance(md, Dict) and "installPathSymlinks" in md:
                                 found_md_installpathsymlinks = True
                                 md["installPathSymlinks"] += paths_to_add
+                                # assigned back, since spooled metadata is a copy each time it's read
+                                software.metadata[md_index] = md
                     if not found_md_installpathsymlinks:
                         software.metadata.append({"installPathSymlinks": paths_to_add})
                     paths += paths_to_add
+                    new_sbom.reindex_software(software)
     else:
         logger.info("Skipping gathering file metadata and adding software entries")
 
     # add "Uses" relationships based on gathered metadata for software entries
-    if not skip_relationships:
+    if shard:
+        logger.info(f"Skipping relationships for shard {shard}; `surfactant reduce` adds them")
+    elif not skip_relationships:
         parse_relationships(pm, new_sbom)
     else:
         logger.info("Skipping relationships based on imports metadata")
 
     # TODO should contents from different containers go in different SBOM files, so new portions can be added bit-by-bit with a final merge?
     output_writer.write_sbom(new_sbom, sbom_outfile)
+    if metadata_spool:
+        metadata_spool.close()
+    if checkpointer:
+        # the run finished, so there is nothing left to resume
+        checkpointer.remove()
+    if profiler:
+        profiler.save(profile)
+        logger.info(f"Saved profiling report to {profile}")
 
 
 def resolve_link(
@@ -0,0 +1,174 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+import os
+import pathlib
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from surfactant import ContextEntry
+from surfactant.sbomtypes import SBOM, sbom_from_dict
+
+CHECKPOINT_VERSION = 1
+
+# Default number of seconds between checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 300
+
+# Minimum number of files per worker process to process between checkpoints within an extract path
+CHECKPOINT_BATCH_SIZE = 1000
+
+
+@dataclass
+class EntryProgress:
+    """How far processing got through the context entry that was in progress when a checkpoint was saved.
+
+    Attributes:
+        entry (ContextEntry): The context entry, with its install and container prefixes already cleaned up.
+        parent_sha256 (Optional[str]): SHA256 hash of the entry's archive, which is already in the SBOM.
+        extract_path_index (int): Index of the extract path being walked; earlier extract paths are done.
+        completed_dirs (List[str]): Directories in the extract path being walked whose files are all in the SBOM.
+        sharded (bool): Whether the entry's files are split between shards; only entries from the specimen
+            context and the entries queued for the archives they name are, since the entries added for
+            archives found among the files only exist in the shard that extracted them.
+    """
+
+    entry: ContextEntry
+    parent_sha256: Optional[str] = None
+    extract_path_index: int = 0
+    completed_dirs: List[str] = field(default_factory=list)
+    sharded: bool = True
+
+
+@dataclass
+# pylint: disable-next=too-many-instance-attributes
+class GenerateState:
+    """Everything needed to continue an interrupted `surfactant generate` run.
+
+    Attributes:
+        sbom (SBOM): The SBOM generated so far.
+        context_queue (List[ContextEntry]): Context entries still waiting to be processed.
+        current (Optional[EntryProgress]): Progress through the context entry being processed, if any.
+        dir_symlinks (List[Tuple[str, str]]): Directory symlinks found so far, as (source, dest) install paths.
+        file_symlinks (Dict[str, List[str]]): Install paths of file symlinks found so far, by target SHA256 hash.
+        filename_symlinks (Dict[str, List[str]]): Names of file symlinks found so far, by target SHA256 hash.
+        extract_dirs (Dict[str, Any]): Directories archives were extracted to, keyed by archive SHA256 hash.
+        sharded_entries (Optional[List[bool]]): Whether the files of each entry in `context_queue` are split
+            between shards (see `EntryProgress.sharded`); None if they all are.
+        manifest (Optional[Dict[str, Any]]): State of the incremental run manifest, from `FileManifest.get_state`;
+            None if the run isn't incremental.
+    """
+
+    sbom: SBOM
+    context_queue: List[ContextEntry] = field(default_factory=list)
+    current: Optional[EntryProgress] = None
+    dir_symlinks: List[Tuple[str, str]] = field(default_factory=list)
+    file_symlinks: Dict[str, List[str]] = field(default_factory=dict)
+    filename_symlinks: Dict[str, List[str]] = field(default_factory=dict)
+    extract_dirs: Dict[str, Any] = field(default_factory=dict)
+    sharded_entries: Optional[List[bool]] = None
+    manifest: Optional[Dict[str, Any]] = None
+
+
+class Checkpointer:
+    """Periodically saves the state of `surfactant generate --checkpoint` so that an interrupted run can be
+    continued with `--resume`.
+
+    Checkpoints are written to a temporary file that then replaces the previous checkpoint, so a run that is
+    killed while saving one still leaves the last complete checkpoint behind.
+
+    Attributes:
+        path (pathlib.Path): Location of the checkpoint file.
+        interval (float): Minimum number of seconds between checkpoints.
+    """
+
+    def __init__(
+        self, path: Union[str, pathlib.Path], interval: float = DEFAULT_CHECKPOINT_INTERVAL
+    ):
+        self.path = pathlib.Path(path)
+        self.interval = interval
+        self._last_save = time.monotonic()
+
+    def due(self) -> bool:
+        """Check if it has been long enough since the last checkpoint to save another."""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, state: GenerateState) -> None:
+        """Save a checkpoint, replacing the previous one.
+
+        Args:
+            state (GenerateState): The state of the run to save.
+        """
+        start = time.monotonic()
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "contextQueue": [asdict(entry) for entry in state.context_queue],
+            "current": asdict(state.current) if state.current else None,
+            "dirSymlinks": state.dir_symlinks,
+            "fileSymlinks": state.file_symlinks,
+            "filenameSymlinks": state.filename_symlinks,
+            "extractDirs": state.extract_dirs,
+            "shardedEntries": state.sharded_entries,
+            "manifest": state.manifest,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                # the SBOM goes last and is written one entry at a time, since it can be very large
+                f.write(json.dumps(header)[:-1])
+                f.write(', "sbom": ')
+                state.sbom.write_json(f)
+                f.write("}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._last_save = time.monotonic()
+        logger.info(f"Saved checkpoint {self.path} in {self._last_save - start:.1f}s")
+
+    def remove(self) -> None:
+        """Remove the checkpoint file, once the run it is for has finished."""
+        self.path.unlink(missing_ok=True)
+
+
+def load_checkpoint(path: Union[str, pathlib.Path]) -> GenerateState:
+    """Load the state saved by a `Checkpointer`.
+
+    Args:
+        path (Union[str, pathlib.Path]): Location of the checkpoint file.
+
+    Returns:
+        GenerateState: The saved state.
+
+    Raises:
+        ValueError: If the file isn't a checkpoint from a supported version of Surfactant.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a checkpoint from a supported version of Surfactant")
+    current = None
+    if data["current"]:
+        current = EntryProgress(**data["current"])
+        current.entry = ContextEntry(**data["current"]["entry"])
+    return GenerateState(
+        sbom=sbom_from_dict(data["sbom"]),
+        context_queue=[ContextEntry(**entry) for entry in data["contextQueue"]],
+        current=current,
+        dir_symlinks=[tuple(link) for link in data["dirSymlinks"]],
+        file_symlinks=data["fileSymlinks"],
+        filename_symlinks=data["filenameSymlinks"],
+        extract_dirs=data["extractDirs"],
+        sharded_entries=data.get("shardedEntries"),
+        manifest=data.get("manifest"),
+    )
@@ -0,0 +1,204 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import fnmatch
+import os
+import re
+import stat
+import sys
+from dataclasses import dataclass
+from typing import FrozenSet, Iterator, List, Optional, Pattern, Tuple, Union
+
+from loguru import logger
+
+from surfactant.context import ContextEntry
+
+
+@dataclass(frozen=True)
+class PathRule:
+    """A compiled `includePaths` or `excludePaths` rule from a context entry.
+
+    Rules starting with `re:` are regular expressions searched for in the path of a file or directory
+    relative to the extract path. Other rules are glob patterns; a glob containing a `/` must match the
+    whole relative path, and one without a `/` must match just the file or directory name.
+
+    Attributes:
+        regex (Pattern[str]): The compiled rule.
+        match_name (bool): Whether the rule is matched against the name instead of the relative path.
+        prefix (Optional[str]): The literal start of a path glob (before any wildcards), which every path it
+            matches begins with; None if it can't be used to rule out directories.
+    """
+
+    regex: Pattern[str]
+    match_name: bool = False
+    prefix: Optional[str] = None
+
+    @classmethod
+    def compile(cls, rule: str) -> "PathRule":
+        if rule.startswith("re:"):
+            return cls(re.compile(rule[3:]))
+        rule = rule.strip("/")
+        regex = re.compile(r"\A" + fnmatch.translate(rule))
+        if "/" not in rule:
+            return cls(regex, match_name=True)
+        return cls(regex, prefix=re.split(r"[*?\[]", rule, maxsplit=1)[0])
+
+    def matches(self, rel_path: str, name: str) -> bool:
+        return self.regex.search(name if self.match_name else rel_path) is not None
+
+    def could_match_under(self, rel_dir: str) -> bool:
+        """Check if the rule could match anything in a directory (or the directory itself)."""
+        if self.prefix is None:
+            return True
+        rel_dir += "/"
+        return self.prefix.startswith(rel_dir) or rel_dir.startswith(self.prefix)
+
+
+@dataclass(frozen=True)
+# pylint: disable-next=too-many-instance-attributes
+class FileFilter:
+    """The file filters from a context entry, prepared once so they can be checked quickly for
+    every file and directory found in its extract paths.
+
+    Attributes:
+        include_exts (FrozenSet[str]): Lowercase extensions of files to include even if their type isn't recognized.
+        exclude_exts (FrozenSet[str]): Lowercase extensions of files to leave out.
+        include_paths (Tuple[PathRule, ...]): If any are given, only files matching one of these rules (or in a
+            directory that does) are included.
+        exclude_paths (Tuple[PathRule, ...]): Files and directories matching any of these rules are left out.
+        max_depth (Optional[int]): How many levels of subdirectories below the extract path to walk into.
+        max_file_size (Optional[int]): Files larger than this many bytes are left out.
+        skip_hidden (bool): Whether hidden files and directories are left out.
+    """
+
+    include_exts: FrozenSet[str] = frozenset()
+    exclude_exts: FrozenSet[str] = frozenset()
+    include_paths: Tuple[PathRule, ...] = ()
+    exclude_paths: Tuple[PathRule, ...] = ()
+    max_depth: Optional[int] = None
+    max_file_size: Optional[int] = None
+    skip_hidden: bool = False
+
+    @classmethod
+    def from_context(cls, context: ContextEntry) -> "FileFilter":
+        return cls(
+            include_exts=frozenset(ext.lower() for ext in context.includeFileExts or []),
+            exclude_exts=frozenset(ext.lower() for ext in context.excludeFileExts or []),
+            include_paths=tuple(PathRule.compile(rule) for rule in context.includePaths or []),
+            exclude_paths=tuple(PathRule.compile(rule) for rule in context.excludePaths or []),
+            max_depth=context.maxDepth,
+            max_file_size=context.maxFileSize,
+            skip_hidden=bool(context.skipHidden),
+        )
+
+    @staticmethod
+    def get_extension(filepath: str) -> str:
+        return os.path.splitext(filepath)[1].lower()
+
+    @staticmethod
+    def is_hidden(dir_entry: os.DirEntry) -> bool:
+        if dir_entry.name.startswith("."):
+            return True
+        # on Windows the file attributes come from the directory listing, so this doesn't need another system call
+        if sys.platform == "win32":
+            try:
+                attributes = dir_entry.stat(follow_symlinks=False).st_file_attributes
+            except OSError:
+                return False
+            return bool(attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+        return False
+
+    def is_excluded(self, filepath: str) -> bool:
+        return bool(self.exclude_exts) and self.get_extension(filepath) in self.exclude_exts
+
+    def is_included(self, filepath: str) -> bool:
+        return bool(self.include_exts) and self.get_extension(filepath) in self.include_exts
+
+    def is_path_excluded(self, rel_path: str, dir_entry: os.DirEntry) -> bool:
+        """Check if a file or directory is left out by the exclude path rules or because it is hidden."""
+        if self.skip_hidden and self.is_hidden(dir_entry):
+            return True
+        return any(rule.matches(rel_path, dir_entry.name) for rule in self.exclude_paths)
+
+    def is_path_included(self, rel_path: str, name: str) -> bool:
+        return any(rule.matches(rel_path, name) for rule in self.include_paths)
+
+    def is_too_large(self, dir_entry: os.DirEntry) -> bool:
+        if self.max_file_size is None or dir_entry.is_symlink():
+            return False
+        try:
+            return dir_entry.stat().st_size > self.max_file_size
+        except OSError:
+            return False
+
+
+def walk_dir(
+    top: Union[str, os.PathLike],
+    file_filter: Optional[FileFilter] = None,
+) -> Iterator[Tuple[str, List[os.DirEntry], List[os.DirEntry]]]:
+    """Walk a directory tree top-down like `os.walk`, but yield the `os.DirEntry` objects for each
+    directory and file instead of just their names. The file type and stat results of a `DirEntry`
+    are cached, so checking whether an entry is a symlink or a file, and getting its size and
+    modification time, takes at most one system call per entry (often none).
+
+    Symlinks to directories are listed with the directories, but aren't walked into. Directories
+    that can't be read are skipped. Entries can be removed from the list of directories to avoid
+    walking into them.
+
+    If a file filter is given, its path, depth, size, and hidden file rules are applied while walking:
+    directories that are left out aren't listed or walked into at all.
+
+    Args:
+        top (Union[str, os.PathLike]): The directory to walk.
+        file_filter (Optional[FileFilter]): The filters to apply to the files and directories found.
+
+    Yields:
+        Tuple[str, List[os.DirEntry], List[os.DirEntry]]: The path of each directory, and the entries
+        for the directories and files in it.
+    """
+    if file_filter is None:
+        file_filter = FileFilter()
+    # directory path, path relative to top, depth below top, and whether the include path rules are satisfied
+    stack: List[Tuple[str, str, int, bool]] = [
+        (os.fspath(top), "", 0, not file_filter.include_paths)
+    ]
+    while stack:
+        cdir, rel_dir, depth, included = stack.pop()
+        dirs: List[os.DirEntry] = []
+        included_dirs = set()
+        files: List[os.DirEntry] = []
+        try:
+            with os.scandir(cdir) as it:
+                for dir_entry in it:
+                    rel_path = f"{rel_dir}/{dir_entry.name}" if rel_dir else dir_entry.name
+                    if file_filter.is_path_excluded(rel_path, dir_entry):
+                        continue
+                    try:
+                        is_dir = dir_entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    entry_included = included or file_filter.is_path_included(
+                        rel_path, dir_entry.name
+                    )
+                    if is_dir:
+                        if not entry_included and not any(
+                            rule.could_match_under(rel_path) for rule in file_filter.include_paths
+                        ):
+                            continue
+                        if entry_included:
+                            included_dirs.add(dir_entry.name)
+                        dirs.append(dir_entry)
+                    elif entry_included and not file_filter.is_too_large(dir_entry):
+                        files.append(dir_entry)
+        except OSError as e:
+            logger.warning(f"Unable to read directory {cdir}: {e}")
+            continue
+        yield cdir, dirs, files
+        if file_filter.max_depth is not None and depth >= file_filter.max_depth:
+            continue
+        # walk subdirectories in the order they were listed, without following symlinks
+        for dir_entry in reversed(dirs):
+            if not dir_entry.is_symlink():
+                rel_path = f"{rel_dir}/{dir_entry.name}" if rel_dir else dir_entry.name
+                stack.append((dir_entry.path, rel_path, depth + 1, dir_entry.name in included_dirs))
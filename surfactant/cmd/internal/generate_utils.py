@@ -2,9 +2,12 @@
 # See the top-level LICENSE file for details.
 #
 # SPDX-License-Identifier: MIT
+import hashlib
 import json
 import os
 import pathlib
+import re
+from dataclasses import dataclass
 
 import click
 
@@ -116,3 +119,53 @@ class SpecimenContextParamType(click.Path):
             self.fail(f"{value!r} is not a valid specimen context type", param, ctx)
 
         return context
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One of several parts that the files found in extract paths are split into, so that separate
+    `surfactant generate --shard` runs (e.g. on different machines) can each process one part.
+
+    Files are assigned to shards by a hash of a key identifying them (see `includes`), so every run
+    splits them up the same way without needing to coordinate.
+
+    Attributes:
+        index (int): Which shard this is, from 1 to `count`.
+        count (int): The number of shards the files are split into.
+    """
+
+    index: int
+    count: int
+
+    def includes(self, key: str) -> bool:
+        """Check if a file belongs to this shard.
+
+        Args:
+            key (str): A key for the file that is the same for every run, such as its path relative to the
+                extract path it was found in.
+
+        Returns:
+            bool: True if the file should be processed by this shard.
+        """
+        digest = hashlib.sha256(key.encode("utf-8", "surrogateescape")).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index - 1
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+class ShardParamType(click.ParamType):
+    """A Click parameter type for shards given as `i/N`, meaning shard i of N (numbered from 1)."""
+
+    name = "shard"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, Shard):
+            return value
+        match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value)
+        if not match:
+            self.fail(f"{value!r} is not in the form i/N", param, ctx)
+        index, count = int(match.group(1)), int(match.group(2))
+        if not 1 <= index <= count:
+            self.fail(f"shard {index} must be between 1 and {count}", param, ctx)
+        return Shard(index, count)
@@ -0,0 +1,113 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import os
+from typing import Dict, Optional, Tuple
+
+from surfactant.fileinfo import HASH_ALGORITHMS, FileContent, hash_file_content
+from surfactant.sbomtypes import Software
+
+# Identifies the contents of a file on disk: (st_dev, st_ino, st_size, st_mtime_ns)
+FileIdentity = Tuple[int, int, int, int]
+
+
+def file_identity(stat_result: os.stat_result) -> Optional[FileIdentity]:
+    """Get the identity of a file from its stat results. Hardlinks to the same file have the same
+    identity, and a file that is changed (or replaced) gets a new one.
+
+    Args:
+        stat_result (os.stat_result): Stat results for the file, following symlinks.
+
+    Returns:
+        Optional[FileIdentity]: The identity, or None if the platform doesn't give files inode numbers
+        (e.g. stat results from os.scandir on Windows).
+    """
+    if not stat_result.st_ino:
+        return None
+    return (stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+
+class FileHashCache:
+    """Hashes of files calculated during a `surfactant generate` run, keyed by file identity, so that
+    hardlinked files and symlink targets are only read and hashed once. Files with another copy of
+    their hash already in the SBOM also skip most info extractors, so a cache hit costs little more
+    than a stat.
+
+    To keep memory use down, only files that can be seen again are kept: those with more than one
+    hardlink, and symlink targets.
+
+    Attributes:
+        hits (int): The number of times hashes were found in the cache.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[FileIdentity, Tuple[Optional[str], ...]] = {}
+        self.hits = 0
+
+    def get(self, stat_result: Optional[os.stat_result]) -> Optional[Dict[str, Optional[str]]]:
+        """Look up the hashes of a file.
+
+        Args:
+            stat_result (Optional[os.stat_result]): Stat results for the file.
+
+        Returns:
+            Optional[Dict[str, Optional[str]]]: The hashes, in the same format as `calc_file_hashes`, or None
+            if the file hasn't been hashed.
+        """
+        key = file_identity(stat_result) if stat_result else None
+        digests = self._hashes.get(key) if key else None
+        if digests is None:
+            return None
+        self.hits += 1
+        return dict(zip(HASH_ALGORITHMS, digests))
+
+    def add(
+        self,
+        stat_result: Optional[os.stat_result],
+        hashes: Dict[str, Optional[str]],
+        force: bool = False,
+    ) -> None:
+        """Record the hashes of a file, if it has other hardlinks that may be seen later.
+
+        Args:
+            stat_result (Optional[os.stat_result]): Stat results for the file.
+            hashes (Dict[str, Optional[str]]): The file hashes, in the same format as `calc_file_hashes`.
+            force (bool): Record the hashes even if the file has no other hardlinks.
+        """
+        key = file_identity(stat_result) if stat_result else None
+        if key and (force or stat_result.st_nlink > 1) and hashes.get("sha256"):
+            self._hashes[key] = tuple(hashes.get(name) for name in HASH_ALGORITHMS)
+
+    def add_software(self, stat_result: Optional[os.stat_result], software: Software) -> None:
+        """Record the hashes of a file from its software entry, if it has other hardlinks that may be seen later.
+
+        Args:
+            stat_result (Optional[os.stat_result]): Stat results for the file.
+            software (Software): The software entry created for the file.
+        """
+        self.add(
+            stat_result, {"sha256": software.sha256, "sha1": software.sha1, "md5": software.md5}
+        )
+
+    def sha256sum(self, filepath: str) -> str:
+        """Get the sha256 hash of a file, hashing it (and keeping all its hashes for when the file itself is
+        processed) if it isn't in the cache. Used for symlink targets.
+
+        Args:
+            filepath (str): Path to the file.
+
+        Returns:
+            str: The sha256 hash of the file.
+
+        Raises:
+            FileNotFoundError: If the file could not be found.
+            PermissionError: If the file could not be read.
+        """
+        stat_result = os.stat(filepath)
+        hashes = self.get(stat_result)
+        if hashes is None:
+            with FileContent(filepath) as content:
+                hashes = hash_file_content(content)
+            self.add(stat_result, hashes, force=True)
+        return hashes["sha256"]
@@ -0,0 +1,197 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+import os
+import pathlib
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+from loguru import logger
+
+from surfactant.sbomtypes import SBOM, Software
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """The stat details, hashes, and software entry UUID recorded for a file.
+
+    Attributes:
+        size (int): File size in bytes.
+        mtime_ns (int): Last modification time in nanoseconds.
+        ino (int): Inode number.
+        dev (int): Device the file is on.
+        sha256 (str): SHA256 hash of the file contents.
+        sha1 (Optional[str]): SHA1 hash of the file contents, if calculated.
+        md5 (Optional[str]): MD5 hash of the file contents, if calculated.
+        UUID (str): UUID of the software entry for the file.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    size: int
+    mtime_ns: int
+    ino: int
+    dev: int
+    sha256: str
+    sha1: Optional[str]
+    md5: Optional[str]
+    UUID: str
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        return (
+            self.size == stat_result.st_size
+            and self.mtime_ns == stat_result.st_mtime_ns
+            and self.ino == stat_result.st_ino
+            and self.dev == stat_result.st_dev
+        )
+
+    @property
+    def hashes(self) -> Dict[str, Optional[str]]:
+        """The file hashes, in the same format as `calc_file_hashes`."""
+        return {"sha256": self.sha256, "sha1": self.sha1, "md5": self.md5}
+
+
+class FileManifest:
+    """A record of the files scanned by `surfactant generate --incremental`, used by later runs
+    to skip hashing (and, if the software entry is in the input SBOM, processing) files that
+    haven't changed since.
+
+    A file is considered unchanged if its size, modification time, inode, and device all match
+    what was recorded. Files modified at or after the start of the recorded scan are always
+    treated as changed, since a write in the same timestamp tick could go unnoticed.
+
+    Attributes:
+        path (pathlib.Path): Location of the manifest file.
+        entries (Dict[str, ManifestEntry]): Entries loaded from the existing manifest, keyed by file path.
+        updated (Dict[str, ManifestEntry]): Entries for files scanned in the current run, written by `save`.
+    """
+
+    def __init__(self, path: Union[str, pathlib.Path]):
+        """Load an existing manifest, if there is one.
+
+        Args:
+            path (Union[str, pathlib.Path]): Location of the manifest file.
+        """
+        self.path = pathlib.Path(path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.updated: Dict[str, ManifestEntry] = {}
+        self._scan_time_ns = time.time_ns()
+        self._loaded_scan_time_ns = 0
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self._loaded_scan_time_ns = data["scanTime"]
+                    self.entries = {
+                        filepath: ManifestEntry(**entry)
+                        for filepath, entry in data["files"].items()
+                    }
+                else:
+                    logger.warning(f"Ignoring manifest {self.path} with unsupported version")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+        logger.info(f"Loaded {len(self.entries)} entries from manifest {self.path}")
+
+    def lookup(self, filepath: str, stat_result: os.stat_result) -> Optional[ManifestEntry]:
+        """Get the recorded entry for a file, if the file is unchanged since it was recorded.
+
+        Args:
+            filepath (str): Path to the file.
+            stat_result (os.stat_result): Current stat results for the file.
+
+        Returns:
+            Optional[ManifestEntry]: The recorded entry, or None if there isn't one or the file changed.
+        """
+        entry = self.updated.get(filepath)
+        if entry is None:
+            entry = self.entries.get(filepath)
+            if entry is None or stat_result.st_mtime_ns >= self._loaded_scan_time_ns:
+                return None
+        return entry if entry.matches(stat_result) else None
+
+    def check(
+        self, filepath: str, sbom: SBOM, stat_result: Optional[os.stat_result] = None
+    ) -> Tuple[Optional[os.stat_result], Optional[ManifestEntry], Optional[Software]]:
+        """Check whether a file is unchanged, and whether its software entry from the run that
+        recorded it is in the SBOM.
+
+        Args:
+            filepath (str): Path to the file.
+            sbom (SBOM): The SBOM being generated, which may include entries from an input SBOM.
+            stat_result (Optional[os.stat_result]): Current stat results for the file, if already known.
+
+        Returns:
+            Tuple[Optional[os.stat_result], Optional[ManifestEntry], Optional[Software]]: The current stat
+            results for the file (None if it couldn't be accessed), the recorded entry if the file is unchanged,
+            and the existing software entry for the file if it can be reused as is.
+        """
+        if stat_result is None:
+            try:
+                stat_result = os.stat(filepath)
+            except OSError:
+                return None, None, None
+        entry = self.lookup(filepath, stat_result)
+        if entry is None:
+            return stat_result, None, None
+        software = sbom.find_software(entry.sha256)
+        if software is None or software.UUID != entry.UUID:
+            return stat_result, entry, None
+        return stat_result, entry, software
+
+    def record(self, filepath: str, stat_result: os.stat_result, software: Software) -> None:
+        """Record the details for a file scanned in the current run.
+
+        Args:
+            filepath (str): Path to the file.
+            stat_result (os.stat_result): Stat results for the file from when it was scanned.
+            software (Software): The software entry for the file in the SBOM.
+        """
+        self.updated[filepath] = ManifestEntry(
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            ino=stat_result.st_ino,
+            dev=stat_result.st_dev,
+            sha256=software.sha256,
+            sha1=software.sha1,
+            md5=software.md5,
+            UUID=software.UUID,
+        )
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get the entries for files scanned so far in the current run, along with the time the scan
+        started, so they can be saved in a checkpoint.
+
+        Returns:
+            Dict[str, Any]: The state of the current run, in the same format as the manifest file.
+        """
+        return {
+            "scanTime": self._scan_time_ns,
+            "files": {filepath: asdict(entry) for filepath, entry in self.updated.items()},
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Continue an interrupted run using the state saved by `get_state`.
+
+        Args:
+            state (Dict[str, Any]): The state of the interrupted run.
+        """
+        self._scan_time_ns = state["scanTime"]
+        self.updated = {
+            filepath: ManifestEntry(**entry) for filepath, entry in state["files"].items()
+        }
+
+    def save(self) -> None:
+        """Write the entries for files scanned in the current run to the manifest file."""
+        data = {"version": MANIFEST_VERSION, **self.get_state()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so an interrupted run doesn't leave a corrupt manifest
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved {len(self.updated)} entries to manifest {self.path}")
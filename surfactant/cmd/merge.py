@@ -1,9 +1,8 @@
 import json
 import uuid as uuid_module
-from typing import Tuple
+from typing import List, Tuple
 
 import click
-import networkx as nx
 from loguru import logger
 
 from surfactant.configmanager import ConfigManager
@@ -11,6 +10,9 @@ from surfactant.plugin.manager import find_io_plugin, get_plugin_manager
 from surfactant.sbomtypes._sbom import SBOM
 from surfactant.sbomtypes._system import System
 
+# Number of groups of entries with circular relationships to log an example cycle for
+MAX_CYCLES_LOGGED = 10
+
 
 @click.argument("sbom_outfile", envvar="SBOM_OUTPUT", type=click.File("w"), required=True)
 @click.argument("input_sboms", type=click.File("r"), required=True, nargs=-1)
@@ -97,16 +99,10 @@ def merge(
     for sbom_m in input_sboms[1:]:
         merged_sbom.merge(sbom_m)
 
-    # Find root nodes: those with zero incoming edges
-    roots = [n for n, deg in merged_sbom.graph.in_degree() if deg == 0]
+    # Find root nodes (those with zero incoming edges) and any directed cycles
+    roots, cyclic_components = merged_sbom.graph.roots_and_cycles()
     logger.info(f"ROOT NODES: {roots}")
-
-    # Detect any directed cycles
-    cycles = list(nx.simple_cycles(merged_sbom.graph))
-    if cycles:
-        logger.warning(f"SBOM CYCLE(S) DETECTED: {cycles}")
-    else:
-        logger.info("No cycles detected in SBOM graph")
+    log_cycles(merged_sbom, cyclic_components)
 
     # Prepare (or suppress) the top‐level system entry
     if config and "system" in config and "UUID" in config["system"]:
@@ -133,6 +129,33 @@ def merge(
     output_writer.write_sbom(merged_sbom, sbom_outfile)
 
 
+def log_cycles(sbom: SBOM, cyclic_components: List[List[str]]):
+    """Log the groups of SBOM entries with circular relationships, with an example cycle from the first
+    `MAX_CYCLES_LOGGED` groups.
+
+    Args:
+        sbom (SBOM): The SBOM.
+        cyclic_components (List[List[str]]): The UUIDs of the entries in each group, from
+            `roots_and_cycles`.
+    """
+    if not cyclic_components:
+        logger.info("No cycles detected in SBOM graph")
+        return
+    logger.warning(
+        f"SBOM CYCLE(S) DETECTED: {len(cyclic_components)} group(s) of entries with circular "
+        f"relationships, {sum(len(component) for component in cyclic_components)} entries in total"
+    )
+    for component in cyclic_components[:MAX_CYCLES_LOGGED]:
+        cycle = sbom.graph.find_cycle(component)
+        logger.warning(
+            f"SBOM CYCLE: {' -> '.join(cycle + cycle[:1])} ({len(component)} entries in group)"
+        )
+    if len(cyclic_components) > MAX_CYCLES_LOGGED:
+        logger.warning(
+            f"{len(cyclic_components) - MAX_CYCLES_LOGGED} more group(s) with cycles not shown"
+        )
+
+
 def create_system_object(sbom: SBOM, config=None, system_uuid=None) -> Tuple[System, bool]:
     """Function to create an accurate system object
 
@@ -0,0 +1,99 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+from typing import Any, Dict, List, Sequence
+
+import click
+
+
+def _format_timing(timing: Dict[str, Any]) -> List[str]:
+    calls = timing["calls"]
+    average = timing["wall"] / calls * 1000 if calls else 0.0
+    return [str(calls), f"{timing['wall']:.3f}", f"{timing['cpu']:.3f}", f"{average:.2f}"]
+
+
+def _echo_table(title: str, headers: Sequence[str], rows: List[List[str]]) -> None:
+    click.echo(title)
+    widths = [max(len(str(row[i])) for row in [headers, *rows]) for i in range(len(headers))]
+    # left align the first (name) column, right align the numbers
+    line_format = "  ".join(
+        f"{{:<{width}}}" if i == 0 else f"{{:>{width}}}" for i, width in enumerate(widths)
+    )
+    click.echo(line_format.format(*headers))
+    click.echo(line_format.format(*("-" * width for width in widths)))
+    for row in rows:
+        click.echo(line_format.format(*row))
+    click.echo()
+
+
+@click.command("profile")
+@click.argument("report", type=click.File("r"), required=True)
+@click.option(
+    "--top",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of plugins, file types, and files to list in each table",
+)
+def profile(report, top: int):
+    """Print a profiling report written by `surfactant generate --profile`."""
+    data = json.load(report)
+    timing_headers = ["calls", "wall (s)", "cpu (s)", "avg wall (ms)"]
+
+    total = data["total"]
+    click.echo(
+        f"Total: {total['wall']:.3f}s wall, {total['cpu']:.3f}s cpu (main process), {data['files']} files"
+    )
+    click.echo()
+    _echo_table(
+        "Phases",
+        ["phase", *timing_headers],
+        [[phase, *_format_timing(timing)] for phase, timing in data["phases"].items()],
+    )
+
+    plugin_rows = [
+        (timing["wall"], [f"{hook_name}: {plugin_name}", *_format_timing(timing)])
+        for hook_name, plugin_timings in data["plugins"].items()
+        for plugin_name, timing in plugin_timings.items()
+    ]
+    plugin_rows.sort(key=lambda row: row[0], reverse=True)
+    _echo_table(
+        "Plugins (slowest first)",
+        ["hook: plugin", *timing_headers],
+        [row for _, row in plugin_rows[:top]],
+    )
+
+    filetypes = sorted(data["filetypes"].items(), key=lambda item: item[1]["wall"], reverse=True)
+    _echo_table(
+        "File types (slowest first)",
+        ["file type", "files", "wall (s)", "cpu (s)", "avg wall (ms)"],
+        [[filetype, *_format_timing(timing)] for filetype, timing in filetypes[:top]],
+    )
+
+    file_rows = []
+    for file_profile in data["slowestFiles"][:top]:
+        # the plugin the most time was spent in for the file
+        slowest_plugin = max(
+            (
+                (timing["wall"], plugin_name)
+                for plugin_timings in file_profile["plugins"].values()
+                for plugin_name, timing in plugin_timings.items()
+            ),
+            default=(0.0, ""),
+        )
+        file_rows.append(
+            [
+                file_profile["path"],
+                ",".join(file_profile["filetype"]),
+                f"{file_profile['total']['wall']:.3f}",
+                f"{file_profile['hashing']['wall']:.3f}",
+                f"{slowest_plugin[1]} ({slowest_plugin[0]:.3f})" if slowest_plugin[1] else "",
+            ]
+        )
+    _echo_table(
+        "Slowest files",
+        ["path", "file type", "wall (s)", "hashing (s)", "slowest plugin (s)"],
+        file_rows,
+    )
@@ -0,0 +1,76 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+from typing import Iterable, Optional
+
+import click
+from loguru import logger
+
+from surfactant.configmanager import ConfigManager
+from surfactant.plugin.manager import find_io_plugin, get_plugin_manager
+from surfactant.relationships import parse_relationships
+from surfactant.sbomtypes import SBOM
+
+
+def reduce_sboms(partial_sboms: Iterable[SBOM]) -> Optional[SBOM]:
+    """Combine partial SBOMs into one, merging software entries with matching hashes.
+
+    Args:
+        partial_sboms (Iterable[SBOM]): The partial SBOMs, merged in the order given.
+
+    Returns:
+        Optional[SBOM]: The combined SBOM, or None if no SBOMs were given.
+    """
+    reduced: Optional[SBOM] = None
+    for partial_sbom in partial_sboms:
+        if reduced is None:
+            reduced = partial_sbom
+        else:
+            reduced.merge(partial_sbom)
+    return reduced
+
+
+@click.command("reduce")
+@click.argument("partial_sboms", type=click.File("r"), required=True, nargs=-1)
+@click.argument("sbom_outfile", type=click.File("w"), required=True)
+@click.option(
+    "--output_format",
+    is_flag=False,
+    default=ConfigManager().get(
+        "core", "output_format", fallback="surfactant.output.cytrics_writer"
+    ),
+    help="SBOM output format, see `surfactant generate --list_output_formats` for list of options; default is CyTRICS",
+)
+@click.option(
+    "--input_format",
+    is_flag=False,
+    default="surfactant.input_readers.cytrics_reader",
+    help="Format of the partial SBOMs; default is CyTRICS",
+)
+@click.option(
+    "--skip_relationships",
+    is_flag=True,
+    default=False,
+    required=False,
+    help="Skip adding relationships based on Linux/Windows/etc metadata",
+)
+def reduce_command(partial_sboms, sbom_outfile, output_format, input_format, skip_relationships):
+    """Combine the PARTIAL_SBOMS written by `surfactant generate --shard` runs into SBOM_OUTFILE.
+
+    Software entries for the same file from more than one shard are merged, and relationships
+    based on the gathered metadata are then added once for all of the software entries.
+    """
+    pm = get_plugin_manager()
+    output_writer = find_io_plugin(pm, output_format, "write_sbom")
+    input_reader = find_io_plugin(pm, input_format, "read_sbom")
+
+    # read the partial SBOMs one at a time as they are merged
+    reduced = reduce_sboms(input_reader.read_sbom(infile) for infile in partial_sboms)
+    logger.info(f"Combined {len(partial_sboms)} partial SBOMs")
+
+    if not skip_relationships:
+        parse_relationships(pm, reduced)
+    else:
+        logger.info("Skipping relationships based on imports metadata")
+    output_writer.write_sbom(reduced, sbom_outfile)
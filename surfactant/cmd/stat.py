@@ -1,13 +1,13 @@
 import click
 
-from surfactant.sbomtypes import SBOM
+from surfactant.sbomtypes import load_sbom_json
 
 
 @click.command("stat")
 @click.argument("input_sbom", type=click.File("r"), required=True)
 def stat(input_sbom):
     """Print simple statistics about a SBOM."""
-    data = SBOM.from_json(input_sbom.read())
+    data = load_sbom_json(input_sbom.read())
     elfIsLib = 0
     elfIsExe = 0
     peIsExe = 0
@@ -30,6 +30,13 @@ class ContextEntry:
             Software entry for the archive file will only contain basic information such as hashes. Default is False.
         containerPrefix (Optional[str]): The prefix to use for the generated SBOM's containerPath.  Used to indicate that the
             `extractPaths` specified should map to a specific subfolder within the corresponding archive file.
+        excludePaths (Optional[List[str]]): Glob patterns (or regular expressions prefixed with `re:`) for files and
+            directories to leave out. Directories that match aren't walked into.
+        includePaths (Optional[List[str]]): Glob patterns (or regular expressions prefixed with `re:`) for files and
+            directories to include; if given, only files matching a pattern (or in a matching directory) are included.
+        maxDepth (Optional[int]): How many levels of subdirectories below each extract path to walk into.
+        maxFileSize (Optional[int]): Files larger than this size in bytes are left out.
+        skipHidden (Optional[bool]): If True, hidden files and directories are left out.
     """
 
     extractPaths: List[str]
@@ -40,3 +47,8 @@ class ContextEntry:
     excludeFileExts: Optional[List[str]] = None
     skipProcessingArchive: Optional[bool] = False
     containerPrefix: Optional[str] = None
+    excludePaths: Optional[List[str]] = None
+    includePaths: Optional[List[str]] = None
+    maxDepth: Optional[int] = None
+    maxFileSize: Optional[int] = None
+    skipHidden: Optional[bool] = None
@@ -0,0 +1,372 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import hashlib
+import importlib.metadata
+import json
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pluggy
+from loguru import logger
+
+import surfactant
+from surfactant.configmanager import ConfigManager
+from surfactant.extractor_watchdog import is_timeout_note
+from surfactant.plugin.manager import (
+    call_hookimpl,
+    get_hookimpls_in_call_order,
+    is_hook_implemented,
+)
+
+# Default limit on the size of the cached results, in MiB
+DEFAULT_MAX_SIZE_MB = 1024
+
+# (plugin name, plugin version, hash of the plugin settings)
+PluginKey = Tuple[str, str, str]
+
+# Version of the stored results format; caches in other formats are cleared when opened
+_FORMAT_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    sha256 TEXT NOT NULL,
+    filetype TEXT NOT NULL,
+    plugin TEXT NOT NULL,
+    version TEXT NOT NULL,
+    config TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (sha256, filetype, plugin, version, config)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def get_default_cache_path() -> Path:
+    """Get the location of the extraction cache database, from the `cache.path` setting if set.
+
+    Returns:
+        Path: The path to the cache database file.
+    """
+    config_manager = ConfigManager()
+    path = config_manager.get("cache", "path")
+    if path:
+        return Path(path).expanduser()
+    return config_manager.get_data_dir_path() / "cache" / "extraction_cache.db"
+
+
+def get_default_max_size() -> int:
+    """Get the size limit for the extraction cache from the `cache.max_size_mb` setting.
+
+    Returns:
+        int: The maximum size of the cached results in bytes.
+    """
+    return int(ConfigManager().get("cache", "max_size_mb", DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+
+
+class ExtractionCache:
+    """A persistent cache of `extract_file_info` results, keyed by the hash of the file contents,
+    the file type, and the name, version, and settings of the plugin that produced them.
+
+    Only plugins that return True from the `cacheable_extraction` hook have their results cached.
+    Results are pickled into a SQLite database, so reused results have the same types as the
+    original ones (e.g. tuples and non-string dict keys); once the cache grows past its size limit,
+    the least recently used results are removed when the cache is closed.
+
+    Attributes:
+        path (Path): The location of the cache database.
+        max_size (int): The maximum size of the cached results in bytes.
+        hits (int): The number of plugin results reused from the cache.
+        misses (int): The number of new plugin results extracted and added to the cache.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, max_size: Optional[int] = None):
+        """Opens (creating if needed) the cache database.
+
+        Args:
+            path (Optional[Union[str, Path]]): Location of the cache database; defaults to the `cache.path`
+                setting, or `cache/extraction_cache.db` in the Surfactant data directory.
+            max_size (Optional[int]): Size limit in bytes; defaults to the `cache.max_size_mb` setting.
+        """
+        self.path = Path(path) if path else get_default_cache_path()
+        self.max_size = max_size if max_size is not None else get_default_max_size()
+        self.hits = 0
+        self.misses = 0
+        self._plugin_keys: Dict[str, Optional[PluginKey]] = {}
+        self._used: Dict[Tuple[str, str, str, str, str], None] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # workers in other processes may share the cache, so wait on locks instead of failing
+        self._conn = sqlite3.connect(self.path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _FORMAT_VERSION:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS results")
+                self._conn.execute(f"PRAGMA user_version = {_FORMAT_VERSION}")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ExtractionCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def _get_plugin_version(pm: pluggy.PluginManager, plugin: object) -> Optional[str]:
+        for dist_plugin, dist in pm.list_plugin_distinfo():
+            if dist_plugin is plugin:
+                return str(dist.version)
+        if hasattr(plugin, "__version__"):
+            return str(plugin.__version__)
+        # built-in plugins change with the version of Surfactant, which may be running from a source
+        # checkout that isn't installed
+        try:
+            return importlib.metadata.version("surfactant")
+        except importlib.metadata.PackageNotFoundError:
+            return surfactant.__version__ or None
+
+    def get_plugin_key(self, pm: pluggy.PluginManager, plugin: object) -> Optional[PluginKey]:
+        """Get the part of the cache key identifying a plugin.
+
+        Args:
+            pm (pluggy.PluginManager): The plugin manager the plugin is registered with.
+            plugin (object): The plugin.
+
+        Returns:
+            Optional[PluginKey]: The plugin name, version, and a hash of its settings, or None if the
+            plugin's results can't be cached.
+        """
+        name = pm.get_name(plugin)
+        if name in self._plugin_keys:
+            return self._plugin_keys[name]
+        key: Optional[PluginKey] = None
+        if (
+            is_hook_implemented(pm, plugin, "cacheable_extraction")
+            and plugin.cacheable_extraction()
+        ):
+            settings: Any = None
+            if is_hook_implemented(pm, plugin, "settings_name") and plugin.settings_name():
+                settings = ConfigManager()[plugin.settings_name()]
+                if hasattr(settings, "unwrap"):
+                    settings = settings.unwrap()
+            settings_hash = hashlib.sha256(
+                json.dumps(settings, sort_keys=True, default=str).encode()
+            ).hexdigest()
+            version = self._get_plugin_version(pm, plugin)
+            if version is None:
+                logger.debug(f"Not caching {name} results, since its version is unknown")
+            else:
+                key = (name, version, settings_hash)
+        self._plugin_keys[name] = key
+        return key
+
+    def lookup(self, sha256: str, filetype: List[str]) -> Dict[PluginKey, bytes]:
+        """Get the cached results for a file.
+
+        Args:
+            sha256 (str): SHA256 hash of the file contents.
+            filetype (List[str]): The identified file types for the file.
+
+        Returns:
+            Dict[PluginKey, bytes]: Pickled results for the file, keyed by plugin.
+        """
+        rows = self._conn.execute(
+            "SELECT plugin, version, config, value FROM results WHERE sha256 = ? AND filetype = ?",
+            (sha256, json.dumps(filetype)),
+        )
+        return {(plugin, version, config): value for plugin, version, config, value in rows}
+
+    def store(
+        self,
+        sha256: str,
+        filetype: List[str],
+        plugin_key: PluginKey,
+        *,
+        result: object,
+        field_hints: List[Tuple[str, object, int]],
+    ) -> None:
+        """Add the results of running a plugin on a file to the cache. Results that can't be
+        pickled are skipped.
+
+        Args:
+            sha256 (str): SHA256 hash of the file contents.
+            filetype (List[str]): The identified file types for the file.
+            plugin_key (PluginKey): The plugin that produced the results.
+            result (object): The value returned by the plugin.
+            field_hints (List[Tuple[str, object, int]]): Software field hints added by the plugin.
+        """
+        try:
+            value = pickle.dumps((result, field_hints), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.debug(f"Not caching {plugin_key[0]} results for {sha256}: {e}")
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (sha256, json.dumps(filetype), *plugin_key, value, len(value), int(time.time())),
+        )
+
+    def extract_file_info(self, pm: pluggy.PluginManager, **hook_kwargs: Any) -> List[object]:
+        """Call the `extract_file_info` hook, reusing cached results for plugins that support it
+        and caching any new results from them.
+
+        Args:
+            pm (pluggy.PluginManager): The plugin manager to call the hook implementations from.
+            **hook_kwargs (Any): The arguments for the `extract_file_info` hook.
+
+        Returns:
+            List[object]: The non-None results from each hook implementation, in the same order as
+            a normal hook call.
+        """
+        hookimpls = get_hookimpls_in_call_order(pm.hook.extract_file_info)
+        if hookimpls is None:
+            return pm.hook.extract_file_info(**hook_kwargs)
+        sha256: str = hook_kwargs["software"].sha256
+        filetype: List[str] = hook_kwargs["filetype"]
+        field_hints: List[Tuple[str, object, int]] = hook_kwargs["software_field_hints"]
+        cached: Optional[Dict[PluginKey, bytes]] = None
+        results: List[object] = []
+        for hookimpl in hookimpls:
+            plugin_key = self.get_plugin_key(pm, hookimpl.plugin)
+            if plugin_key is None:
+                result = call_hookimpl(hookimpl, hook_kwargs)
+            else:
+                if cached is None:
+                    cached = self.lookup(sha256, filetype)
+                if plugin_key in cached:
+                    self.hits += 1
+                    self._used[(sha256, json.dumps(filetype), *plugin_key)] = None
+                    result, cached_hints = pickle.loads(cached[plugin_key])
+                    field_hints.extend(cached_hints)
+                else:
+                    result = self._extract_and_store(hookimpl, plugin_key, hook_kwargs)
+            if result is not None:
+                results.append(result)
+        return results
+
+    def _extract_and_store(
+        self, hookimpl: "pluggy.HookImpl", plugin_key: PluginKey, hook_kwargs: Dict[str, Any]
+    ) -> object:
+        field_hints = hook_kwargs["software_field_hints"]
+        num_hints = len(field_hints)
+        num_children = len(hook_kwargs["children"])
+        num_queued = hook_kwargs["context_queue"].qsize()
+        result = call_hookimpl(hookimpl, hook_kwargs)
+        # a plugin that added entries elsewhere can't have its results replayed from the cache
+        if (
+            len(hook_kwargs["children"]) != num_children
+            or hook_kwargs["context_queue"].qsize() != num_queued
+        ):
+            logger.debug(f"Not caching {plugin_key[0]} results that added software/context entries")
+            return result
+        # plugins return nothing for files they don't handle, which is quicker to redo than look up
+        if result is None and len(field_hints) == num_hints:
+            return result
+        # a plugin that ran out of time may finish next time (e.g. with a larger time budget)
+        if is_timeout_note(result):
+            return result
+        self.misses += 1
+        self.store(
+            hook_kwargs["software"].sha256,
+            hook_kwargs["filetype"],
+            plugin_key,
+            result=result,
+            field_hints=field_hints[num_hints:],
+        )
+        return result
+
+    def commit(self) -> None:
+        """Save new results and the last use times of results read from the cache."""
+        if self._used:
+            now = int(time.time())
+            self._conn.executemany(
+                "UPDATE results SET last_used = ? WHERE sha256 = ? AND filetype = ? AND plugin = ? AND version = ? AND config = ?",
+                ((now, *key) for key in self._used),
+            )
+            self._used.clear()
+        self._conn.commit()
+
+    def prune(self, max_size: Optional[int] = None) -> int:
+        """Remove the least recently used results until the cache is within a size limit.
+
+        Args:
+            max_size (Optional[int]): The size limit in bytes; defaults to the cache's max_size.
+
+        Returns:
+            int: The number of results removed.
+        """
+        self.commit()
+        limit = self.max_size if max_size is None else max_size
+        excess = self.stats()["size"] - limit
+        if excess <= 0:
+            return 0
+        to_remove: List[int] = []
+        for rowid, size in self._conn.execute(
+            "SELECT rowid, size FROM results ORDER BY last_used, rowid"
+        ):
+            if excess <= 0:
+                break
+            to_remove.append(rowid)
+            excess -= size
+        self._conn.executemany("DELETE FROM results WHERE rowid = ?", ((r,) for r in to_remove))
+        self._conn.commit()
+        return len(to_remove)
+
+    def clear(self) -> int:
+        """Remove all results from the cache.
+
+        Returns:
+            int: The number of results removed.
+        """
+        removed = self._conn.execute("DELETE FROM results").rowcount
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get statistics on the contents of the cache.
+
+        Returns:
+            Dict[str, Any]: The number of cached results (`entries`), their total size in bytes (`size`),
+            and the number of cached results per plugin (`plugins`).
+        """
+        entries, size = self._conn.execute("SELECT COUNT(*), TOTAL(size) FROM results").fetchone()
+        plugins = dict(
+            self._conn.execute(
+                "SELECT plugin, COUNT(*) FROM results GROUP BY plugin ORDER BY plugin"
+            )
+        )
+        return {"entries": entries, "size": int(size), "plugins": plugins}
+
+    def close(self) -> None:
+        """Save pending changes, enforce the size limit, and close the cache."""
+        self.prune()
+        if self.hits or self.misses:
+            logger.info(f"Extraction cache: {self.hits} hits, {self.misses} misses")
+        self._conn.close()
+
+
+def open_extraction_cache(enabled: Optional[bool] = None) -> Optional[ExtractionCache]:
+    """Open the extraction cache, if it is enabled.
+
+    Args:
+        enabled (Optional[bool]): Whether to use the cache; defaults to the `cache.enabled` setting,
+            which is off unless set.
+
+    Returns:
+        Optional[ExtractionCache]: The cache, or None if it is disabled or can't be opened.
+    """
+    if enabled is None:
+        enabled = ConfigManager().get("cache", "enabled", False)
+    if not enabled:
+        return None
+    try:
+        return ExtractionCache()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Unable to open extraction cache, continuing without it: {e}")
+        return None
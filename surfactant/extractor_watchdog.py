@@ -0,0 +1,328 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import functools
+import multiprocessing
+import queue
+import shutil
+import time
+import traceback
+from dataclasses import fields
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pluggy
+from loguru import logger
+
+from surfactant.configmanager import ConfigManager
+from surfactant.infoextractors import file_decompression
+from surfactant.plugin.manager import (
+    call_hookimpl,
+    call_init_hooks,
+    find_plugin_by_name,
+    get_plugin_manager,
+)
+from surfactant.sbomtypes import SBOM, Software
+
+# Metadata key for the note added to a software entry when an info extractor runs out of time
+TIMEOUT_NOTE_KEY = "extractorTimeout"
+
+# Hook arguments that can't (or shouldn't) be sent to the sandbox process; it gets fresh ones instead
+_LOCAL_HOOK_ARGS = ("sbom", "context_queue", "children", "software_field_hints", "file_content")
+
+
+def is_timeout_note(result: object) -> bool:
+    """Check if an `extract_file_info` result is the note recorded for an extractor that timed out."""
+    return isinstance(result, dict) and TIMEOUT_NOTE_KEY in result
+
+
+def _sandbox_main(conn: Connection, pm_factory: Callable[[], pluggy.PluginManager]) -> None:
+    """Run info extractors for the parent process, one request at a time, until told to stop."""
+    pm = pm_factory()
+    call_init_hooks(pm, hook_filter=["extract_file_info"], command_name="generate")
+    hookimpls = {impl.plugin_name: impl for impl in pm.hook.extract_file_info.get_hookimpls()}
+    # time budgets start once the sandbox is ready, so they don't include loading plugins
+    conn.send("ready")
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        plugin_name, hook_kwargs, extract_dir = request
+        context_queue: "queue.Queue[Any]" = queue.Queue()
+        hook_kwargs.update(
+            sbom=SBOM(),
+            context_queue=context_queue,
+            children=[],
+            software_field_hints=[],
+            file_content=None,
+        )
+        # archives are extracted to a directory the parent created, so it can remove the directory if
+        # this process gets killed partway through
+        file_decompression.RESERVED_EXTRACT_DIRS[:] = [extract_dir]
+        known_extract_dirs = set(file_decompression.EXTRACT_DIRS)
+        error: Optional[Exception] = None
+        try:
+            result = call_hookimpl(hookimpls[plugin_name], hook_kwargs)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            error = e
+        file_decompression.RESERVED_EXTRACT_DIRS.clear()
+        extract_dirs = {
+            key: file_decompression.EXTRACT_DIRS.pop(key)
+            for key in set(file_decompression.EXTRACT_DIRS) - known_extract_dirs
+        }
+        if error is not None:
+            # the parent removes the directory it created, but not any others the extractor made
+            for details in extract_dirs.values():
+                if details["path"] != extract_dir:
+                    shutil.rmtree(details["path"], ignore_errors=True)
+            try:
+                conn.send(("error", error))
+            except Exception:  # pylint: disable=broad-exception-caught
+                # the exception can't be pickled, so send the details instead
+                details = traceback.format_exception(type(error), error, error.__traceback__)
+                conn.send(("error", RuntimeError("".join(details))))
+            continue
+        conn.send(
+            (
+                "ok",
+                (
+                    result,
+                    hook_kwargs.get("software"),
+                    hook_kwargs["children"],
+                    hook_kwargs["software_field_hints"],
+                    list(context_queue.queue),
+                    extract_dirs,
+                ),
+            )
+        )
+
+
+# pylint: disable-next=too-many-instance-attributes
+class ExtractorWatchdog:
+    """Limits how long `extract_file_info` hook implementations may spend on a file, so a single
+    pathological input can't stall SBOM generation.
+
+    Info extractors with a time budget are run in a separate sandbox process. If one doesn't finish
+    in time, the sandbox is killed (and restarted for the next call), a note saying so is returned
+    as the plugin's result so it gets recorded in the software entry's metadata, and processing
+    continues with the next plugin. Plugins without a budget still run in this process. Archives are
+    extracted in the sandbox to a directory created by this process, so a partly extracted archive is
+    removed when the sandbox is killed.
+
+    Since the sandbox has its own plugin manager, extractors running in it see an empty SBOM (like
+    `generate --jobs` workers do) and read the file themselves instead of sharing its contents.
+
+    Attributes:
+        default_timeout (Optional[float]): Time budget in seconds for each extractor without its own budget.
+        plugin_timeouts (Dict[str, Optional[float]]): Time budgets in seconds for specific plugins, by registered
+            name; None means the plugin isn't limited.
+        file_timeout (Optional[float]): Total time budget in seconds for all extractors run on a single file.
+        timeouts (int): The number of extractor calls that were stopped for running out of time.
+        pm_factory (Callable[[], pluggy.PluginManager]): Creates the plugin manager used by the sandbox; it
+            must be importable by the sandbox process, and register plugins with the same names as this one.
+    """
+
+    def __init__(
+        self,
+        default_timeout: Optional[float] = None,
+        plugin_timeouts: Optional[Dict[str, Optional[float]]] = None,
+        file_timeout: Optional[float] = None,
+        pm_factory: Callable[[], pluggy.PluginManager] = get_plugin_manager,
+    ):
+        self.default_timeout = default_timeout
+        self.plugin_timeouts = plugin_timeouts or {}
+        self.file_timeout = file_timeout
+        self.timeouts = 0
+        self.pm_factory = pm_factory
+        self._file_deadline: Optional[float] = None
+        self._file_skipped = False
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._conn: Optional[Connection] = None
+
+    def __enter__(self) -> "ExtractorWatchdog":
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
+
+    def instrument(self, pm: pluggy.PluginManager) -> None:
+        """Wrap the `extract_file_info` hook implementations registered with a plugin manager so that
+        calls to them are time limited.
+
+        Args:
+            pm (pluggy.PluginManager): The plugin manager with the info extractors to limit.
+        """
+        for hookimpl in pm.hook.extract_file_info.get_hookimpls():
+            # hook wrappers are generators that surround the other implementations
+            if hookimpl.hookwrapper or getattr(hookimpl, "wrapper", False):
+                continue
+            hookimpl.function = self._guarded(
+                hookimpl.plugin_name, hookimpl.argnames, hookimpl.function
+            )
+
+    def start_file(self) -> None:
+        """Start the time budget for the info extractors run on a new file."""
+        self._file_deadline = (
+            time.monotonic() + self.file_timeout if self.file_timeout is not None else None
+        )
+        self._file_skipped = False
+
+    def _guarded(self, plugin_name: str, argnames: Tuple[str, ...], function: Callable) -> Callable:
+        @functools.wraps(function)
+        def guarded(*args: Any) -> Any:
+            hook_kwargs = dict(zip(argnames, args))
+            remaining = None
+            if self._file_deadline is not None:
+                remaining = self._file_deadline - time.monotonic()
+                if remaining <= 0:
+                    if not self._file_skipped:
+                        logger.warning(
+                            f"Time budget for {hook_kwargs.get('filename', 'file')} used up, skipping its remaining info extractors"
+                        )
+                        self._file_skipped = True
+                    return None
+            timeout = self.plugin_timeouts.get(plugin_name, self.default_timeout)
+            if timeout is None and remaining is None:
+                return function(*args)
+            if remaining is not None and (timeout is None or remaining < timeout):
+                return self._call_in_sandbox(plugin_name, hook_kwargs, remaining, "file_seconds")
+            return self._call_in_sandbox(plugin_name, hook_kwargs, timeout, "extractor_seconds")
+
+        return guarded
+
+    def _start_sandbox(self) -> Connection:
+        if self._conn is None:
+            # spawn, since forking a process with threads (like `generate --jobs` uses) isn't safe
+            ctx = multiprocessing.get_context("spawn")
+            self._conn, child_conn = ctx.Pipe()
+            self._process = ctx.Process(
+                target=_sandbox_main, args=(child_conn, self.pm_factory), daemon=True
+            )
+            self._process.start()
+            child_conn.close()
+            self._conn.recv()
+        return self._conn
+
+    def _stop_sandbox(self) -> None:
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def _call_in_sandbox(
+        self, plugin_name: str, hook_kwargs: Dict[str, Any], timeout: float, limit: str
+    ) -> Any:
+        conn = self._start_sandbox()
+        # the directory an archive gets extracted to, which is removed here if the sandbox doesn't finish
+        extract_dir = file_decompression.create_extract_dir()
+        conn.send(
+            (
+                plugin_name,
+                {k: v for k, v in hook_kwargs.items() if k not in _LOCAL_HOOK_ARGS},
+                extract_dir,
+            )
+        )
+        try:
+            finished = conn.poll(timeout)
+            response = conn.recv() if finished else None
+        except EOFError:
+            exitcode = self._process.exitcode if self._process else None
+            self._stop_sandbox()
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            logger.error(
+                f"Info extractor {plugin_name} crashed on {hook_kwargs.get('filename')} (exit code {exitcode})"
+            )
+            return None
+        if response is None:
+            self._stop_sandbox()
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            self.timeouts += 1
+            logger.warning(
+                f"Info extractor {plugin_name} timed out after {timeout:.1f}s on {hook_kwargs.get('filename')}"
+            )
+            return {
+                TIMEOUT_NOTE_KEY: {
+                    "plugin": plugin_name,
+                    "timeoutSeconds": round(timeout, 3),
+                    "limit": limit,
+                }
+            }
+        status, value = response
+        if status == "error":
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            raise value
+        result, software, children, field_hints, queued, extract_dirs = value
+        if all(details["path"] != extract_dir for details in extract_dirs.values()):
+            shutil.rmtree(extract_dir, ignore_errors=True)
+        # copy back any changes the extractor made to its arguments
+        if "software" in hook_kwargs:
+            for sw_field in fields(Software):
+                setattr(hook_kwargs["software"], sw_field.name, getattr(software, sw_field.name))
+        if "children" in hook_kwargs:
+            hook_kwargs["children"].extend(children)
+        if "software_field_hints" in hook_kwargs:
+            hook_kwargs["software_field_hints"].extend(field_hints)
+        if "context_queue" in hook_kwargs:
+            for entry in queued:
+                hook_kwargs["context_queue"].put(entry)
+        file_decompression.register_extract_dirs(extract_dirs)
+        return result
+
+    def close(self) -> None:
+        """Stop the sandbox process, if one was started."""
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            if self._process is not None:
+                self._process.join(5)
+        self._stop_sandbox()
+
+
+def _get_seconds(value: Any) -> Optional[float]:
+    # zero (or no setting) means no limit
+    seconds = float(value) if value is not None else 0.0
+    return seconds if seconds > 0 else None
+
+
+def open_extractor_watchdog(pm: pluggy.PluginManager) -> Optional[ExtractorWatchdog]:
+    """Create a watchdog for the info extractors registered with a plugin manager from the
+    `timeouts` settings, and instrument the plugin manager with it.
+
+    Args:
+        pm (pluggy.PluginManager): The plugin manager with the info extractors to limit.
+
+    Returns:
+        Optional[ExtractorWatchdog]: The watchdog, or None if no time budgets are set.
+    """
+    config_manager = ConfigManager()
+    default_timeout = _get_seconds(config_manager.get("timeouts", "extractor_seconds"))
+    file_timeout = _get_seconds(config_manager.get("timeouts", "file_seconds"))
+    # `surfactant config timeouts.plugins.<name>` stores a dotted key, but a nested table works too
+    plugin_settings: Dict[str, Any] = {}
+    for key, value in dict(config_manager["timeouts"] or {}).items():
+        if key == "plugins" and isinstance(value, dict):
+            plugin_settings.update(value)
+        elif key.startswith("plugins."):
+            plugin_settings[key[len("plugins.") :]] = value
+    plugin_timeouts: Dict[str, Optional[float]] = {}
+    for name, value in plugin_settings.items():
+        plugin = find_plugin_by_name(pm, name)
+        if plugin is None:
+            logger.warning(f"Ignoring time budget for unknown plugin {name}")
+            continue
+        # a budget of 0 turns off the default budget for the plugin
+        plugin_timeouts[pm.get_name(plugin)] = _get_seconds(value)
+    if default_timeout is None and file_timeout is None and not any(plugin_timeouts.values()):
+        return None
+    watchdog = ExtractorWatchdog(default_timeout, plugin_timeouts, file_timeout)
+    watchdog.instrument(pm)
+    return watchdog
@@ -2,25 +2,176 @@
 # See the top-level LICENSE file for details.
 #
 # SPDX-License-Identifier: MIT
+import hashlib
+import io
+import mmap
 import os
 import stat
 import sys
-from hashlib import md5, sha1, sha256
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 
+from loguru import logger
 
-def get_file_info(filename):
+from surfactant.configmanager import ConfigManager
+
+# Files at least this large are memory mapped instead of read into memory
+MMAP_THRESHOLD = 1024 * 1024
+
+# Hash algorithms that can be calculated for files; sha256 is always calculated, since it identifies software entries
+HASH_ALGORITHMS = ("sha256", "sha1", "md5")
+
+# Data at least this large is hashed with each algorithm in its own thread
+THREADED_HASH_THRESHOLD = 4 * 1024 * 1024
+
+
+class _MemoryReader(io.RawIOBase):
+    """Seekable raw stream over a memory mapped file, without copying the mapped contents."""
+
+    def __init__(self, data: mmap.mmap):
+        super().__init__()
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class FileContent:
+    """Read-only contents of a file, opened once and shared between hashing, file type
+    identification, and info extractors. Small files are read into memory with a single read,
+    while larger files are memory mapped so only the pages that get used are read from disk.
+
+    The file is not opened until the contents are first accessed, and accessing the contents may
+    raise the same exceptions as opening the file (e.g. FileNotFoundError or PermissionError).
+
+    Attributes:
+        filename (str): Name of the file.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file: Optional[BinaryIO] = None
+        self._data: Optional[Union[bytes, mmap.mmap]] = None
+
+    def _load(self) -> Union[bytes, mmap.mmap]:
+        if self._data is None:
+            # pylint: disable-next=consider-using-with
+            f = open(self.filename, "rb", buffering=0)
+            try:
+                size = os.fstat(f.fileno()).st_size
+                if size >= MMAP_THRESHOLD:
+                    self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._file = f
+                else:
+                    self._data = f.readall()
+                    f.close()
+            except BaseException:
+                f.close()
+                raise
+        return self._data
+
+    @property
+    def data(self) -> Union[bytes, mmap.mmap]:
+        """The file contents, as bytes or a read-only memory map; both support the buffer protocol and slicing."""
+        return self._load()
+
+    @property
+    def size(self) -> int:
+        """The size of the file in bytes."""
+        return len(self._load())
+
+    def read(self, offset: int = 0, size: int = -1) -> bytes:
+        """Read bytes from the file.
+
+        Args:
+            offset (int): Offset to start reading from.
+            size (int): Number of bytes to read, or -1 to read to the end of the file.
+
+        Returns:
+            bytes: The bytes read; may be shorter than size if the end of the file is reached.
+        """
+        data = self._load()
+        if offset == 0 and size < 0 and isinstance(data, bytes):
+            return data
+        end = len(data) if size < 0 else offset + size
+        return data[offset:end]
+
+    def open(self) -> BinaryIO:
+        """Open a new file-like object for reading the contents, positioned at the start of the file.
+
+        Returns:
+            BinaryIO: A seekable binary file-like object that shares the loaded contents.
+        """
+        data = self._load()
+        if isinstance(data, mmap.mmap):
+            return io.BufferedReader(_MemoryReader(data))
+        return io.BytesIO(data)
+
+    def close(self) -> None:
+        """Release the file contents."""
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # something still holds a view of the map; it is released once that is garbage collected
+                pass
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._data = None
+
+    def __enter__(self) -> "FileContent":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def get_file_info(filename, stat_result: Optional[os.stat_result] = None):
     """Get information about a file.
 
     Args:
         filename (str): Name of file.
+        stat_result (Optional[os.stat_result]): Stat results already gathered for the file (e.g. while walking
+            a directory), to avoid calling stat on it again.
 
     Returns:
         Optional[dict]: Dictionary that contains info about the file.
     """
-    try:
-        fstats = os.stat(filename)
-    except (FileNotFoundError, PermissionError):
-        return None
+    fstats = stat_result
+    if fstats is None:
+        try:
+            fstats = os.stat(filename)
+        except (FileNotFoundError, PermissionError):
+            return None
 
     filehidden = False
     # stat.UF_HIDDEN (file shouldn't be shown in GUI macOS 10.5+)
@@ -44,38 +195,103 @@ def get_file_info(filename):
     }
 
 
-def calc_file_hashes(filename):
+def get_hash_algorithms() -> Tuple[str, ...]:
+    """Get the hash algorithms to calculate for files, from the `core.hash_algorithms` setting.
+
+    Returns:
+        Tuple[str, ...]: Names of the hash algorithms, always including sha256.
+    """
+    setting = ConfigManager().get("core", "hash_algorithms", None)
+    if setting is None:
+        return HASH_ALGORITHMS
+    # `surfactant config` stores a single string, but a TOML list works too
+    names = setting.split(",") if isinstance(setting, str) else setting
+    algorithms = ["sha256"]
+    for name in names:
+        name = str(name).strip().lower()
+        if name not in HASH_ALGORITHMS:
+            logger.warning(f"Ignoring unsupported hash algorithm {name} in core.hash_algorithms")
+        elif name not in algorithms:
+            algorithms.append(name)
+    return tuple(algorithms)
+
+
+def _new_hash(name: str):
+    # hashlib.md5 usedforsecurity flag was added in Python 3.9
+    if name == "md5" and sys.version_info >= (3, 9):
+        # avoid error with FIPS-compliant OpenSSL library builds complaining about md5
+        return hashlib.md5(usedforsecurity=False)
+    return hashlib.new(name)
+
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_pid: Optional[int] = None
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor, _hash_executor_pid  # pylint: disable=global-statement
+    # threads aren't copied into forked worker processes, so each process needs its own pool
+    if _hash_executor is None or _hash_executor_pid != os.getpid():
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=len(HASH_ALGORITHMS), thread_name_prefix="surfactant-hash"
+        )
+        _hash_executor_pid = os.getpid()
+    return _hash_executor
+
+
+def _update_hashes(hashes: List, data) -> None:
+    # hashlib releases the GIL while hashing large buffers, so the algorithms can run in parallel
+    if len(hashes) > 1 and len(data) >= THREADED_HASH_THRESHOLD:
+        for future in [_get_hash_executor().submit(h.update, data) for h in hashes]:
+            future.result()
+    else:
+        for h in hashes:
+            h.update(data)
+
+
+def hash_file_content(
+    file_content: FileContent, algorithms: Optional[Iterable[str]] = None
+) -> Dict[str, Optional[str]]:
+    """Calculate hashes of file contents. Large files are memory mapped and hashed with all the
+    algorithms at the same time, so each file is only read once.
+
+    Args:
+        file_content (FileContent): Contents of the file to hash.
+        algorithms (Optional[Iterable[str]]): Hash algorithms to calculate; defaults to those from `get_hash_algorithms`.
+
+    Returns:
+        Dict[str, Optional[str]]: The hex digest for each algorithm in `HASH_ALGORITHMS`, or None for those not calculated.
+
+    Raises:
+        FileNotFoundError: If the file could not be found.
+        PermissionError: If the file could not be read.
+    """
+    names = tuple(algorithms) if algorithms is not None else get_hash_algorithms()
+    hashes = [_new_hash(name) for name in names]
+    _update_hashes(hashes, file_content.data)
+    digests: Dict[str, Optional[str]] = dict.fromkeys(HASH_ALGORITHMS)
+    digests.update((name, h.hexdigest()) for name, h in zip(names, hashes))
+    return digests
+
+
+def calc_file_hashes(filename, file_content: Optional[FileContent] = None):
     """Calculate hashes for a file specified.
 
     Args:
         filename (str): Name of file.
+        file_content (Optional[FileContent]): Already opened contents of the file to hash, instead of reading the file again.
 
     Returns:
-        Optional[dict]: Dictionary with the sha256, sha1, and md5 hashes of the file.
+        Optional[dict]: Dictionary with the sha256, sha1, and md5 hashes of the file; hashes not selected by the
+        `core.hash_algorithms` setting are None.
     """
-    sha256_hash = sha256()
-    sha1_hash = sha1()
-    # hashlib.md5 usedforsecurity flag was added in Python 3.9
-    if sys.version_info >= (3, 9):
-        # avoid error with FIPS-compliant OpenSSL library builds complaining about md5
-        md5_hash = md5(usedforsecurity=False)
-    else:
-        md5_hash = md5()
-    b = bytearray(4096)
-    mv = memoryview(b)
     try:
-        with open(filename, "rb", buffering=0) as f:
-            while n := f.readinto(mv):
-                sha256_hash.update(mv[:n])
-                sha1_hash.update(mv[:n])
-                md5_hash.update(mv[:n])
+        if file_content is not None:
+            return hash_file_content(file_content)
+        with FileContent(filename) as content:
+            return hash_file_content(content)
     except (FileNotFoundError, PermissionError):
         return None
-    return {
-        "sha256": sha256_hash.hexdigest(),
-        "sha1": sha1_hash.hexdigest(),
-        "md5": md5_hash.hexdigest(),
-    }
 
 
 def sha256sum(filename):
@@ -91,11 +307,5 @@ def sha256sum(filename):
         FileNotFoundError: If the given filename could not be found.
         PermissionError: If the given filename could not be read.
     """
-    h = sha256()
-    with open(filename, "rb") as f:
-        # Reading is buffered by default (https://docs.python.org/3/library/functions.html#open)
-        chunk = f.read(h.block_size)
-        while chunk:
-            h.update(chunk)
-            chunk = f.read(h.block_size)
-    return h.hexdigest()
+    with FileContent(filename) as content:
+        return hash_file_content(content, ("sha256",))["sha256"]
@@ -10,10 +10,23 @@ from loguru import logger
 
 import surfactant.plugin
 from surfactant import ContextEntry
+from surfactant.fileinfo import FileContent
 
 
-@surfactant.plugin.hookimpl
-def identify_file_type(filepath: str, context: Optional[ContextEntry] = None) -> Optional[str]:
+@surfactant.plugin.hookimpl(specname="identify_file_type")
+def identify_file_type_hook(
+    filepath: str,
+    context: Optional[ContextEntry],
+    file_content: Optional[FileContent],
+) -> Optional[str]:
+    return identify_file_type(filepath, context, file_content)
+
+
+def identify_file_type(
+    filepath: str,
+    context: Optional[ContextEntry] = None,
+    file_content: Optional[FileContent] = None,
+) -> Optional[str]:
     # pylint: disable=too-many-return-statements
     _filetype_extensions = {
         ".sh": "SHELL",
@@ -40,7 +53,7 @@ def identify_file_type(filepath: str, context: Optional[ContextEntry] = None) ->
         b"perl": "PERL",
     }
     try:
-        with open(filepath, "rb") as f:
+        with file_content.open() if file_content else open(filepath, "rb") as f:
             head = f.read(256)
             if head.startswith(b"<!DOCTYPE html>"):
                 return ["HTML"]
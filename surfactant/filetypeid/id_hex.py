@@ -2,12 +2,14 @@
 # See the top-level LICENSE file for details.
 #
 # SPDX-License-Identifier: MIT
+import io
 import pathlib
 import string
 from typing import Optional
 
 import surfactant.plugin
 from surfactant import ContextEntry
+from surfactant.fileinfo import FileContent
 
 
 def check_motorola(current_line):
@@ -69,14 +71,26 @@ hex_file_extensions = [
 ]
 
 
-@surfactant.plugin.hookimpl
-def identify_file_type(filepath: str, context: Optional[ContextEntry] = None) -> Optional[str]:
+@surfactant.plugin.hookimpl(specname="identify_file_type")
+def identify_file_type_hook(
+    filepath: str,
+    context: Optional[ContextEntry],
+    file_content: Optional[FileContent],
+) -> Optional[str]:
+    return identify_file_type(filepath, context, file_content)
+
+
+def identify_file_type(
+    filepath: str,
+    context: Optional[ContextEntry] = None,
+    file_content: Optional[FileContent] = None,
+) -> Optional[str]:
     file_suffix = pathlib.Path(filepath).suffix.lower()
     # quick exit based on file extension
     if file_suffix not in hex_file_extensions:
         return None
     try:
-        with open(filepath, "r") as f:
+        with io.TextIOWrapper(file_content.open()) if file_content else open(filepath, "r") as f:
             percent_intel = 0
             percent_motorola = 0
             for _ in range(100):
@@ -93,5 +107,5 @@ def identify_file_type(filepath: str, context: Optional[ContextEntry] = None) ->
                 return ["MOTOROLA_SREC"]
             return None
 
-    except (FileNotFoundError, UnicodeDecodeError):
+    except (FileNotFoundError, PermissionError, UnicodeDecodeError):
         return None
@@ -11,6 +11,7 @@ from typing import Optional
 
 import surfactant.plugin
 from surfactant import ContextEntry
+from surfactant.fileinfo import FileContent
 from surfactant.infoextractors.coff_file import COFF_MAGIC_TARGET_NAME
 
 
@@ -50,11 +51,24 @@ def is_docker_archive(filepath: str) -> bool:
         return False
 
 
-@surfactant.plugin.hookimpl(tryfirst=True)
-def identify_file_type(filepath: str, context: Optional[ContextEntry] = None) -> Optional[str]:
+@surfactant.plugin.hookimpl(tryfirst=True, specname="identify_file_type")
+def identify_file_type_hook(
+    filepath: str,
+    context: Optional[ContextEntry],
+    file_content: Optional[FileContent],
+) -> Optional[str]:
+    # pluggy only passes arguments without defaults, so callers of identify_file_type can leave them out
+    return identify_file_type(filepath, context, file_content)
+
+
+def identify_file_type(
+    filepath: str,
+    context: Optional[ContextEntry] = None,
+    file_content: Optional[FileContent] = None,
+) -> Optional[str]:
     filetype_matches = []
     try:
-        with open(filepath, "rb") as f:
+        with file_content.open() if file_content else open(filepath, "rb") as f:
             magic_bytes = f.read(265)
             if magic_bytes[:4] == b"\x7fELF":
                 filetype_matches.append("ELF")
@@ -27,6 +27,11 @@ def extract_file_info(sbom: SBOM, software: Software, filename: str, filetype: L
     return extract_elf_info(filename)
 
 
+@surfactant.plugin.hookimpl
+def cacheable_extraction() -> bool:
+    return True
+
+
 _EI_OSABI_NAME = {
     "ELFOSABI_SYSV": "System V",
     "ELFOSABI_HPUX": "HP-UX",
@@ -39,6 +39,9 @@ EXTRACT_DIR.mkdir(parents=True, exist_ok=True)
 # Hash -> Path to extracted directory & Result of array of 2-tuples (install_prefix, extract_path)
 EXTRACT_DIRS = {}
 EXTRACT_DIRS_PATH = EXTRACT_DIR / ".surfactant_extracted_dirs.json"
+# Extraction directories created ahead of time by another process (e.g. the parent of an extractor
+# sandbox, so it can remove them if the sandbox is killed), used before creating new ones
+RESERVED_EXTRACT_DIRS: List[str] = []
 
 RAR_SUPPORT = {"enabled": False}
 
@@ -292,7 +295,26 @@ def store_extracted_dirs():
             logger.error(f"Failed to write extracted directories to {EXTRACT_DIRS_PATH}: {e}")
 
 
+def register_extract_dirs(extract_dirs: Dict[str, Dict[str, Any]]):
+    """Track extraction directories created by another process (e.g. a `generate --jobs` worker),
+    so they get cached or cleaned up when this process exits.
+
+    Args:
+        extract_dirs (Dict[str, Dict[str, Any]]): Extraction details keyed by archive sha256 hash.
+    """
+    for key, details in extract_dirs.items():
+        if key in EXTRACT_DIRS and EXTRACT_DIRS[key]["path"] != details["path"]:
+            # the same archive was extracted by more than one worker; keep track of every copy
+            suffix = 1
+            while f"{key}-{suffix}" in EXTRACT_DIRS:
+                suffix += 1
+            key = f"{key}-{suffix}"
+        EXTRACT_DIRS[key] = details
+
+
 def create_extract_dir():
+    if RESERVED_EXTRACT_DIRS:
+        return RESERVED_EXTRACT_DIRS.pop()
     return tempfile.mkdtemp(prefix=EXTRACT_DIRS_PREFIX, dir=EXTRACT_DIR)
 
 
@@ -39,6 +39,12 @@ def extract_file_info(sbom: SBOM, software: Software, filename: str, filetype: L
     return extract_java_info(filename, filetype)
 
 
+@surfactant.plugin.hookimpl
+def cacheable_extraction() -> bool:
+    # without javatools nothing is extracted, which shouldn't be cached
+    return "javatools" in modules
+
+
 # Map from internal major number to Java SE version
 # https://docs.oracle.com/javase/specs/jvms/se20/html/jvms-4.html#jvms-4.1-200-B.2
 _JAVA_VERSION_MAPPING = {
@@ -102,6 +102,12 @@ def supports_file(filetype: List[str]) -> bool:
     return "JAVASCRIPT" in filetype
 
 
+@surfactant.plugin.hookimpl
+def path_dependent_extraction() -> bool:
+    # libraries are also identified by file name
+    return True
+
+
 @surfactant.plugin.hookimpl
 def extract_file_info(sbom: SBOM, software: Software, filename: str, filetype: List[str]) -> object:
     if not supports_file(filetype):
@@ -51,6 +51,12 @@ def extract_file_info(sbom: SBOM, software: Software, filename: str, filetype: L
     return extract_mach_o_info(filename)
 
 
+@surfactant.plugin.hookimpl
+def cacheable_extraction() -> bool:
+    # without LIEF nothing is extracted, which shouldn't be cached
+    return "lief" in modules
+
+
 def extract_mach_o_info(filename: str) -> object:
     try:
         binaries = lief.MachO.parse(filename)
@@ -20,6 +20,7 @@ from loguru import logger
 
 import surfactant.plugin
 from surfactant.database_manager.database_utils import BaseDatabaseManager, DatabaseConfig
+from surfactant.fileinfo import FileContent
 from surfactant.sbomtypes import SBOM, Software
 from surfactant.utils.ahocorasick import build_regex_literal_matcher
 
@@ -145,16 +146,28 @@ def supports_file(filetype: List[str]) -> bool:
     return False
 
 
+@surfactant.plugin.hookimpl
+def path_dependent_extraction() -> bool:
+    # libraries are also identified by file name
+    return True
+
+
 @surfactant.plugin.hookimpl
 def extract_file_info(
-    sbom: SBOM, software: Software, filename: str, filetype: List[str]
+    sbom: SBOM,
+    software: Software,
+    filename: str,
+    filetype: List[str],
+    file_content: Optional[FileContent],
 ) -> Optional[Dict[str, Any]]:
     if not supports_file(filetype):
         return None
-    return extract_native_lib_info(filename)
+    return extract_native_lib_info(filename, file_content)
 
 
-def extract_native_lib_info(filename: str) -> Optional[Dict[str, Any]]:
+def extract_native_lib_info(
+    filename: str, file_content: Optional[FileContent] = None
+) -> Optional[Dict[str, Any]]:
     native_lib_info: Dict[str, Any] = {"nativeLibraries": []}
     native_lib_database = native_lib_manager.get_database()
 
@@ -175,8 +188,11 @@ def extract_native_lib_info(filename: str) -> Optional[Dict[str, Any]]:
                 found_libraries.add(library_name)
 
     try:
-        with open(filename, "rb") as native_file:
-            filecontent = native_file.read()
+        if file_content is not None:
+            filecontent = file_content.read()
+        else:
+            with open(filename, "rb") as native_file:
+                filecontent = native_file.read()
         filecontent_list = match_by_attribute("filecontent", filecontent, native_lib_database)
 
         for match in filecontent_list:
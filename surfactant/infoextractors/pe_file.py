@@ -24,6 +24,12 @@ def supports_file(filetype: List[str]) -> bool:
     return "PE" in filetype
 
 
+@surfactant.plugin.hookimpl
+def path_dependent_extraction() -> bool:
+    # application manifest and config files next to the binary are included in the results
+    return True
+
+
 @surfactant.plugin.hookimpl
 def extract_file_info(
     sbom: SBOM,
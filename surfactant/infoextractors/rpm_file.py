@@ -130,6 +130,11 @@ def extract_file_info(
     return rpm_info
 
 
+@surfactant.plugin.hookimpl
+def cacheable_extraction() -> bool:
+    return True
+
+
 def extract_rpm_info(filename: str) -> Dict[str, Any]:
     """Extracts fields from the header of an RPM Package.
 
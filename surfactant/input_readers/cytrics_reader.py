@@ -6,12 +6,12 @@
 from typing import Optional
 
 import surfactant.plugin
-from surfactant.sbomtypes import SBOM
+from surfactant.sbomtypes import SBOM, load_sbom_json
 
 
 @surfactant.plugin.hookimpl
 def read_sbom(infile) -> SBOM:
-    return SBOM.from_json(infile.read())
+    return load_sbom_json(infile.read())
 
 
 @surfactant.plugin.hookimpl
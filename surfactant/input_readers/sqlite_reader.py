@@ -0,0 +1,21 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+
+from typing import Optional
+
+import surfactant.plugin
+from surfactant.sbomtypes import SBOM, SBOMStore
+
+
+@surfactant.plugin.hookimpl
+def read_sbom(infile) -> SBOM:
+    # the store is a SQLite database, so it is opened by the path of the input file rather than read from it
+    with SBOMStore(infile.name) as store:
+        return store.load()
+
+
+@surfactant.plugin.hookimpl
+def short_name() -> Optional[str]:
+    return "sqlite"
@@ -43,7 +43,7 @@ def write_sbom(sbom: SBOM, outfile) -> None:
     # Build container-path lookup for software
     container_path_relationships: Dict[Tuple[str, str]] = {}
     for software in sbom.software:
-        if sbom.get_children(software.UUID, rel_type="Contains"):
+        if sbom.has_relationship(xUUID=software.UUID, relationship="Contains"):
             _, container_list = convert_software_to_cyclonedx_container_components(software)
             for container in container_list:
                 bom.components.add(container)
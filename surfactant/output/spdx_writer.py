@@ -59,7 +59,7 @@ def write_sbom(sbom: SBOM, outfile) -> None:
 
     # Add software as packages or files
     for software in sbom.software:
-        if sbom.get_children(software.UUID, rel_type="Contains"):
+        if sbom.has_relationship(xUUID=software.UUID, relationship="Contains"):
             software_uuid, pkgs = convert_software_to_spdx_packages(software)
             for pkg in pkgs:
                 spdx_doc.packages.append(pkg)
@@ -0,0 +1,36 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import os
+import tempfile
+from typing import Optional
+
+import surfactant.plugin
+from surfactant.sbomtypes import SBOM, SBOMStore
+
+
+@surfactant.plugin.hookimpl
+def write_sbom(sbom: SBOM, outfile) -> None:
+    # the store is a SQLite database, so it is written to the path of the output file rather than the file handle
+    path = getattr(outfile, "name", None)
+    if not isinstance(path, str) or path.startswith("<"):
+        raise ValueError("SQLite SBOM stores can only be written to a file")
+    # write to a new file that replaces the output once complete, since the output file may already hold
+    # another SBOM (e.g. the one being updated)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path) or None
+    )
+    os.close(fd)
+    try:
+        with SBOMStore(tmp_path) as store:
+            store.save(sbom)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@surfactant.plugin.hookimpl
+def short_name() -> Optional[str]:
+    return "sqlite"
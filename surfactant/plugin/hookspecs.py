@@ -9,13 +9,16 @@ from typing import List, Optional, Tuple
 from pluggy import HookspecMarker
 
 from surfactant import ContextEntry
+from surfactant.fileinfo import FileContent
 from surfactant.sbomtypes import SBOM, Relationship, Software
 
 hookspec = HookspecMarker("surfactant")
 
 
 @hookspec(firstresult=True)
-def identify_file_type(filepath: str, context: Optional[ContextEntry]) -> Optional[str]:
+def identify_file_type(
+    filepath: str, context: Optional[ContextEntry], file_content: Optional[FileContent]
+) -> Optional[str]:
     """Determine the type of file located at filepath, and return a string identifying the type
     that will be passed to file extraction plugins. Return `None` to indicate that the type was
     unable to be determined.
@@ -23,6 +26,8 @@ def identify_file_type(filepath: str, context: Optional[ContextEntry]) -> Option
     Args:
         filepath (str): The path to the file to determine the type of.
         context (ContextEntry): The context entry for the file, may be context of parent archive.
+        file_content (Optional[FileContent]): Shared contents of the file, which plugins should read from instead
+            of opening the file themselves when given. Existing plugins should still work without adding this parameter.
 
     Returns:
         Optional[str]: A string identifying the type of file, or None if the file type could not be recognized.
@@ -41,6 +46,7 @@ def extract_file_info(
     children: List[Software],
     software_field_hints: List[Tuple[str, object, int]],
     omit_unrecognized_types: bool,
+    file_content: Optional[FileContent],
 ) -> object:
     """Extracts information from the given file to add to the given software entry. Return an
     object to be included as part of the metadata field, and potentially used as part of
@@ -68,6 +74,9 @@ def extract_file_info(
         omit_unrecognized_types (bool): Whether files with types that are not recognized by Surfactant should be
             left out of the SBOM. When a plugin is adding additional context entries to the queue, it should typically
             default to propagating this value to the new context entries that it creates.
+        file_content (Optional[FileContent]): Shared contents of the file, which plugins should read from instead
+            of opening the file themselves when given; the file is only read from disk once this way. Plugins must
+            not hold on to it after returning. Existing plugins should still work without adding this parameter.
 
     Returns:
         object: An object to be added to the metadata field for the software entry. May be `None` to add no metadata.
@@ -159,3 +168,32 @@ def init_hook(command_name: Optional[str] = None) -> None:
 @hookspec
 def settings_name() -> Optional[str]:
     """The setting base name to use for setting/retrieving settings"""
+
+
+@hookspec
+def cacheable_extraction() -> bool:
+    """Whether the results of the plugin's `extract_file_info` hook can be cached and reused for
+    other files with the same contents.
+
+    Plugins should only return True if the information returned and the software field hints added
+    depend only on the file contents, file type, and the plugin's settings -- not the file path,
+    other files, or the SBOM -- and the hook has no side effects such as adding child software
+    entries, queuing context entries, or writing files.
+
+    Returns:
+        bool: True if `extract_file_info` results can be cached.
+    """
+
+
+@hookspec
+def path_dependent_extraction() -> bool:
+    """Whether the plugin's `extract_file_info` hook needs to run on every copy of a file.
+
+    By default, `extract_file_info` hooks are skipped for files with the same contents (SHA256 hash) as
+    a file already processed, since they would return the same information as for the first copy.
+    Plugins that use the file path (e.g. matching on the file name, or reading other files next to it)
+    should return True so that they are still run for each copy.
+
+    Returns:
+        bool: True if `extract_file_info` should be run on files with contents already seen.
+    """
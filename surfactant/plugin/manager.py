@@ -3,7 +3,7 @@
 #
 # SPDX-License-Identifier: MIT
 import sys
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 import pluggy
 from loguru import logger
@@ -31,12 +31,13 @@ def _register_plugins(pm: pluggy.PluginManager) -> None:
         rpm_file,
         uimage_file,
     )
-    from surfactant.input_readers import cytrics_reader
+    from surfactant.input_readers import cytrics_reader, sqlite_reader
     from surfactant.output import (
         csv_writer,
         cyclonedx_writer,
         cytrics_writer,
         spdx_writer,
+        sqlite_writer,
     )
     from surfactant.relationships import (
         dotnet_relationship,
@@ -68,7 +69,9 @@ def _register_plugins(pm: pluggy.PluginManager) -> None:
         cytrics_writer,
         cyclonedx_writer,
         spdx_writer,
+        sqlite_writer,
         cytrics_reader,
+        sqlite_reader,
         native_lib_file,
         file_decompression,
     )
@@ -256,3 +259,36 @@ def call_init_hooks(
                 if not any(is_hook_implemented(pm, plugin, hook) for hook in hook_filter):
                     continue
             plugin.init_hook(command_name=command_name)
+
+
+def get_hookimpls_in_call_order(hook: "pluggy.HookCaller") -> Optional[List["pluggy.HookImpl"]]:
+    """
+    Get the implementations of a hook in the order pluggy would call them, so they can be called
+    one at a time using `call_hookimpl`.
+
+    Args:
+        hook (pluggy.HookCaller): The hook to get the implementations of.
+
+    Returns:
+        Optional[List[pluggy.HookImpl]]: The hook implementations, or None if any of them are hook
+        wrappers, in which case the hook must be called normally.
+    """
+    hookimpls = hook.get_hookimpls()
+    if any(impl.hookwrapper or getattr(impl, "wrapper", False) for impl in hookimpls):
+        return None
+    # pluggy calls the most recently registered implementations first
+    return list(reversed(hookimpls))
+
+
+def call_hookimpl(hookimpl: "pluggy.HookImpl", hook_kwargs: Dict[str, Any]) -> Any:
+    """
+    Call a single hook implementation, passing it the arguments it accepts.
+
+    Args:
+        hookimpl (pluggy.HookImpl): The hook implementation to call.
+        hook_kwargs (Dict[str, Any]): All of the arguments for the hook, by name.
+
+    Returns:
+        Any: The result returned by the hook implementation.
+    """
+    return hookimpl.function(*(hook_kwargs[argname] for argname in hookimpl.argnames))
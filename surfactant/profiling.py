@@ -0,0 +1,223 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import contextlib
+import functools
+import heapq
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pluggy
+
+PROFILE_VERSION = 1
+
+# Number of the slowest files to keep the details for
+SLOWEST_FILES = 50
+
+# Hooks that are timed for each plugin implementing them
+PROFILED_HOOKS = ("identify_file_type", "extract_file_info", "establish_relationships")
+
+
+@dataclass
+class Timing:
+    """Total time spent on something that may have happened several times.
+
+    Attributes:
+        wall (float): Elapsed wall clock time, in seconds.
+        cpu (float): CPU time used by the process, in seconds.
+        calls (int): Number of times the time was added to.
+    """
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+    def add(self, wall: float, cpu: float, calls: int = 1) -> None:
+        self.wall += wall
+        self.cpu += cpu
+        self.calls += calls
+
+    def merge(self, other: "Timing") -> None:
+        self.add(other.wall, other.cpu, other.calls)
+
+
+@dataclass
+class FileProfile:
+    """Time spent processing a single file.
+
+    Attributes:
+        path (str): Path to the file.
+        filetype (List[str]): The file types identified for the file.
+        total (Timing): Time spent on the file overall.
+        hashing (Timing): Time spent creating the software entry, mainly hashing the file.
+        plugins (Dict[str, Dict[str, Timing]]): Time spent in each plugin, keyed by hook name then plugin name.
+    """
+
+    path: str
+    filetype: List[str] = field(default_factory=list)
+    total: Timing = field(default_factory=Timing)
+    hashing: Timing = field(default_factory=Timing)
+    plugins: Dict[str, Dict[str, Timing]] = field(default_factory=dict)
+
+
+def _add_plugin_timing(
+    plugins: Dict[str, Dict[str, Timing]], hook_name: str, plugin_name: str, timing: Timing
+) -> None:
+    plugins.setdefault(hook_name, {}).setdefault(plugin_name, Timing()).merge(timing)
+
+
+# pylint: disable-next=too-many-instance-attributes
+class Profiler:
+    """Records how long hashing files and each plugin's hook implementations take, per file and in
+    total, for `surfactant generate --profile`.
+
+    Hook implementations are timed by wrapping their functions with `instrument`. While a file is
+    being processed (between `start_file` and `stop_file`) times are recorded in a `FileProfile`
+    for it, which is added to the totals with `add_file`; this lets worker processes profile files
+    and send the results back to the main process. Time spent outside of a file is added to the
+    totals directly.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.hashing = Timing()
+        self.plugins: Dict[str, Dict[str, Timing]] = {}
+        self.filetypes: Dict[str, Timing] = {}
+        self.current: Optional[FileProfile] = None
+        self._slowest: List[Tuple[float, int, FileProfile]] = []
+        self._start = (time.perf_counter(), time.process_time())
+        self._file_start = self._start
+
+    def instrument(self, pm: pluggy.PluginManager, hook_names: Iterable[str] = PROFILED_HOOKS):
+        """Wrap the hook implementations registered with a plugin manager so that calls to them are timed.
+
+        Args:
+            pm (pluggy.PluginManager): The plugin manager with the hook implementations to time.
+            hook_names (Iterable[str]): Names of the hooks to time.
+        """
+        for hook_name in hook_names:
+            for hookimpl in getattr(pm.hook, hook_name).get_hookimpls():
+                # hook wrappers are generators that surround the other implementations
+                if hookimpl.hookwrapper or getattr(hookimpl, "wrapper", False):
+                    continue
+                hookimpl.function = self._timed(hook_name, hookimpl.plugin_name, hookimpl.function)
+
+    def _timed(self, hook_name: str, plugin_name: str, function: Callable) -> Callable:
+        @functools.wraps(function)
+        def timed(*args: Any) -> Any:
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                return function(*args)
+            finally:
+                timing = Timing(
+                    time.perf_counter() - wall_start, time.process_time() - cpu_start, 1
+                )
+                plugins = self.current.plugins if self.current else self.plugins
+                _add_plugin_timing(plugins, hook_name, plugin_name, timing)
+
+        return timed
+
+    @contextlib.contextmanager
+    def time_hashing(self) -> Iterator[None]:
+        """Record the time spent creating a software entry for a file (mainly hashing it)."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            (self.current.hashing if self.current else self.hashing).add(
+                time.perf_counter() - wall_start, time.process_time() - cpu_start
+            )
+
+    def start_file(self, path: str) -> FileProfile:
+        """Start recording the time spent processing a file.
+
+        Args:
+            path (str): Path to the file.
+
+        Returns:
+            FileProfile: The profile times for the file will be added to.
+        """
+        self.current = FileProfile(path)
+        self._file_start = (time.perf_counter(), time.process_time())
+        return self.current
+
+    def stop_file(self) -> Optional[FileProfile]:
+        """Stop recording time for the current file.
+
+        Returns:
+            Optional[FileProfile]: The profile for the file, or None if no file was started.
+        """
+        file_profile = self.current
+        if file_profile is not None:
+            file_profile.total.add(
+                time.perf_counter() - self._file_start[0],
+                time.process_time() - self._file_start[1],
+            )
+            self.current = None
+        return file_profile
+
+    def add_file(self, file_profile: FileProfile) -> None:
+        """Add the times for a file to the totals.
+
+        Args:
+            file_profile (FileProfile): The profile for the file.
+        """
+        self.files += 1
+        self.hashing.merge(file_profile.hashing)
+        for hook_name, plugin_timings in file_profile.plugins.items():
+            for plugin_name, timing in plugin_timings.items():
+                _add_plugin_timing(self.plugins, hook_name, plugin_name, timing)
+        filetype = ",".join(file_profile.filetype) if file_profile.filetype else "unrecognized"
+        self.filetypes.setdefault(filetype, Timing()).merge(file_profile.total)
+        # the file count breaks ties, so profiles themselves are never compared
+        entry = (file_profile.total.wall, self.files, file_profile)
+        if len(self._slowest) < SLOWEST_FILES:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the profiling report.
+
+        Returns:
+            Dict[str, Any]: The report, in the format saved by `save`.
+        """
+        phases = {"hashing": asdict(self.hashing)}
+        for hook_name in PROFILED_HOOKS:
+            phase = Timing()
+            for timing in self.plugins.get(hook_name, {}).values():
+                phase.merge(timing)
+            phases[hook_name] = asdict(phase)
+        return {
+            "version": PROFILE_VERSION,
+            "total": asdict(
+                Timing(
+                    time.perf_counter() - self._start[0], time.process_time() - self._start[1], 1
+                )
+            ),
+            "files": self.files,
+            "phases": phases,
+            "plugins": {
+                hook_name: {name: asdict(timing) for name, timing in plugin_timings.items()}
+                for hook_name, plugin_timings in self.plugins.items()
+            },
+            "filetypes": {name: asdict(timing) for name, timing in self.filetypes.items()},
+            "slowestFiles": [
+                asdict(file_profile)
+                for _, _, file_profile in sorted(self._slowest, key=lambda e: (-e[0], e[1]))
+            ],
+        }
+
+    def save(self, path: str) -> None:
+        """Write the profiling report to a JSON file.
+
+        Args:
+            path (str): Location to write the report to.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -4,7 +4,9 @@
 # SPDX-License-Identifier: MIT
 from ._analysisdata import AnalysisData
 from ._file import File
+from ._graph import RelationshipGraph
 from ._hardware import Hardware
+from ._metadata_spool import MetadataSpool, MetadataStore, SpooledMetadata
 from ._observation import Observation
 from ._provenance import (
     AnalysisDataProvenance,
@@ -16,7 +18,10 @@ from ._provenance import (
 )
 from ._relationship import Relationship, StarRelationship
 from ._sbom import SBOM
+from ._sbom_loader import load_sbom_json, sbom_from_dict
+from ._sbom_store import SBOMStore
 from ._software import Software, SoftwareComponent
+from ._software_index import SoftwareIndex
 from ._system import System
 
 __all__ = [
@@ -25,10 +30,12 @@ __all__ = [
     "Hardware",
     "Software",
     "SoftwareComponent",
+    "SoftwareIndex",
     "AnalysisData",
     "Observation",
     "Relationship",
     "StarRelationship",
+    "RelationshipGraph",
     "SystemProvenance",
     "HardwareProvenance",
     "SoftwareProvenance",
@@ -36,4 +43,10 @@ __all__ = [
     "AnalysisDataProvenance",
     "ObservationProvenance",
     "SBOM",
+    "load_sbom_json",
+    "sbom_from_dict",
+    "SBOMStore",
+    "MetadataSpool",
+    "MetadataStore",
+    "SpooledMetadata",
 ]
@@ -0,0 +1,673 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+# (xUUID, yUUID, relationship)
+Edge = Tuple[str, str, str]
+
+# Removed edges are skipped by every query and dropped the next time the arrays are compacted
+_REMOVED = -1
+# Compact once removed edges outnumber live ones (and there are enough of them to be worth it)
+_MIN_REMOVED_TO_COMPACT = 1024
+# Per-node arrays for a relationship type only cover the nodes up to the last one with an edge of that type
+_NO_EDGE = array("i", [-1])
+
+
+class NodeView:
+    """Read-only view of the nodes in a `RelationshipGraph`, used like the `nodes` view of a networkx
+    graph: `graph.nodes[uuid]` gives the node attributes, and `graph.nodes(data=True)` gives
+    (uuid, attributes) pairs."""
+
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph: RelationshipGraph):
+        self._graph = graph
+
+    def __call__(self, data: bool = False) -> Union[List[str], List[Tuple[str, Dict[str, str]]]]:
+        if data:
+            return [(node, self[node]) for node in self]
+        return list(self)
+
+    def __getitem__(self, node: str) -> Dict[str, str]:
+        # pylint: disable=protected-access
+        node_type = self._graph._node_types[self._graph._node_ids[node]]
+        return {} if node_type is None else {"type": node_type}
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._graph._node_ids  # pylint: disable=protected-access
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graph._node_ids)  # pylint: disable=protected-access
+
+    def __len__(self) -> int:
+        return len(self._graph._node_ids)  # pylint: disable=protected-access
+
+
+class RelationshipGraph:
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    """Directed multigraph of the relationships in an SBOM, with one edge per (xUUID, yUUID, relationship).
+
+    This implements the parts of the networkx `MultiDiGraph` API that the SBOM code uses, with the
+    relationship type as the edge key, but stores the graph compactly so that SBOMs with millions of
+    relationships fit in memory: node UUIDs and relationship types are interned to integers, and edges
+    are kept in integer arrays (about 24 bytes per edge).
+
+    Edges are indexed by relationship type, compared case-insensitively like `SBOM.get_children`: the
+    edges of each type are linked together, as are the edges of each type into and out of each node, in
+    the order they were added. Queries for the edges of a type or of a node only visit those edges.
+    Removing nodes or edges only marks their edges as removed; the arrays are compacted once removed
+    edges outnumber live ones. Use `to_networkx` to get a networkx graph for analysis or visualization.
+    """
+
+    def __init__(self, edges: Optional[Iterable[Edge]] = None):
+        # node UUID -> node id, in the order the nodes were added
+        self._node_ids: Dict[str, int] = {}
+        # per node id: the UUID (None once the node is removed) and type of each node
+        self._names: List[Optional[str]] = []
+        self._node_types: List[Optional[str]] = []
+        self._out_degree = array("i")
+        self._in_degree = array("i")
+        # relationship type <-> relationship id, and the case-normalized type id of each relationship id
+        self._rel_ids: Dict[str, int] = {}
+        self._rels: List[str] = []
+        self._rel_type = array("i")
+        # case-normalized relationship type -> type id
+        self._type_ids: Dict[str, int] = {}
+        # per type id: first and last edge, number of live edges, and per node id, first and last edge
+        # into/out of the node
+        self._first_of_type = array("i")
+        self._last_of_type = array("i")
+        self._type_counts = array("i")
+        self._first_out: List[array] = []
+        self._last_out: List[array] = []
+        self._first_in: List[array] = []
+        self._last_in: List[array] = []
+        # per edge id: the nodes and relationship id, and the next edge with the same type (from the same
+        # source node, to the same target node, and overall)
+        self._src = array("i")
+        self._dst = array("i")
+        self._rel = array("i")
+        self._next_out = array("i")
+        self._next_in = array("i")
+        self._next_of_type = array("i")
+        self._removed_edges = 0
+        if edges is not None:
+            self.add_edges_from(edges)
+
+    @property
+    def nodes(self) -> NodeView:
+        return NodeView(self)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._node_ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._node_ids)
+
+    def __len__(self) -> int:
+        return len(self._node_ids)
+
+    def number_of_nodes(self) -> int:
+        return len(self._node_ids)
+
+    def number_of_edges(self) -> int:
+        return len(self._src) - self._removed_edges
+
+    def has_node(self, node: str) -> bool:
+        return node in self._node_ids
+
+    def add_node(self, node: str, type: Optional[str] = None) -> None:  # pylint: disable=redefined-builtin
+        """Add a node, or set the type of an existing node if a type is given.
+
+        Args:
+            node (str): The UUID of the node.
+            type (Optional[str]): The node type (e.g. "Software" or "System").
+        """
+        node_id = self._node_ids.get(node)
+        if node_id is None:
+            self._new_node(node, type)
+        elif type is not None:
+            self._node_types[node_id] = type
+
+    def _new_node(self, node: str, node_type: Optional[str] = None) -> int:
+        node_id = len(self._names)
+        self._node_ids[node] = node_id
+        self._names.append(node)
+        self._node_types.append(node_type)
+        self._out_degree.append(0)
+        self._in_degree.append(0)
+        return node_id
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and all of its edges.
+
+        Args:
+            node (str): The UUID of the node.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        node_id = self._node_ids.pop(node)
+        for edge in self._out_edge_ids(node_id) + self._in_edge_ids(node_id):
+            # a self loop shows up in both lists but is only removed once
+            if self._rel[edge] != _REMOVED:
+                self._remove_edge_id(edge)
+        self._names[node_id] = None
+        self._node_types[node_id] = None
+        self._maybe_compact()
+
+    def _intern_rel(self, key: str) -> int:
+        rel = self._rel_ids[key] = len(self._rels)
+        self._rels.append(key)
+        normalized = key.upper()
+        type_id = self._type_ids.get(normalized)
+        if type_id is None:
+            type_id = self._type_ids[normalized] = len(self._type_counts)
+            self._first_of_type.append(-1)
+            self._last_of_type.append(-1)
+            self._type_counts.append(0)
+            for per_type in (self._first_out, self._last_out, self._first_in, self._last_in):
+                per_type.append(array("i"))
+        self._rel_type.append(type_id)
+        return rel
+
+    def merge_nodes(self, mapping: Dict[str, str]) -> None:
+        """Move the edges of each node in a mapping to the node it maps to, and remove the old nodes.
+        Edges that the new node already has are dropped. Only the edges of the old nodes are visited.
+
+        Args:
+            mapping (Dict[str, str]): Old UUID -> new UUID; old UUIDs that aren't in the graph are skipped.
+        """
+        for old, new in mapping.items():
+            old_id = self._node_ids.get(old)
+            if old_id is None or old == new:
+                continue
+            new_id = self._node_ids.get(new)
+            if new_id is None:
+                new_id = self._new_node(new, self._node_types[old_id])
+            for edge in self._out_edge_ids(old_id) + self._in_edge_ids(old_id):
+                rel = self._rel[edge]
+                # a self loop shows up in both lists but is only moved once
+                if rel == _REMOVED:
+                    continue
+                src = new_id if self._src[edge] == old_id else self._src[edge]
+                dst = new_id if self._dst[edge] == old_id else self._dst[edge]
+                self._remove_edge_id(edge)
+                if self._find_edge_id(src, dst, rel) is None:
+                    self._append_edge(src, dst, rel)
+            del self._node_ids[old]
+            self._names[old_id] = None
+            self._node_types[old_id] = None
+        self._maybe_compact()
+
+    def add_edge(self, u: str, v: str, key: str) -> str:
+        """Add an edge, adding its nodes if needed. Adding an edge that already exists does nothing.
+
+        Args:
+            u (str): The UUID of the source node (xUUID).
+            v (str): The UUID of the target node (yUUID).
+            key (str): The relationship type.
+
+        Returns:
+            str: The edge key.
+        """
+        src = self._node_ids.get(u)
+        if src is None:
+            src = self._new_node(u)
+        dst = self._node_ids.get(v)
+        if dst is None:
+            dst = self._new_node(v)
+        rel = self._rel_ids.get(key)
+        if rel is None:
+            rel = self._intern_rel(key)
+        elif self._find_edge_id(src, dst, rel) is not None:
+            return key
+        self._append_edge(src, dst, rel)
+        return key
+
+    def add_edges_from(self, edges: Iterable[Edge]) -> None:
+        """Add (xUUID, yUUID, relationship) edges, skipping any that already exist.
+
+        Args:
+            edges (Iterable[Edge]): The edges to add.
+        """
+        for u, v, key in edges:
+            self.add_edge(u, v, key)
+
+    @staticmethod
+    def _link(first: array, last: array, next_edge: array, index: int, edge: int) -> None:
+        # append an edge to the list of edges that starts at first[index]
+        if index >= len(first):
+            missing = _NO_EDGE * (index + 1 - len(first))
+            first.extend(missing)
+            last.extend(missing)
+        if last[index] < 0:
+            first[index] = edge
+        else:
+            next_edge[last[index]] = edge
+        last[index] = edge
+
+    def _append_edge(self, src: int, dst: int, rel: int) -> None:
+        edge = len(self._src)
+        type_id = self._rel_type[rel]
+        self._src.append(src)
+        self._dst.append(dst)
+        self._rel.append(rel)
+        self._next_out.append(-1)
+        self._next_in.append(-1)
+        self._next_of_type.append(-1)
+        self._link(self._first_out[type_id], self._last_out[type_id], self._next_out, src, edge)
+        self._link(self._first_in[type_id], self._last_in[type_id], self._next_in, dst, edge)
+        self._link(self._first_of_type, self._last_of_type, self._next_of_type, type_id, edge)
+        self._type_counts[type_id] += 1
+        self._out_degree[src] += 1
+        self._in_degree[dst] += 1
+
+    def remove_edge(self, u: str, v: str, key: str) -> None:
+        """Remove an edge.
+
+        Args:
+            u (str): The UUID of the source node (xUUID).
+            v (str): The UUID of the target node (yUUID).
+            key (str): The relationship type.
+
+        Raises:
+            KeyError: If the edge is not in the graph.
+        """
+        edge = self._find_edge(u, v, key)
+        if edge is None:
+            raise KeyError((u, v, key))
+        self._remove_edge_id(edge)
+        self._maybe_compact()
+
+    def _remove_edge_id(self, edge: int) -> None:
+        self._type_counts[self._rel_type[self._rel[edge]]] -= 1
+        self._rel[edge] = _REMOVED
+        self._out_degree[self._src[edge]] -= 1
+        self._in_degree[self._dst[edge]] -= 1
+        self._removed_edges += 1
+
+    def has_edge(self, u: str, v: str, key: Optional[str] = None) -> bool:
+        """Check for an edge from u to v, with the given relationship type if a key is given.
+
+        Args:
+            u (str): The UUID of the source node (xUUID).
+            v (str): The UUID of the target node (yUUID).
+            key (Optional[str]): The relationship type (matched exactly), or None for any type.
+
+        Returns:
+            bool: True if the graph has a matching edge.
+        """
+        return self._find_edge(u, v, key) is not None
+
+    def _find_edge(self, u: str, v: str, key: Optional[str]) -> Optional[int]:
+        src = self._node_ids.get(u)
+        dst = self._node_ids.get(v)
+        if src is None or dst is None:
+            return None
+        if key is None:
+            return self._find_edge_id(src, dst, None)
+        rel = self._rel_ids.get(key)
+        return None if rel is None else self._find_edge_id(src, dst, rel)
+
+    def _find_edge_id(
+        self, src: int, dst: int, rel: Optional[int], type_id: Optional[int] = None
+    ) -> Optional[int]:
+        # find the first edge from src to dst with the relationship id or type id, if given
+        if rel is not None:
+            type_id = self._rel_type[rel]
+        # walk whichever node has fewer edges: containers have many children, but each child is in few
+        # containers, and libraries are used by many files that each use a few libraries
+        if self._out_degree[src] <= self._in_degree[dst]:
+            candidates, others, other = self._out_edge_ids(src, type_id), self._dst, dst
+        else:
+            candidates, others, other = self._in_edge_ids(dst, type_id), self._src, src
+        for edge in candidates:
+            if others[edge] == other and (rel is None or self._rel[edge] == rel):
+                return edge
+        return None
+
+    def _chain(self, first: array, next_edge: array, index: int) -> Iterator[int]:
+        # the live edges in the list of edges that starts at first[index]
+        edge = first[index] if index < len(first) else -1
+        while edge >= 0:
+            if self._rel[edge] != _REMOVED:
+                yield edge
+            edge = next_edge[edge]
+
+    def _node_edge_ids(
+        self, first: List[array], next_edge: array, node_id: int, type_id: Optional[int]
+    ) -> List[int]:
+        if type_id is not None:
+            return list(self._chain(first[type_id], next_edge, node_id))
+        edges: List[int] = []
+        types_found = 0
+        for first_of_type in first:
+            size = len(edges)
+            edges.extend(self._chain(first_of_type, next_edge, node_id))
+            types_found += len(edges) > size
+        if types_found > 1:
+            # edge ids are in the order the edges were added
+            edges.sort()
+        return edges
+
+    def _out_edge_ids(self, node_id: int, type_id: Optional[int] = None) -> List[int]:
+        return self._node_edge_ids(self._first_out, self._next_out, node_id, type_id)
+
+    def _in_edge_ids(self, node_id: int, type_id: Optional[int] = None) -> List[int]:
+        return self._node_edge_ids(self._first_in, self._next_in, node_id, type_id)
+
+    def _edge_ids(self, rel_type: Optional[str]) -> Iterable[int]:
+        if rel_type is None:
+            return range(len(self._src))
+        type_id = self._type_ids.get(rel_type.upper())
+        if type_id is None:
+            return ()
+        return self._chain(self._first_of_type, self._next_of_type, type_id)
+
+    def edges(
+        self, keys: bool = False, rel_type: Optional[str] = None
+    ) -> Iterator[Union[Edge, Tuple[str, str]]]:
+        """Iterate over the edges grouped by source node, in the order the nodes were added, and then by
+        target node, in the order of their first edge from the source. This is the same order as a
+        networkx MultiDiGraph built from the same edges.
+
+        Args:
+            keys (bool): Whether to include the relationship type in each edge.
+            rel_type (Optional[str]): Only include edges with this relationship type (case-insensitive).
+
+        Returns:
+            Iterator[Union[Edge, Tuple[str, str]]]: (xUUID, yUUID, relationship) tuples if keys is True,
+            otherwise (xUUID, yUUID) tuples.
+        """
+        type_id = self._type_id(rel_type)
+        if type_id == -1:
+            return
+        names, rels = self._names, self._rels
+        dst, rel = self._dst, self._rel
+        for u, node_id in list(self._node_ids.items()):
+            if not self._out_degree[node_id]:
+                continue
+            by_target: Dict[int, List[int]] = {}
+            for edge in self._out_edge_ids(node_id, type_id):
+                by_target.setdefault(dst[edge], []).append(edge)
+            for target, target_edges in by_target.items():
+                v = names[target]
+                for edge in target_edges:
+                    if rel[edge] != _REMOVED:
+                        yield (u, v, rels[rel[edge]]) if keys else (u, v)
+
+    def number_of_edges_of_type(self, rel_type: str) -> int:
+        """Get the number of edges with a relationship type.
+
+        Args:
+            rel_type (str): The relationship type (case-insensitive).
+
+        Returns:
+            int: The number of edges.
+        """
+        type_id = self._type_ids.get(rel_type.upper())
+        return 0 if type_id is None else self._type_counts[type_id]
+
+    def _type_id(self, rel_type: Optional[str]) -> Optional[int]:
+        # -1 for relationship types that aren't in the graph, so that no edges match
+        return None if rel_type is None else self._type_ids.get(rel_type.upper(), -1)
+
+    def out_edges(
+        self, node: str, keys: bool = False, rel_type: Optional[str] = None
+    ) -> List[Union[Edge, Tuple[str, str]]]:
+        """Get the edges from a node, in the order they were added.
+
+        Args:
+            node (str): The UUID of the node.
+            keys (bool): Whether to include the relationship type in each edge.
+            rel_type (Optional[str]): Only include edges with this relationship type (case-insensitive).
+
+        Returns:
+            List[Union[Edge, Tuple[str, str]]]: The edges, or an empty list if the node isn't in the graph.
+        """
+        node_id = self._node_ids.get(node)
+        type_id = self._type_id(rel_type)
+        if node_id is None or type_id == -1:
+            return []
+        names = self._names
+        if keys:
+            return [
+                (node, names[self._dst[edge]], self._rels[self._rel[edge]])
+                for edge in self._out_edge_ids(node_id, type_id)
+            ]
+        return [(node, names[self._dst[edge]]) for edge in self._out_edge_ids(node_id, type_id)]
+
+    def in_edges(
+        self, node: str, keys: bool = False, rel_type: Optional[str] = None
+    ) -> List[Union[Edge, Tuple[str, str]]]:
+        """Get the edges into a node, in the order they were added.
+
+        Args:
+            node (str): The UUID of the node.
+            keys (bool): Whether to include the relationship type in each edge.
+            rel_type (Optional[str]): Only include edges with this relationship type (case-insensitive).
+
+        Returns:
+            List[Union[Edge, Tuple[str, str]]]: The edges, or an empty list if the node isn't in the graph.
+        """
+        node_id = self._node_ids.get(node)
+        type_id = self._type_id(rel_type)
+        if node_id is None or type_id == -1:
+            return []
+        names = self._names
+        if keys:
+            return [
+                (names[self._src[edge]], node, self._rels[self._rel[edge]])
+                for edge in self._in_edge_ids(node_id, type_id)
+            ]
+        return [(names[self._src[edge]], node) for edge in self._in_edge_ids(node_id, type_id)]
+
+    def find_edge(
+        self, u: Optional[str] = None, v: Optional[str] = None, rel_type: Optional[str] = None
+    ) -> Optional[Edge]:
+        """Find the first edge (in the order they were added) matching the given source node, target node,
+        and/or relationship type. Only the edges of the given nodes, or of the relationship type if no
+        nodes are given, are searched.
+
+        Args:
+            u (Optional[str]): The UUID of the source node (xUUID), or None for any source.
+            v (Optional[str]): The UUID of the target node (yUUID), or None for any target.
+            rel_type (Optional[str]): The relationship type (case-insensitive), or None for any type.
+
+        Returns:
+            Optional[Edge]: The (xUUID, yUUID, relationship) edge found, otherwise None.
+        """
+        src = None if u is None else self._node_ids.get(u, -1)
+        dst = None if v is None else self._node_ids.get(v, -1)
+        type_id = self._type_id(rel_type)
+        if -1 in (src, dst, type_id):
+            return None
+        if src is not None and dst is not None:
+            edge = self._find_edge_id(src, dst, None, type_id)
+        elif src is not None:
+            edge = next(iter(self._out_edge_ids(src, type_id)), None)
+        elif dst is not None:
+            edge = next(iter(self._in_edge_ids(dst, type_id)), None)
+        else:
+            edge = next(
+                (edge for edge in self._edge_ids(rel_type) if self._rel[edge] != _REMOVED), None
+            )
+        if edge is None:
+            return None
+        return (
+            self._names[self._src[edge]],
+            self._names[self._dst[edge]],
+            self._rels[self._rel[edge]],
+        )
+
+    def in_degree(self, node: Optional[str] = None) -> Union[int, List[Tuple[str, int]]]:
+        """Get the number of edges into a node, or (UUID, number of edges) for every node.
+
+        Args:
+            node (Optional[str]): The UUID of the node, or None for all nodes.
+
+        Returns:
+            Union[int, List[Tuple[str, int]]]: The in-degree of the node, or of every node.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        if node is not None:
+            return self._in_degree[self._node_ids[node]]
+        return [(name, self._in_degree[node_id]) for name, node_id in self._node_ids.items()]
+
+    def out_degree(self, node: Optional[str] = None) -> Union[int, List[Tuple[str, int]]]:
+        """Get the number of edges from a node, or (UUID, number of edges) for every node.
+
+        Args:
+            node (Optional[str]): The UUID of the node, or None for all nodes.
+
+        Returns:
+            Union[int, List[Tuple[str, int]]]: The out-degree of the node, or of every node.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        if node is not None:
+            return self._out_degree[self._node_ids[node]]
+        return [(name, self._out_degree[node_id]) for name, node_id in self._node_ids.items()]
+
+    def _maybe_compact(self) -> None:
+        if (
+            self._removed_edges >= _MIN_REMOVED_TO_COMPACT
+            and self._removed_edges > len(self._src) // 2
+        ):
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop removed nodes and edges from the arrays, renumbering the rest. This is done automatically
+        once removed edges outnumber live ones."""
+        names, node_types = self._names, self._node_types
+        src, dst, rel, rels = self._src, self._dst, self._rel, self._rels
+        self.__init__()  # pylint: disable=unnecessary-dunder-call
+        new_ids = array("i", [-1]) * len(names)
+        for old_id, name in enumerate(names):
+            if name is not None:
+                new_ids[old_id] = self._new_node(name, node_types[old_id])
+        for key in rels:
+            self._intern_rel(key)
+        for edge_src, edge_dst, edge_rel in zip(src, dst, rel):
+            if edge_rel != _REMOVED:
+                self._append_edge(new_ids[edge_src], new_ids[edge_dst], edge_rel)
+
+    def _successor_ids(self, node_id: int) -> List[int]:
+        return [self._dst[edge] for edge in self._out_edge_ids(node_id)]
+
+    def roots_and_cycles(self) -> Tuple[List[str], List[List[str]]]:
+        """Find the root nodes (nodes without incoming edges) and the groups of nodes that are part of a
+        cycle, in one pass over the graph. The groups are the strongly connected components with more than
+        one node, or with a node that has an edge to itself, found with an iterative version of Tarjan's
+        algorithm, so this takes time linear in the size of the graph however many cycles there are.
+
+        Returns:
+            Tuple[List[str], List[List[str]]]: The UUIDs of the root nodes, in the order they were added,
+            and the UUIDs of the nodes in each group of nodes with a cycle.
+        """
+        names = self._names
+        index = _NO_EDGE * len(names)
+        low = array("i", [0]) * len(names)
+        stack_position = array("i", [0]) * len(names)
+        on_stack = bytearray(len(names))
+        stack: List[int] = []
+        roots: List[str] = []
+        components: List[List[str]] = []
+        visited = 0
+        for root_id in self._node_ids.values():
+            if self._in_degree[root_id] == 0:
+                roots.append(names[root_id])
+            if index[root_id] >= 0:
+                continue
+            index[root_id] = low[root_id] = visited
+            visited += 1
+            stack_position[root_id] = len(stack)
+            stack.append(root_id)
+            on_stack[root_id] = 1
+            # depth-first search, with the successors left to visit for each node on the path
+            path = [(root_id, iter(self._successor_ids(root_id)))]
+            while path:
+                node_id, successors = path[-1]
+                for successor in successors:
+                    if index[successor] < 0:
+                        index[successor] = low[successor] = visited
+                        visited += 1
+                        stack_position[successor] = len(stack)
+                        stack.append(successor)
+                        on_stack[successor] = 1
+                        path.append((successor, iter(self._successor_ids(successor))))
+                        break
+                    if on_stack[successor] and index[successor] < low[node_id]:
+                        low[node_id] = index[successor]
+                else:
+                    path.pop()
+                    if path and low[node_id] < low[path[-1][0]]:
+                        low[path[-1][0]] = low[node_id]
+                    if low[node_id] == index[node_id]:
+                        # node_id is the first node visited in its component, which is the rest of the stack
+                        component = stack[stack_position[node_id] :]
+                        del stack[stack_position[node_id] :]
+                        for member in component:
+                            on_stack[member] = 0
+                        if len(component) > 1 or node_id in self._successor_ids(node_id):
+                            components.append([names[member] for member in component])
+        return roots, components
+
+    def find_cycle(self, nodes: Iterable[str]) -> List[str]:
+        """Find a shortest cycle through the first of the given nodes, using only edges between the given
+        nodes (e.g. one of the groups found by `roots_and_cycles`).
+
+        Args:
+            nodes (Iterable[str]): The UUIDs of the nodes the cycle can go through.
+
+        Returns:
+            List[str]: The UUIDs of the nodes in the cycle, starting with the first node, or an empty list
+            if there is no cycle.
+        """
+        node_ids = [self._node_ids[node] for node in nodes]
+        if not node_ids:
+            return []
+        start = node_ids[0]
+        allowed = set(node_ids)
+        # breadth-first search from the start node until an edge leads back to it
+        previous = {start: -1}
+        queue = deque([start])
+        while queue:
+            node_id = queue.popleft()
+            for successor in self._successor_ids(node_id):
+                if successor == start:
+                    cycle = [node_id]
+                    while previous[cycle[-1]] >= 0:
+                        cycle.append(previous[cycle[-1]])
+                    return [self._names[member] for member in reversed(cycle)]
+                if successor in allowed and successor not in previous:
+                    previous[successor] = node_id
+                    queue.append(successor)
+        return []
+
+    def to_networkx(self) -> nx.MultiDiGraph:
+        """Copy the graph to a networkx `MultiDiGraph`, keyed by relationship type, with a "type" attribute
+        on each node whose type is known.
+
+        Returns:
+            nx.MultiDiGraph: The networkx graph.
+        """
+        import networkx as nx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from(self.edges(keys=True))
+        return graph
@@ -0,0 +1,197 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import functools
+import re
+from dataclasses import fields
+from json.encoder import INFINITY, encode_basestring_ascii
+from typing import Any, Callable, List, Optional, Tuple
+
+from ._metadata_spool import SpooledMetadata
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+# In indented output, numbers within objects and arrays are always at the end of a line (where strings
+# would end with a quote)
+_LINE_END_NUMBER = re.compile(rb"[0-9],?\n")
+
+# Characters that json.dumps escapes with ensure_ascii, but that orjson writes as is
+_NON_ASCII = re.compile(r"[^\x00-\x7e]")
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(fld.name for fld in fields(cls))
+
+
+def _float_str(o: float) -> str:
+    # same as json.dumps, which writes NaN and Infinity even though they aren't valid JSON
+    if o != o:  # pylint: disable=comparison-with-itself
+        return "NaN"
+    if o == INFINITY:
+        return "Infinity"
+    if o == -INFINITY:
+        return "-Infinity"
+    return float.__repr__(o)
+
+
+def _key_str(key: Any) -> str:
+    # dict keys are converted to strings the same way json.dumps does
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _float_str(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+
+def _make_stdlib_encoder(indent: Optional[int], level: int) -> Callable[[Any], str]:
+    """Make a function that writes the same JSON as `json.dumps(dataclasses.asdict(obj), indent=indent)`,
+    with each line after the first indented `level` levels deeper. Dataclasses are walked directly instead of
+    being copied into dictionaries first, and the whole item is written in one pass instead of with the
+    generators json.dumps uses when indenting."""
+    indent_str = "" if indent is None else " " * indent
+    item_sep = ", " if indent is None else ","
+
+    @functools.lru_cache(maxsize=None)
+    def newline(depth: int) -> str:
+        return "" if indent is None else "\n" + indent_str * depth
+
+    def encode_items(items, chunks: List[str], depth: int, is_dict: bool) -> None:
+        first = True
+        inner = newline(depth + 1)
+        for item in items:
+            chunks.append(inner if first else item_sep + inner)
+            first = False
+            if is_dict:
+                chunks.append(encode_basestring_ascii(_key_str(item[0])))
+                chunks.append(": ")
+                item = item[1]
+            encode(item, chunks, depth + 1)
+        if not first:
+            chunks.append(newline(depth))
+
+    def encode(o: Any, chunks: List[str], depth: int) -> None:
+        if isinstance(o, str):
+            chunks.append(encode_basestring_ascii(o))
+        elif o is None:
+            chunks.append("null")
+        elif o is True:
+            chunks.append("true")
+        elif o is False:
+            chunks.append("false")
+        elif isinstance(o, int):
+            chunks.append(int.__repr__(o))
+        elif isinstance(o, float):
+            chunks.append(_float_str(o))
+        elif isinstance(o, (list, tuple, SpooledMetadata)):
+            chunks.append("[")
+            encode_items(o, chunks, depth, is_dict=False)
+            chunks.append("]")
+        elif isinstance(o, dict):
+            chunks.append("{")
+            encode_items(o.items(), chunks, depth, is_dict=True)
+            chunks.append("}")
+        elif hasattr(type(o), "__dataclass_fields__"):
+            chunks.append("{")
+            names = _field_names(type(o))
+            encode_items(((name, getattr(o, name)) for name in names), chunks, depth, is_dict=True)
+            chunks.append("}")
+        else:
+            raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+    def encode_item(obj: Any) -> str:
+        chunks: List[str] = []
+        encode(obj, chunks, level)
+        return "".join(chunks)
+
+    return encode_item
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, SpooledMetadata):
+        return list(obj)
+    raise TypeError
+
+
+def _escape_non_ascii(match: "re.Match[str]") -> str:
+    n = ord(match.group(0))
+    if n < 0x10000:
+        return f"\\u{n:04x}"
+    n -= 0x10000
+    return f"\\u{0xD800 | (n >> 10):04x}\\u{0xDC00 | (n & 0x3FF):04x}"
+
+
+def _python_floats(data: bytes) -> bytes:
+    # orjson formats floats differently than repr() (e.g. 1e16 instead of 1e+16, and 0.00001 instead of 1e-05)
+    pieces = []
+    last = 0
+    ends = [match.start() + 1 for match in _LINE_END_NUMBER.finditer(data)]
+    if data[-1:].isdigit():
+        ends.append(len(data))
+    for end in ends:
+        start = data.rfind(b" ", 0, end) + 1
+        number = data[start:end]
+        if b"." in number or b"e" in number:
+            pieces += [data[last:start], float.__repr__(float(number)).encode()]
+            last = end
+    if not pieces:
+        return data
+    pieces.append(data[last:])
+    return b"".join(pieces)
+
+
+def _make_orjson_encoder(level: int, fallback: Callable[[Any], str]) -> Callable[[Any], str]:
+    """Make a function that writes the same JSON as the stdlib encoder using orjson, for an indent of 2.
+    orjson's output only differs in how floats are formatted and in writing non-ASCII characters as is,
+    so those are fixed up afterwards; anything orjson can't write (e.g. integers too large for 64 bits,
+    or non-string keys) is written with the stdlib encoder instead. NaN and Infinity (which aren't valid
+    JSON) are written as null."""
+    options = orjson.OPT_INDENT_2
+    newline = b"\n" + b"  " * level
+
+    def encode_item(obj: Any) -> str:
+        try:
+            data = orjson.dumps(obj, default=_orjson_default, option=options)
+        except orjson.JSONEncodeError:
+            return fallback(obj)
+        if level:
+            # JSON escapes newlines within strings, so each line can be indented as is
+            data = data.replace(b"\n", newline)
+        data = _python_floats(data)
+        text = data.decode()
+        if not data.isascii() or b"\x7f" in data:
+            text = _NON_ASCII.sub(_escape_non_ascii, text)
+        return text
+
+    return encode_item
+
+
+def make_item_encoder(indent: Optional[int] = None, level: int = 0) -> Callable[[Any], str]:
+    """Make a function that converts an SBOM item (e.g. a software entry) to JSON, the same as
+    `json.dumps(dataclasses.asdict(item), indent=indent)` but without first copying the item into a
+    dictionary. orjson is used if it is installed and the indent is 2 (as used for CyTRICS SBOMs).
+
+    Args:
+        indent (Optional[int]): Number of spaces to indent nested values by, or None to write the item on one line.
+        level (int): How deeply nested the item is in the document being written; each line after the first
+            is indented to match.
+
+    Returns:
+        Callable[[Any], str]: The encoder.
+    """
+    encoder = _make_stdlib_encoder(indent, level)
+    if orjson is not None and indent == 2:
+        encoder = _make_orjson_encoder(level, encoder)
+    return encoder
@@ -0,0 +1,305 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import tempfile
+from collections.abc import MutableSequence
+from typing import Any, Hashable, Iterable, Iterator, List, Optional
+
+from ._software import Software
+
+
+class MetadataSpool:
+    """Moves the metadata of software entries out of memory and into a temporary file, leaving
+    a `SpooledMetadata` list in its place that reads the metadata back when it is used.
+
+    The temporary file is append-only; changing spooled metadata writes a new copy of it.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """Creates the temporary file used to hold metadata.
+
+        Args:
+            directory (Optional[str]): Directory to create the temporary file in; defaults to the system temp directory.
+        """
+        # pylint: disable-next=consider-using-with
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._end = 0
+        # the spooled metadata list that currently has its contents loaded, if any
+        self.loaded: Optional[SpooledMetadata] = None
+
+    def store(self, metadata: List[Any], key: Optional[Hashable] = None) -> "SpooledMetadata":
+        """Write metadata to the spool.
+
+        Args:
+            metadata (List[Any]): The metadata to store.
+            key (Optional[Hashable]): Key of a previous copy of the metadata; unused, since the spool is
+                append-only.
+
+        Returns:
+            SpooledMetadata: A list that reads the metadata from the spool.
+        """
+        data = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.seek(self._end)
+        self._file.write(data)
+        spooled = SpooledMetadata(self, (self._end, len(data)), len(metadata))
+        self._end += len(data)
+        return spooled
+
+    def read(self, key: Hashable) -> bytes:
+        """Read the pickled metadata written to the spool.
+
+        Args:
+            key (Hashable): The position and size of the metadata in the spool file.
+
+        Returns:
+            bytes: The pickled metadata.
+        """
+        offset, size = key
+        self._file.seek(offset)
+        return self._file.read(size)
+
+    def load(self, key: Hashable) -> List[Any]:
+        """Read metadata written to the spool.
+
+        Args:
+            key (Hashable): The position and size of the metadata in the spool file.
+
+        Returns:
+            List[Any]: A new copy of the metadata.
+        """
+        return pickle.loads(self.read(key))
+
+    def spool(self, software_entries: Iterable[Software]) -> None:
+        """Move the metadata of software entries into the spool. Entries that are already spooled
+        or have no metadata are left as is.
+
+        Args:
+            software_entries (Iterable[Software]): The software entries to spool the metadata of.
+        """
+        for sw in software_entries:
+            if sw.metadata and not isinstance(sw.metadata, SpooledMetadata):
+                sw.metadata = self.store(list(sw.metadata))
+
+    def close(self) -> None:
+        """Delete the spool file. Spooled metadata can't be read after the spool is closed."""
+        self._file.close()
+
+
+class MetadataStore:
+    """Moves the metadata of software entries out of memory and into a SQLite database keyed by
+    software entry UUID, leaving a `SpooledMetadata` list in its place that reads the metadata
+    back when it is used.
+
+    Unlike a `MetadataSpool`, changing stored metadata replaces the old copy, so the database only
+    grows with the number of software entries; this makes it suited to very large scans where the
+    metadata of most entries is written once and read back once.
+    """
+
+    # Number of rows written before committing them
+    COMMIT_INTERVAL = 1000
+
+    def __init__(self, path: Optional[str] = None, directory: Optional[str] = None):
+        """Creates (or empties) the database used to hold metadata.
+
+        Args:
+            path (Optional[str]): Location of the database; defaults to a temporary file that is deleted
+                when the store is closed.
+            directory (Optional[str]): Directory to create the temporary database in; defaults to the
+                system temp directory.
+        """
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="surfactant-metadata-", suffix=".db", dir=directory)
+            os.close(fd)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        # the store only lives as long as the run using it, so durability isn't needed
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("DROP TABLE IF EXISTS metadata")
+        self._db.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        self._uncommitted = 0
+        self._next_key = 0
+        # the stored metadata list that currently has its contents loaded, if any
+        self.loaded: Optional[SpooledMetadata] = None
+
+    def _write(self, rows: List[tuple]) -> None:
+        self._db.executemany("INSERT OR REPLACE INTO metadata (key, data) VALUES (?, ?)", rows)
+        self._uncommitted += len(rows)
+        if self._uncommitted >= self.COMMIT_INTERVAL:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def _new_key(self) -> str:
+        # for metadata stored without a software entry UUID to key it by
+        self._next_key += 1
+        return f"#{self._next_key}"
+
+    def store(self, metadata: List[Any], key: Optional[Hashable] = None) -> "SpooledMetadata":
+        """Write metadata to the store.
+
+        Args:
+            metadata (List[Any]): The metadata to store.
+            key (Optional[Hashable]): Key to store the metadata under, replacing anything already stored
+                with it; usually the UUID of the software entry the metadata belongs to.
+
+        Returns:
+            SpooledMetadata: A list that reads the metadata from the store.
+        """
+        key = str(key) if key is not None else self._new_key()
+        self._write([(key, pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL))])
+        return SpooledMetadata(self, key, len(metadata))
+
+    def read(self, key: Hashable) -> bytes:
+        """Read the pickled metadata written to the store.
+
+        Args:
+            key (Hashable): Key the metadata was stored under.
+
+        Returns:
+            bytes: The pickled metadata.
+
+        Raises:
+            KeyError: If nothing is stored under the key.
+        """
+        row = self._db.execute("SELECT data FROM metadata WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def load(self, key: Hashable) -> List[Any]:
+        """Read metadata written to the store.
+
+        Args:
+            key (Hashable): Key the metadata was stored under.
+
+        Returns:
+            List[Any]: A new copy of the metadata.
+        """
+        return pickle.loads(self.read(key))
+
+    def spool(self, software_entries: Iterable[Software]) -> None:
+        """Move the metadata of software entries into the store, keyed by their UUIDs. Entries that
+        are already stored or have no metadata are left as is.
+
+        Args:
+            software_entries (Iterable[Software]): The software entries to store the metadata of.
+        """
+        rows = []
+        for sw in software_entries:
+            if sw.metadata and not isinstance(sw.metadata, SpooledMetadata):
+                key = sw.UUID or self._new_key()
+                metadata = list(sw.metadata)
+                rows.append((key, pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)))
+                sw.metadata = SpooledMetadata(self, key, len(metadata))
+        if rows:
+            self._write(rows)
+
+    def close(self) -> None:
+        """Close the database, deleting it if it is temporary. Stored metadata can't be read after the
+        store is closed."""
+        self._db.close()
+        if self._temporary:
+            os.unlink(self.path)
+
+
+class SpooledMetadata(MutableSequence):
+    """A list of software entry metadata stored in a `MetadataSpool` or `MetadataStore`.
+
+    The metadata is loaded from the spool when the list is first read and kept until the metadata of
+    another software entry in the same spool is loaded, so only one list per spool is in memory and
+    indexing or iterating over it only reads it once. Changes to the list itself (e.g. appending,
+    removing, or replacing items) are written back right away; changes made to the dictionaries it
+    contains are written back once the list is unloaded, so references to them shouldn't be kept
+    after reading the metadata of other entries.
+    """
+
+    def __init__(self, spool: Any, key: Hashable, length: int):
+        self._spool = spool
+        self._key = key
+        self._length = length
+        # the loaded metadata, and the pickled copy it was loaded from
+        self._items: Optional[List[Any]] = None
+        self._data = b""
+
+    def _load(self) -> List[Any]:
+        if self._items is None:
+            if self._spool.loaded is not None:
+                self._spool.loaded.unload()
+            self._data = self._spool.read(self._key)
+            self._items = pickle.loads(self._data)
+            self._spool.loaded = self
+        return self._items
+
+    def unload(self) -> None:
+        """Write back any changes made to the loaded metadata, and free the memory it uses."""
+        items = self._items
+        if items is None:
+            return
+        self._items = None
+        self._spool.loaded = None
+        if pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL) != self._data:
+            self._save(items)
+        self._data = b""
+
+    def _save(self, metadata: List[Any]) -> None:
+        if self._items is not None:
+            self._items = None
+            self._spool.loaded = None
+        updated = self._spool.store(metadata, self._key)
+        # pylint: disable-next=protected-access
+        self._key, self._length = updated._key, updated._length
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+    def __setitem__(self, index, value) -> None:
+        metadata = self._load()
+        metadata[index] = value
+        self._save(metadata)
+
+    def __delitem__(self, index) -> None:
+        metadata = self._load()
+        del metadata[index]
+        self._save(metadata)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def insert(self, index: int, value: Any) -> None:
+        metadata = self._load()
+        metadata.insert(index, value)
+        self._save(metadata)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        metadata = self._load()
+        metadata.extend(values)
+        self._save(metadata)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._load())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SpooledMetadata):
+            other = other._load()
+        return self._load() == other
+
+    def __repr__(self) -> str:
+        return repr(self._load())
+
+    def __copy__(self) -> List[Any]:
+        return list(self._load())
+
+    def __deepcopy__(self, memo) -> List[Any]:
+        # a freshly unpickled list doesn't share anything with other copies
+        return pickle.loads(pickle.dumps(self._load(), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def __reduce__(self):
+        # pickle (e.g. for worker processes) as a regular list
+        return (list, (self._load(),))
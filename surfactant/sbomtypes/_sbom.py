@@ -4,25 +4,28 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import io
 import json
 import uuid as uuid_module
 from dataclasses import asdict, dataclass, field, fields
-from typing import Dict, List, Optional, Set
+from typing import IO, Any, Dict, Iterable, List, Optional, Set
 
-import networkx as nx
 from dataclasses_json import config, dataclass_json
 from loguru import logger
 
 from ._analysisdata import AnalysisData
 from ._file import File
+from ._graph import RelationshipGraph
 from ._hardware import Hardware
+from ._json_encoder import make_item_encoder
 from ._observation import Observation
 from ._provenance import SoftwareProvenance
 from ._relationship import Relationship, StarRelationship
 from ._software import Software, SoftwareComponent
+from ._software_index import SoftwareIndex
 from ._system import System
 
-INTERNAL_FIELDS = {"software_lookup_by_sha256"}
+INTERNAL_FIELDS = {"software_index"}
 
 
 def recover_serializers(cls):
@@ -41,7 +44,7 @@ def recover_serializers(cls):
 @dataclass_json
 @dataclass
 class SBOM:
-    # pylint: disable=R0902
+    # pylint: disable=R0902,R0904
     systems: List[System] = field(default_factory=list)
     hardware: List[Hardware] = field(default_factory=list)
     software: List[Software] = field(default_factory=list)
@@ -55,13 +58,19 @@ class SBOM:
     analysisData: List[AnalysisData] = field(default_factory=list)
     observations: List[Observation] = field(default_factory=list)
     starRelationships: Set[StarRelationship] = field(default_factory=set)
-    software_lookup_by_sha256: Dict = field(default_factory=dict)
-    graph: nx.MultiDiGraph = field(
+    # lookup tables for software entries; kept up to date by the methods that add or merge entries
+    software_index: SoftwareIndex = field(
+        init=False,
+        repr=False,
+        compare=False,
+        metadata=config(exclude=lambda _: True),
+    )
+    graph: RelationshipGraph = field(
         init=False,
         repr=False,
         # metadata=config(exclude=lambda _: True),  # internal graph; excluded from JSON
         metadata=config(exclude=lambda _: True),
-    )  # Add a NetworkX directed graph for quick traversal/query
+    )  # Add a directed graph of the relationships for quick traversal/query
 
     def __post_init__(self):
         # If called like SBOM(raw_dict), raw_dict will be in .systems
@@ -121,25 +130,28 @@ class SBOM:
                 clean = {k: v for k, v in sr_data.items() if k in STAR_FIELDS}
                 self.starRelationships.add(StarRelationship(**clean))
 
+        # Index software entries loaded from an existing SBOM so new entries get merged with them
+        self.software_index = SoftwareIndex(self.software)
+
         # Strip out internal-only fields so dataclass logic and JSON serializers ignore them
         # pylint: disable=access-member-before-definition
         self.__dataclass_fields__ = {
             k: v for k, v in self.__dataclass_fields__.items() if k not in INTERNAL_FIELDS
         }
 
-        # Build the NetworkX graph from systems/software and loaded relationships
+        # Build the relationship graph from systems/software and loaded relationships
         self.build_graph()
 
     def build_graph(self) -> None:
         """Rebuild the directed graph from systems, software, and any loaded relationships."""
-        self.graph = nx.MultiDiGraph()
+        self.graph = RelationshipGraph()
         for sys in self.systems:
             self.graph.add_node(sys.UUID, type="System")
         for sw in self.software:
             self.graph.add_node(sw.UUID, type="Software")
         # rehydrate edges from loaded JSON (if any)
         for rel in self._loaded_relationships:
-            self.graph.add_edge(rel.xUUID, rel.yUUID, key=rel.relationship)
+            self.graph.add_edge(rel.xUUID, rel.yUUID, rel.relationship)
 
     def add_relationship(self, rel: Relationship) -> None:
         # The Relationship object get wired into the graph key=…
@@ -191,26 +203,127 @@ class SBOM:
         if xUUID and yUUID and relationship:
             return self.graph.has_edge(xUUID, yUUID, key=relationship)
 
-        # Otherwise scan all edges with keys
-        for u, v, key in self.graph.edges(keys=True):
-            if xUUID and u != xUUID:
-                continue
-            if yUUID and v != yUUID:
-                continue
-            if relationship and key.upper() != relationship.upper():
-                continue
-            return True
-        return False
+        # Otherwise look through the edges of the given nodes or relationship type
+        return self.graph.find_edge(xUUID or None, yUUID or None, relationship or None) is not None
+
+    @property
+    def software_lookup_by_sha256(self) -> Dict[str, Software]:
+        """Software entries by sha256 hash; kept for compatibility, use `find_software` instead."""
+        return {sw.sha256: sw for sw in reversed(self.software) if sw.sha256 is not None}
+
+    def _sync_software_index(self) -> SoftwareIndex:
+        # index any entries appended directly to the software list instead of with add_software
+        for sw in self.software[self.software_index.count :]:
+            self.software_index.add(sw)
+        return self.software_index
+
+    def reindex_software(self, sw: Software) -> None:
+        """Update the lookup tables for a software entry after changing its file names, paths, or hashes.
+
+        Args:
+            sw (Software): The software entry that was changed.
+        """
+        self._sync_software_index().update(sw)
 
     def find_software(self, sha256: Optional[str]) -> Optional[Software]:
-        if sha256 in self.software_lookup_by_sha256:
-            return self.software_lookup_by_sha256[sha256]
-        return None
+        return self._sync_software_index().get("sha256", sha256)
+
+    def find_software_by_uuid(self, uuid: Optional[str]) -> Optional[Software]:
+        """Find the software entry with a UUID.
+
+        Args:
+            uuid (Optional[str]): The UUID of the software entry.
+
+        Returns:
+            Optional[Software]: The software entry, or None if there is no match.
+        """
+        return self._sync_software_index().get("UUID", uuid)
+
+    def find_software_by_hash(
+        self,
+        sha256: Optional[str] = None,
+        sha1: Optional[str] = None,
+        md5: Optional[str] = None,
+    ) -> Optional[Software]:
+        """Find the first software entry that has any of the given hashes.
+
+        Args:
+            sha256 (Optional[str]): The sha256 hash to match.
+            sha1 (Optional[str]): The sha1 hash to match.
+            md5 (Optional[str]): The md5 hash to match.
+
+        Returns:
+            Optional[Software]: The software entry added first out of those with a matching hash, or None if
+            there is no match.
+        """
+        index = self._sync_software_index()
+        matches = [
+            sw
+            for sw in (index.get("sha256", sha256), index.get("sha1", sha1), index.get("md5", md5))
+            if sw is not None
+        ]
+        return min(matches, key=index.position) if matches else None
+
+    def find_software_by_file_name(self, file_name: str) -> List[Software]:
+        """Find the software entries with a file name.
+
+        Args:
+            file_name (str): The file name to look for.
+
+        Returns:
+            List[Software]: The matching software entries, in the order they were added.
+        """
+        return self._sync_software_index().find("fileName", file_name)
+
+    def find_software_by_install_path(self, install_path: str) -> List[Software]:
+        """Find the software entries installed to a path.
+
+        Args:
+            install_path (str): The full install path, including the file name.
+
+        Returns:
+            List[Software]: The matching software entries, in the order they were added.
+        """
+        return self._sync_software_index().find("installPath", install_path)
+
+    def find_software_in_install_directory(self, directory: str) -> List[Software]:
+        """Find the software entries installed directly in a directory.
+
+        Args:
+            directory (str): The directory; "/" and "\\" are both treated as path separators.
+
+        Returns:
+            List[Software]: The matching software entries, in the order they were added.
+        """
+        directory = directory.replace("\\", "/").rstrip("/") or "/"
+        return self._sync_software_index().find("installDirectory", directory)
+
+    def find_software_by_container_path(self, prefix: str) -> List[Software]:
+        """Find the software entries with a containerPath starting with a prefix, such as the UUID of the
+        container they were found in.
+
+        Args:
+            prefix (str): The start of the containerPath; usually a container UUID, optionally followed by a path.
+
+        Returns:
+            List[Software]: The matching software entries, in the order they were added.
+        """
+        index = self._sync_software_index()
+        if len(prefix) < 36:
+            # too short to contain a full container UUID, so the index can't be used
+            candidates = self.software
+        else:
+            candidates = index.find("containerUUID", prefix[:36])
+        return [
+            sw
+            for sw in candidates
+            if isinstance(sw.containerPath, list)
+            and any(path.startswith(prefix) for path in sw.containerPath)
+        ]
 
     def add_software(self, sw: Software) -> None:
-        if sw.sha256 is not None:
-            self.software_lookup_by_sha256[sw.sha256] = sw
         self.software.append(sw)
+        self._sync_software_index()
 
         # Add a node for the new software
         if not self.graph.has_node(sw.UUID):
@@ -240,20 +353,11 @@ class SBOM:
             else:
                 # duplicate → merge and redirect edges
                 kept_uuid, old_uuid = existing.merge(e)
+                self.software_index.update(existing)
 
-                # redirect *incoming* edges to the kept node
-                for src, _, key, attrs in list(self.graph.in_edges(old_uuid, keys=True, data=True)):
-                    self.graph.add_edge(src, kept_uuid, key=key, **attrs)
-
-                # redirect *outgoing* edges from the old node
-                for _, dst, key, attrs in list(
-                    self.graph.out_edges(old_uuid, keys=True, data=True)
-                ):
-                    self.graph.add_edge(kept_uuid, dst, key=key, **attrs)
-
-                # remove the old UUID entirely
-                if self.graph.has_node(old_uuid):
-                    self.graph.remove_node(old_uuid)
+                # move incoming and outgoing edges to the kept node, and remove the old UUID entirely;
+                # an entry with the same UUID (e.g. the existing entry itself) has no edges to move
+                self.graph.merge_nodes({old_uuid: kept_uuid})
                 entry_uuid = kept_uuid
 
             # if a parent/package container was provided, attach a "Contains" edge
@@ -307,79 +411,85 @@ class SBOM:
             recordedInstitution=recordedInstitution,
             components=components,
         )
-        self.software_lookup_by_sha256[sw.sha256] = sw
-        self.software.append(sw)
+        self.add_software(sw)
         return sw
 
     def merge(self, sbom_m: SBOM):
+        """Merge another SBOM into this one. Systems and software entries that match existing entries are
+        merged into them, and everything that referred to the merged entries is updated to use the UUIDs
+        of the entries they were merged into.
+
+        Args:
+            sbom_m (SBOM): The SBOM to merge into this one.
+        """
         # merged/old to new UUID map
         uuid_updates: Dict[str, str] = {}
 
         # 1) Merge systems
-        if sbom_m.systems:
-            for system in sbom_m.systems:
-                # check for duplicate UUID/name, merge with existing entry
-                if existing_system := self._find_systems_entry(uuid=system.UUID, name=system.name):
-                    # merge system entries
-                    u1, u2 = existing_system.merge(system)
-                    logger.info(f"MERGE_DUPLICATE_SYS: uuid1={u1}, uuid2={u2}")
+        systems_by_uuid: Dict[str, List[System]] = {}
+        systems_by_name: Dict[str, List[System]] = {}
+        for system in self.systems:
+            systems_by_uuid.setdefault(system.UUID, []).append(system)
+            if system.name:
+                systems_by_name.setdefault(system.name, []).append(system)
+        for system in sbom_m.systems:
+            # check for duplicate UUID/name, merge with existing entry; systems without a UUID are
+            # matched by name alone
+            existing_system: Optional[System]
+            if system.UUID:
+                existing_system = next(
+                    (
+                        s
+                        for s in systems_by_uuid.get(system.UUID, [])
+                        if not system.name or s.name == system.name
+                    ),
+                    None,
+                )
+            elif system.name:
+                existing_system = next(iter(systems_by_name.get(system.name, [])), None)
+            else:
+                existing_system = next(iter(self.systems), None)
+            if existing_system:
+                # merge system entries
+                old_name = existing_system.name
+                u1, u2 = existing_system.merge(system)
+                logger.info(f"MERGE_DUPLICATE_SYS: uuid1={u1}, uuid2={u2}")
+                if u1 != u2:
                     uuid_updates[u2] = u1
-
-                    # Redirect any existing edges from u2 -> u1 in self.graph
-                    if hasattr(self, "graph") and self.graph.has_node(u2):
-                        # for each predecessor of u2, add edge (pred -> u1)
-                        # Redirect incoming edges to the merged node u1
-                        for pred, _, key, attrs in self.graph.in_edges(u2, keys=True, data=True):
-                            self.graph.add_edge(pred, u1, key=key, **attrs)
-
-                        # For each successor of u2, add edge (u1 -> succ)
-                        # Redirect outgoing edges from u2 → u1
-                        for _, succ, key, attrs in self.graph.out_edges(u2, keys=True, data=True):
-                            self.graph.add_edge(u1, succ, key=key, **attrs)
-
-                        # Then drop the old node
-                        self.graph.remove_node(u2)
-
-                else:
-                    self.systems.append(system)
-
-                    # Add the new system node into the graph
-                    if hasattr(self, "graph"):
-                        self.graph.add_node(system.UUID, type="System")
+                # keep the name index up to date if the merge changed the name
+                if existing_system.name != old_name:
+                    if old_name:
+                        systems_by_name[old_name] = [
+                            s for s in systems_by_name[old_name] if s is not existing_system
+                        ]
+                    if existing_system.name:
+                        systems_by_name.setdefault(existing_system.name, []).append(existing_system)
+            else:
+                self.systems.append(system)
+                systems_by_uuid.setdefault(system.UUID, []).append(system)
+                if system.name:
+                    systems_by_name.setdefault(system.name, []).append(system)
+                # Add the new system node into the graph
+                self.graph.add_node(system.UUID, type="System")
 
         # 2) Merge software
-        if sbom_m.software:
-            for sw in sbom_m.software:
-                # NOTE: Do we want to pass in teh UUID here? What if we have two different UUIDs for the same file? Should hashes be required?
-                if existing_sw := self._find_software_entry(
-                    uuid=sw.UUID, sha256=sw.sha256, md5=sw.md5, sha1=sw.sha1
-                ):
-                    u1, u2 = existing_sw.merge(sw)
-                    logger.info(f"MERGE DUPLICATE: uuid1={u1}, uuid2={u2}")
+        for sw in sbom_m.software:
+            # NOTE: Do we want to pass in teh UUID here? What if we have two different UUIDs for the same file? Should hashes be required?
+            if existing_sw := self._find_software_entry(
+                uuid=sw.UUID, sha256=sw.sha256, md5=sw.md5, sha1=sw.sha1
+            ):
+                u1, u2 = existing_sw.merge(sw)
+                self.software_index.update(existing_sw)
+                logger.info(f"MERGE DUPLICATE: uuid1={u1}, uuid2={u2}")
+                if u1 != u2:
                     uuid_updates[u2] = u1
+            else:
+                self.add_software(sw)
 
-                    # Redirect any existing edges from u2 -> u1 in self.graph
-                    if hasattr(self, "graph") and self.graph.has_node(u2):
-                        # Redirect incoming edges to the merged node u1
-                        for pred, _, key, attrs in self.graph.in_edges(u2, keys=True, data=True):
-                            self.graph.add_edge(pred, u1, key=key, **attrs)
-                        # Redirect outgoing edges from u2 → u1
-                        for _, succ, key, attrs in self.graph.out_edges(u2, keys=True, data=True):
-                            self.graph.add_edge(u1, succ, key=key, **attrs)
-
-                        # Then drop the old node
-                        self.graph.remove_node(u2)
-
-                else:
-                    self.software.append(sw)
-
-                    # Add the new software node in the graph
-                    if hasattr(self, "graph"):
-                        self.graph.add_node(sw.UUID, type="Software")
-
-        # 3) Merge relationships from the incoming SBOM’s MultiDiGraph
+        # 3) Redirect any existing edges of merged entries, then add the incoming SBOM’s relationships
+        # with any UUID remaps from merged systems/software applied
+        self.graph.merge_nodes(uuid_updates)
         for src, dst, rel_type in sbom_m.graph.edges(keys=True):
-            # apply any UUID remaps from merged systems/software
             xUUID = uuid_updates.get(src, src)
             yUUID = uuid_updates.get(dst, dst)
 
@@ -390,38 +500,33 @@ class SBOM:
                 # add a new edge, keyed by the relationship
                 self.graph.add_edge(xUUID, yUUID, key=rel_type)
 
-        # 4) Rewrite any containerPath UUIDs
-        for sw in self.software:
-            if sw.containerPath:
-                for idx, path in enumerate(sw.containerPath):
-                    u = path[:36]
-                    # if container path starts with an invalid uuid4, sbom might not be valid
-                    if self.is_valid_uuid4(u):
-                        if u in uuid_updates:
-                            updated_path = path.replace(u, uuid_updates[u], 1)
-                            sw.containerPath[idx] = updated_path
-                # remove duplicates
-                sw.containerPath = [*set(sw.containerPath)]
+        # 4) Rewrite containerPath UUIDs, for the entries in containers that were merged
+        index = self._sync_software_index()
+        for old_uuid, new_uuid in uuid_updates.items():
+            for sw in index.find("containerUUID", old_uuid):
+                # remove duplicates, keeping the order of the paths
+                sw.containerPath = list(
+                    dict.fromkeys(
+                        new_uuid + path[len(old_uuid) :] if path.startswith(old_uuid) else path
+                        for path in sw.containerPath
+                    )
+                )
+                index.update(sw)
 
         logger.info(f"UUID UPDATES: {uuid_updates}")
 
         # 5) Merge analysisData, observations, starRelationships
-        for ad in sbom_m.analysisData:
-            self.analysisData.append(ad)
-        for obs in sbom_m.observations:
-            self.observations.append(obs)
+        self.analysisData.extend(sbom_m.analysisData)
+        self.observations.extend(sbom_m.observations)
         for star_rel in sbom_m.starRelationships:
-            # rewrite UUIDs before doing the search
-            if star_rel.xUUID in uuid_updates:
-                star_rel.xUUID = uuid_updates[star_rel.xUUID]
-            if star_rel.yUUID in uuid_updates:
-                star_rel.yUUID = uuid_updates[star_rel.yUUID]
-            if existing_star_rel := self._find_star_relationship_entry(
-                xUUID=star_rel.xUUID,
-                yUUID=star_rel.yUUID,
+            # rewrite UUIDs before checking for a duplicate
+            star_rel = StarRelationship(
+                xUUID=uuid_updates.get(star_rel.xUUID, star_rel.xUUID),
+                yUUID=uuid_updates.get(star_rel.yUUID, star_rel.yUUID),
                 relationship=star_rel.relationship,
-            ):
-                logger.info(f"DUPLICATE STAR RELATIONSHIP: {existing_star_rel}")
+            )
+            if star_rel in self.starRelationships:
+                logger.info(f"DUPLICATE STAR RELATIONSHIP: {star_rel}")
             else:
                 self.starRelationships.add(star_rel)
 
@@ -467,27 +572,11 @@ class SBOM:
         Returns:
             Optional[Software]: The software entry found that matches the given criteria, otherwise None.
         """
-        for sw in self.software:
-            match = False
-            # If we have hashes to check
-            if sha256 or md5 or sha1:
-                # Check if we have both sides of the comparison, then compare. At least one hash must match
-                if sw.sha256 and sha256:
-                    if sw.sha256 == sha256:
-                        match = True
-                if sw.md5 and md5:
-                    if sw.md5 == md5:
-                        match = True
-                if sw.sha1 and sha1:
-                    if sw.sha1 == sha1:
-                        match = True
-            # If no hashes to check, match by UUID
-            else:
-                if sw.UUID == uuid:
-                    match = True
-            if match:
-                return sw
-        return None
+        # If we have hashes to check, at least one hash must match
+        if sha256 or md5 or sha1:
+            return self.find_software_by_hash(sha256=sha256, sha1=sha1, md5=md5)
+        # If no hashes to check, match by UUID
+        return self.find_software_by_uuid(uuid)
 
     def _find_relationship_entry(
         self,
@@ -499,7 +588,7 @@ class SBOM:
         the matching relationship entry in the provided sbom.
 
         Locate and return the first matching Relationship object
-        found in the MultiDiGraph.
+        found in the relationship graph.
 
         Args:
             xUUID (Optional[str]): The xUUID of the desired relationship entry.
@@ -509,16 +598,12 @@ class SBOM:
         Returns:
             Optional[Relationship]: The relationship entry found that matches the given criteria, otherwise None.
         """
-        for u, v, key in self.graph.edges(keys=True):
-            if xUUID and u != xUUID:
-                continue
-            if yUUID and v != yUUID:
-                continue
-            if relationship and key.upper() != relationship.upper():
-                continue
-            # reconstruct the Relationship object for merge‐logic
-            return Relationship(xUUID=u, yUUID=v, relationship=key)
-        return None
+        edge = self.graph.find_edge(xUUID or None, yUUID or None, relationship or None)
+        if edge is None:
+            return None
+        # reconstruct the Relationship object for merge‐logic
+        u, v, key = edge
+        return Relationship(xUUID=u, yUUID=v, relationship=key)
 
     def _find_star_relationship_entry(
         self,
@@ -570,28 +655,20 @@ class SBOM:
         Return all v such that there is an edge xUUID → v,
         optionally filtered by relationship key.
         """
-        children = []
-        for _, v, key in self.graph.out_edges(xUUID, keys=True):
-            if rel_type is None or key.upper() == rel_type.upper():
-                children.append(v)
-        return children
+        return [v for _, v in self.graph.out_edges(xUUID, rel_type=rel_type)]
 
     def get_parents(self, yUUID: str, rel_type: Optional[str] = None) -> List[str]:
         """
         Return all u such that there is an edge u → yUUID,
         optionally filtered by relationship key.
         """
-        parents = []
-        for u, _, key in self.graph.in_edges(yUUID, keys=True):
-            if rel_type is None or key.upper() == rel_type.upper():
-                parents.append(u)
-        return parents
+        return [u for u, _ in self.graph.in_edges(yUUID, rel_type=rel_type)]
 
     def to_dict_override(self) -> dict:
         """
         Dump all SBOM dataclass fields (via asdict), strip out internal-only
         fields, convert sets→lists, and then build a fresh
-        'relationships' list by iterating every edge key in the MultiDiGraph.
+        'relationships' list by iterating every edge key in the relationship graph.
         """
         # Grab everything as a dict
         data = asdict(self)
@@ -613,8 +690,52 @@ class SBOM:
 
         return data
 
+    def write_json(self, outfile: IO[str], indent: Optional[int] = None) -> None:
+        """
+        Write the same JSON as to_json, one list item at a time, so that a copy of
+        the whole SBOM is never held in memory. Items are converted to JSON directly
+        from the dataclasses, using orjson if it is installed.
+
+        Args:
+            outfile (IO[str]): The file to write the SBOM to.
+            indent (Optional[int]): Indentation passed to json.dumps.
+        """
+        sections: Dict[str, Iterable[Any]] = {}
+        for fld in fields(self):
+            if fld.name in ("graph", "_loaded_relationships"):
+                continue
+            sections[fld.name] = getattr(self, fld.name)
+        sections["relationships"] = (
+            {"xUUID": u, "yUUID": v, "relationship": key}
+            for u, v, key in self.graph.edges(keys=True)
+        )
+
+        encode_item = make_item_encoder(indent, level=2)
+        if indent is None:
+            item_sep, newline, pad1, pad2 = ", ", "", "", ""
+        else:
+            item_sep, newline, pad1, pad2 = ",", "\n", " " * indent, " " * (2 * indent)
+        outfile.write("{")
+        for section_num, (name, items) in enumerate(sections.items()):
+            if section_num:
+                outfile.write(item_sep)
+            outfile.write(f"{newline}{pad1}{json.dumps(name)}: [")
+            empty = True
+            for item in items:
+                if not empty:
+                    outfile.write(item_sep)
+                empty = False
+                outfile.write(f"{newline}{pad2}{encode_item(item)}")
+            outfile.write("]" if empty else f"{newline}{pad1}]")
+        outfile.write(f"{newline}}}")
+
     def to_json_override(self, *args, **kwargs) -> str:
         """
         Serialize via our to_dict_override, passing through any json.dumps kwargs.
+        Without any options other than indent, the faster write_json is used instead.
         """
+        if not args and set(kwargs) <= {"indent"} and not isinstance(kwargs.get("indent"), str):
+            out = io.StringIO()
+            self.write_json(out, indent=kwargs.get("indent"))
+            return out.getvalue()
         return json.dumps(self.to_dict_override(), *args, **kwargs)
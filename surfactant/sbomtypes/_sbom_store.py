@@ -0,0 +1,344 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+import os
+import sqlite3
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ._analysisdata import AnalysisData
+from ._hardware import Hardware
+from ._json_encoder import make_item_encoder
+from ._observation import Observation
+from ._relationship import StarRelationship
+from ._sbom import SBOM
+from ._sbom_loader import dataclass_from_dict
+from ._software import Software
+from ._system import System
+
+STORE_VERSION = 1
+
+# SBOM sections that aren't indexed, stored as one row per item
+_SECTIONS = {
+    "systems": System,
+    "hardware": Hardware,
+    "analysisData": AnalysisData,
+    "observations": Observation,
+    "starRelationships": StarRelationship,
+}
+
+# Software entry fields with a row per value in the software_paths table, so they can be searched
+PATH_FIELDS = ("fileName", "installPath", "containerPath")
+
+# Conditions for the ways of matching paths; the prefix range ends just past the largest code point
+# that can follow it, so that it can be looked up using the index on (field, value)
+PATH_MATCHES = {
+    "exact": "value = ?",
+    "prefix": "value >= ? AND value < ? || char(1114111)",
+    "contains": "instr(value, ?) > 0",
+}
+
+_SOFTWARE_FIELDS = tuple(fld.name for fld in fields(Software) if fld.name != "metadata")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS software (
+    id INTEGER PRIMARY KEY,
+    uuid TEXT NOT NULL UNIQUE,
+    sha256 TEXT,
+    sha1 TEXT,
+    md5 TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS software_sha256 ON software (sha256);
+CREATE INDEX IF NOT EXISTS software_sha1 ON software (sha1);
+CREATE INDEX IF NOT EXISTS software_md5 ON software (md5);
+CREATE TABLE IF NOT EXISTS software_paths (
+    software_id INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS software_paths_value ON software_paths (field, value);
+CREATE INDEX IF NOT EXISTS software_paths_software ON software_paths (software_id);
+CREATE TABLE IF NOT EXISTS metadata (software_id INTEGER PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS relationships (
+    xUUID TEXT NOT NULL,
+    yUUID TEXT NOT NULL,
+    relationship TEXT NOT NULL,
+    UNIQUE (xUUID, yUUID, relationship)
+);
+CREATE INDEX IF NOT EXISTS relationships_y ON relationships (yUUID);
+CREATE TABLE IF NOT EXISTS sections (section TEXT NOT NULL, data TEXT NOT NULL);
+"""
+
+
+class SBOMStore:
+    """An SBOM kept in a SQLite database, so that it can be loaded and saved quickly, and so that software
+    entries and relationships can be looked up, added, or updated without reading or rewriting the rest
+    of the SBOM.
+
+    Software entries are stored with their hashes and UUID in indexed columns, their file names and paths
+    in a separate indexed table, and their metadata in a table of its own that is only read for entries
+    that are loaded. Relationships are stored as rows indexed by both endpoints. Everything else (systems,
+    hardware, analysis data, observations, and star relationships) is stored as JSON rows.
+
+    Changes are committed when the store is closed (or used as a context manager and the block exits
+    without an error), or by calling `commit`.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        """Open an SBOM store, creating it if the file doesn't exist or is empty.
+
+        Args:
+            path (Union[str, os.PathLike]): Location of the store.
+
+        Raises:
+            ValueError: If the file isn't an SBOM store from a supported version of Surfactant.
+        """
+        self.path = os.fspath(path)
+        self._db = sqlite3.connect(self.path)
+        self._encode = make_item_encoder()
+        try:
+            tables = {row[0] for row in self._db.execute("SELECT name FROM sqlite_master")}
+        except sqlite3.DatabaseError as e:
+            self._db.close()
+            raise ValueError(f"{self.path} is not an SBOM store") from e
+        if tables and "info" not in tables:
+            self._db.close()
+            raise ValueError(f"{self.path} is not an SBOM store")
+        self._db.executescript(_SCHEMA)
+        version = self._db.execute("SELECT value FROM info WHERE key = 'version'").fetchone()
+        if version is None:
+            self._db.execute("INSERT INTO info VALUES ('version', ?)", (str(STORE_VERSION),))
+        elif version[0] != str(STORE_VERSION):
+            self._db.close()
+            raise ValueError(
+                f"{self.path} is not an SBOM store from a supported version of Surfactant"
+            )
+
+    def __enter__(self) -> "SBOMStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        self._db.close()
+
+    def commit(self) -> None:
+        """Write any changes to the store to disk."""
+        self._db.commit()
+
+    def close(self) -> None:
+        """Commit any changes and close the store."""
+        self.commit()
+        self._db.close()
+
+    def clear(self) -> None:
+        """Remove everything from the store."""
+        for table in ["software", "software_paths", "metadata", "relationships", "sections"]:
+            self._db.execute(f"DELETE FROM {table}")
+
+    def save(self, sbom: SBOM) -> None:
+        """Replace the contents of the store with an SBOM.
+
+        Args:
+            sbom (SBOM): The SBOM to save.
+        """
+        self.clear()
+        for section in _SECTIONS:
+            self._db.executemany(
+                "INSERT INTO sections (section, data) VALUES (?, ?)",
+                ((section, self._encode(item)) for item in getattr(sbom, section)),
+            )
+        for sw in sbom.software:
+            self.add_software(sw)
+        self._db.executemany(
+            "INSERT OR IGNORE INTO relationships (xUUID, yUUID, relationship) VALUES (?, ?, ?)",
+            sbom.graph.edges(keys=True),
+        )
+
+    def load(self) -> SBOM:
+        """Load the whole SBOM from the store.
+
+        Returns:
+            SBOM: The SBOM.
+        """
+        sections: Dict[str, Any] = {section: [] for section in _SECTIONS}
+        for section, data in self._db.execute("SELECT section, data FROM sections ORDER BY rowid"):
+            sections[section].append(dataclass_from_dict(_SECTIONS[section], json.loads(data)))
+        sections["starRelationships"] = set(sections["starRelationships"])
+        sbom = SBOM(software=list(self.iter_software()), **sections)
+        sbom.graph.add_edges_from(self.iter_relationships())
+        return sbom
+
+    @property
+    def software_count(self) -> int:
+        """The number of software entries in the store."""
+        return self._db.execute("SELECT COUNT(*) FROM software").fetchone()[0]
+
+    def add_software(self, sw: Software) -> None:
+        """Add a software entry to the store, replacing any entry with the same UUID.
+
+        Args:
+            sw (Software): The software entry.
+        """
+        data = self._encode({name: getattr(sw, name) for name in _SOFTWARE_FIELDS})
+        row = self._db.execute("SELECT id FROM software WHERE uuid = ?", (sw.UUID,)).fetchone()
+        if row is None:
+            cursor = self._db.execute(
+                "INSERT INTO software (uuid, sha256, sha1, md5, data) VALUES (?, ?, ?, ?, ?)",
+                (sw.UUID, sw.sha256, sw.sha1, sw.md5, data),
+            )
+            software_id = cursor.lastrowid
+        else:
+            software_id = row[0]
+            self._db.execute(
+                "UPDATE software SET sha256 = ?, sha1 = ?, md5 = ?, data = ? WHERE id = ?",
+                (sw.sha256, sw.sha1, sw.md5, data, software_id),
+            )
+            self._db.execute("DELETE FROM software_paths WHERE software_id = ?", (software_id,))
+            self._db.execute("DELETE FROM metadata WHERE software_id = ?", (software_id,))
+        self._db.executemany(
+            "INSERT INTO software_paths (software_id, field, value) VALUES (?, ?, ?)",
+            (
+                (software_id, name, value)
+                for name in PATH_FIELDS
+                for value in getattr(sw, name) or []
+                if isinstance(value, str)
+            ),
+        )
+        if sw.metadata is not None:
+            self._db.execute(
+                "INSERT INTO metadata (software_id, data) VALUES (?, ?)",
+                (software_id, self._encode(list(sw.metadata))),
+            )
+
+    def _load_software(self, rows: Iterable[Tuple[str, Optional[str]]]) -> Iterator[Software]:
+        for data, metadata in rows:
+            sw = dataclass_from_dict(Software, json.loads(data))
+            if metadata is not None:
+                sw.metadata = json.loads(metadata)
+            yield sw
+
+    def _select_software(self, where: str = "", params: Tuple[Any, ...] = ()) -> List[Software]:
+        rows = self._db.execute(
+            "SELECT software.data, metadata.data FROM software"
+            " LEFT JOIN metadata ON metadata.software_id = software.id"
+            f" {where} ORDER BY software.id",
+            params,
+        )
+        return list(self._load_software(rows))
+
+    def iter_software(self) -> Iterator[Software]:
+        """Iterate over the software entries in the store, in the order they were added, without loading
+        them all at once.
+
+        Yields:
+            Software: The software entries.
+        """
+        cursor = self._db.execute(
+            "SELECT software.data, metadata.data FROM software"
+            " LEFT JOIN metadata ON metadata.software_id = software.id ORDER BY software.id"
+        )
+        while rows := cursor.fetchmany(1000):
+            yield from self._load_software(rows)
+
+    def get_software(self, uuid: str) -> Optional[Software]:
+        """Load the software entry with a UUID.
+
+        Args:
+            uuid (str): The UUID.
+
+        Returns:
+            Optional[Software]: The software entry, or None if there isn't one with the UUID.
+        """
+        found = self._select_software("WHERE software.uuid = ?", (uuid,))
+        return found[0] if found else None
+
+    def find_software_by_hash(
+        self, sha256: Optional[str] = None, sha1: Optional[str] = None, md5: Optional[str] = None
+    ) -> List[Software]:
+        """Load the software entries with any of the given hashes.
+
+        Args:
+            sha256 (Optional[str]): The SHA256 hash to look for.
+            sha1 (Optional[str]): The SHA1 hash to look for.
+            md5 (Optional[str]): The MD5 hash to look for.
+
+        Returns:
+            List[Software]: The matching software entries, in the order they were added.
+        """
+        hashes = {"sha256": sha256, "sha1": sha1, "md5": md5}
+        conditions = [f"software.{name} = ?" for name, value in hashes.items() if value]
+        if not conditions:
+            return []
+        params = tuple(value for value in hashes.values() if value)
+        return self._select_software(f"WHERE {' OR '.join(conditions)}", params)
+
+    def find_software_by_path(
+        self, field_name: str, text: str, match: str = "exact"
+    ) -> List[Software]:
+        """Load the software entries with a file name, install path, or container path matching some text.
+        Only the (much smaller) table of paths is searched; just the matching entries are loaded.
+
+        Exact and prefix matches are looked up using the index on paths. Substring matches can't use
+        it and scan every path in the field, so they're only done when asked for explicitly.
+
+        Args:
+            field_name (str): The field to search, one of `PATH_FIELDS`.
+            text (str): The text to look for.
+            match (str): How to match the text, one of `PATH_MATCHES`: "exact" for paths equal to it,
+                "prefix" for paths starting with it, or "contains" for paths containing it anywhere.
+
+        Returns:
+            List[Software]: The matching software entries, in the order they were added.
+        """
+        if field_name not in PATH_FIELDS:
+            raise ValueError(f"{field_name} is not a field that can be searched")
+        if match not in PATH_MATCHES:
+            raise ValueError(f"{match} is not a way paths can be matched")
+        return self._select_software(
+            "WHERE software.id IN"
+            f" (SELECT software_id FROM software_paths WHERE field = ? AND {PATH_MATCHES[match]})",
+            (field_name, text) if match != "prefix" else (field_name, text, text),
+        )
+
+    def add_relationship(self, xUUID: str, yUUID: str, relationship: str) -> None:
+        """Add a relationship to the store, if it isn't already there.
+
+        Args:
+            xUUID (str): UUID of the entry the relationship is from.
+            yUUID (str): UUID of the entry the relationship is to.
+            relationship (str): The type of relationship.
+        """
+        self._db.execute(
+            "INSERT OR IGNORE INTO relationships (xUUID, yUUID, relationship) VALUES (?, ?, ?)",
+            (xUUID, yUUID, relationship),
+        )
+
+    def iter_relationships(self) -> Iterator[Tuple[str, str, str]]:
+        """Iterate over the relationships in the store, in the order they were added.
+
+        Yields:
+            Tuple[str, str, str]: The relationships, as (xUUID, yUUID, relationship).
+        """
+        yield from self._db.execute(
+            "SELECT xUUID, yUUID, relationship FROM relationships ORDER BY rowid"
+        )
+
+    def get_relationships(self, uuid: str) -> List[Tuple[str, str, str]]:
+        """Get the relationships to or from an entry.
+
+        Args:
+            uuid (str): UUID of the entry.
+
+        Returns:
+            List[Tuple[str, str, str]]: The relationships, as (xUUID, yUUID, relationship).
+        """
+        return self._db.execute(
+            "SELECT xUUID, yUUID, relationship FROM relationships WHERE xUUID = ?"
+            " UNION SELECT xUUID, yUUID, relationship FROM relationships WHERE yUUID = ?",
+            (uuid, uuid),
+        ).fetchall()
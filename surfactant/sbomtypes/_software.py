@@ -5,17 +5,20 @@
 
 from __future__ import annotations
 
+import functools
+import os
 import pathlib
 import platform
+import sys
 import time
 import uuid
 from collections.abc import Iterable
 from dataclasses import dataclass, field, fields
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from dataclasses_json import dataclass_json
 
-from surfactant.fileinfo import calc_file_hashes, get_file_info
+from surfactant.fileinfo import FileContent, calc_file_hashes, get_file_info
 
 from ._file import File
 from ._provenance import SoftwareComponentProvenance, SoftwareProvenance
@@ -23,8 +26,64 @@ from ._provenance import SoftwareComponentProvenance, SoftwareProvenance
 # pylint: disable=too-many-instance-attributes
 
 
+@functools.lru_cache(maxsize=None)
+def get_collection_platform() -> str:
+    """Get the description of the platform used to collect information on files. This is looked up once
+    and reused, since `platform.platform()` is slow and the result doesn't change while running."""
+    return sys.intern(platform.platform())
+
+
+# Slotted dataclasses (Python 3.10+) have no per-instance __dict__, which makes each of the (potentially
+# millions of) software entries in an SBOM much smaller
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class _SharedDict(dict):
+    """A read-only dict shared by many software entries. Since it is a dict, it is output to JSON the
+    same way as any other metadata object."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            f"{type(self).__name__} is shared between software entries and can't be changed"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> _SharedDict:
+        return self
+
+    def __deepcopy__(self, memo) -> _SharedDict:
+        return self
+
+
+class _CollectionInfo(_SharedDict):
+    def __reduce__(self):
+        # unpickle to the shared copy (e.g. when sent back from a worker process), instead of a new one
+        return (get_collection_info, (self["fileInfo"]["mode"], self["fileInfo"]["hidden"]))
+
+
+@functools.lru_cache(maxsize=None)
+def get_collection_info(mode: str, hidden: bool) -> Dict[str, Any]:
+    """Get the metadata object describing what collected the information for a file, along with basic
+    info on the file. Files with the same mode and hidden status share one read-only copy of it.
+
+    Args:
+        mode (str): The file mode, as returned by `get_file_info`.
+        hidden (bool): Whether the file is hidden.
+
+    Returns:
+        Dict[str, Any]: The collection info metadata object.
+    """
+    return _CollectionInfo(
+        collectedBy="Surfactant",
+        collectionPlatform=get_collection_platform(),
+        fileInfo=_SharedDict(mode=mode, hidden=hidden),
+    )
+
+
 @dataclass_json
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SoftwareComponent:
     name: str
     captureTime: Optional[int] = None
@@ -39,7 +98,7 @@ class SoftwareComponent:
 
 
 @dataclass_json
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Software:
     UUID: str = field(default_factory=lambda: str(uuid.uuid4()))
     name: Optional[str] = None
@@ -69,25 +128,28 @@ class Software:
             setattr(self, field_name, value)
 
     @staticmethod
-    def create_software_from_file(filepath) -> Software:
-        file_hashes = calc_file_hashes(filepath)
-        stat_file_info = get_file_info(filepath)
+    def create_software_from_file(
+        filepath,
+        file_content: Optional[FileContent] = None,
+        file_hashes: Optional[Dict[str, str]] = None,
+        stat_result: Optional[os.stat_result] = None,
+    ) -> Software:
+        # hashes can be given for files known to be unchanged since they were last hashed
+        if file_hashes is None:
+            file_hashes = calc_file_hashes(filepath, file_content=file_content)
+        stat_file_info = get_file_info(filepath, stat_result=stat_result)
 
         # add basic file info, and information on what collected the information listed for the file to aid later processing
-        collection_info = {
-            "collectedBy": "Surfactant",
-            "collectionPlatform": platform.platform(),
-            "fileInfo": {
-                "mode": stat_file_info["filemode"],
-                "hidden": stat_file_info["filehidden"],
-            },
-        }
+        collection_info = get_collection_info(
+            stat_file_info["filemode"], stat_file_info["filehidden"]
+        )
 
         sw = Software(
-            sha1=file_hashes["sha1"],
+            sha1=file_hashes.get("sha1"),
             sha256=file_hashes["sha256"],
-            md5=file_hashes["md5"],
-            fileName=[pathlib.Path(filepath).name],
+            md5=file_hashes.get("md5"),
+            # names like "__init__.py" or "LICENSE" repeat across many files, so share one copy of each
+            fileName=[sys.intern(pathlib.Path(filepath).name)],
             installPath=[],
             containerPath=[],
             size=stat_file_info["size"],
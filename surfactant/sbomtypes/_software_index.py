@@ -0,0 +1,146 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import posixpath
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ._software import Software
+
+# Fields that identify a single software entry; the first entry added with a value is the one found
+UNIQUE_KEYS = ("UUID", "sha256", "sha1", "md5")
+
+# Length of the UUID at the start of a containerPath
+_UUID_LENGTH = 36
+
+
+def _container_uuid(container_path: str) -> str:
+    return container_path[:_UUID_LENGTH]
+
+
+def _install_directory(install_path: str) -> str:
+    # install paths may be Windows paths, so treat either slash as a separator
+    directory = posixpath.dirname(install_path.replace("\\", "/"))
+    return directory.rstrip("/") or "/"
+
+
+def _values(sw: Software, field_name: str) -> Iterable[str]:
+    values = getattr(sw, field_name)
+    return values if isinstance(values, list) else []
+
+
+# How to get the keys each multi-valued index has for a software entry
+_MULTI_KEYS: Dict[str, Callable[[Software], Iterable[str]]] = {
+    "fileName": lambda sw: _values(sw, "fileName"),
+    "installPath": lambda sw: _values(sw, "installPath"),
+    "containerUUID": lambda sw: (_container_uuid(p) for p in _values(sw, "containerPath")),
+    "installDirectory": lambda sw: (_install_directory(p) for p in _values(sw, "installPath")),
+}
+
+
+class SoftwareIndex:
+    """Lookup tables for the software entries in an SBOM, by UUID, hash, file name, install path,
+    install directory, and the UUID of the container the entry is in.
+
+    Entries are indexed when they are added, and should be indexed again with `update` after their
+    fields are changed; lookups check that the entries found still match, so values that were
+    removed from an entry are never returned. Results are in the order entries were added.
+
+    Entries are tracked by identity, so copies (and unpickled indexes) are rebuilt from the entries.
+    """
+
+    def __init__(self, software: Optional[Iterable[Software]] = None):
+        self._entries: List[Software] = []
+        self._unique: Dict[str, Dict[str, Software]] = {key: {} for key in UNIQUE_KEYS}
+        # each key maps to a dict keyed by id(), used as an ordered set of software entries
+        self._multi: Dict[str, Dict[str, Dict[int, Software]]] = {key: {} for key in _MULTI_KEYS}
+        self._order: Dict[int, int] = {}
+        for sw in software or []:
+            self.add(sw)
+
+    def __reduce__(self):
+        return (SoftwareIndex, (self._entries,))
+
+    @property
+    def count(self) -> int:
+        """The number of entries that have been added."""
+        return len(self._entries)
+
+    def add(self, sw: Software) -> None:
+        """Index a software entry that was added to the SBOM.
+
+        Args:
+            sw (Software): The software entry.
+        """
+        if id(sw) not in self._order:
+            self._order[id(sw)] = len(self._entries)
+            self._entries.append(sw)
+        self.update(sw)
+
+    def update(self, sw: Software) -> None:
+        """Index any new values in the fields of a software entry, after it was changed (e.g. by merging
+        another entry into it).
+
+        Args:
+            sw (Software): The software entry.
+        """
+        for key in UNIQUE_KEYS:
+            value = getattr(sw, key)
+            if value:
+                owner = self._unique[key].get(value)
+                # the entry found keeps a value until it no longer has it, or an earlier entry gains it
+                if (
+                    owner is None
+                    or getattr(owner, key) != value
+                    or self.position(sw) < self.position(owner)
+                ):
+                    self._unique[key][value] = sw
+        for key, get_keys in _MULTI_KEYS.items():
+            index = self._multi[key]
+            for value in get_keys(sw):
+                index.setdefault(value, {})[id(sw)] = sw
+
+    def position(self, sw: Software) -> int:
+        """Get the order a software entry was added in, starting from 0."""
+        return self._order[id(sw)]
+
+    def get(self, key: str, value: Optional[str]) -> Optional[Software]:
+        """Find the first software entry added with a UUID or hash.
+
+        Args:
+            key (str): The field to look up, one of `UNIQUE_KEYS`.
+            value (Optional[str]): The value to look for.
+
+        Returns:
+            Optional[Software]: The software entry, or None if there is no match.
+        """
+        if not value:
+            return None
+        sw = self._unique[key].get(value)
+        if sw is not None and getattr(sw, key) != value:
+            # the entry found was changed after it was indexed; another entry may have the value now
+            sw = next((entry for entry in self._entries if getattr(entry, key) == value), None)
+            if sw is None:
+                del self._unique[key][value]
+            else:
+                self._unique[key][value] = sw
+        return sw
+
+    def find(self, key: str, value: str) -> List[Software]:
+        """Find the software entries with a file name, install path, install directory, or container UUID.
+
+        Args:
+            key (str): The kind of value to look up: "fileName", "installPath", "installDirectory", or
+                "containerUUID".
+            value (str): The value to look for.
+
+        Returns:
+            List[Software]: The matching software entries, in the order they were added.
+        """
+        get_keys = _MULTI_KEYS[key]
+        matches = [sw for sw in self._multi[key].get(value, {}).values() if value in get_keys(sw)]
+        # entries can gain values after later entries were added, so restore the order they were added in
+        matches.sort(key=self.position)
+        return matches
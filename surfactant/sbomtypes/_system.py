@@ -7,7 +7,7 @@ from __future__ import annotations
 import uuid
 from collections.abc import Iterable
 from dataclasses import dataclass, field, fields
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from ._provenance import SystemProvenance
 
@@ -25,6 +25,10 @@ class System:
     description: Optional[str] = None
     provenance: List[SystemProvenance] = field(default_factory=list)
 
+    def _update_field(self, field_name: str, value: Any):
+        if value not in ["", " ", None]:
+            setattr(self, field_name, value)
+
     def merge(self, sy: System):
         if sy and self != sy:
             # leave UUID and captureTime the same
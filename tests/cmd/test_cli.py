@@ -9,7 +9,7 @@ import pytest
 
 from surfactant.cmd.cli import cli_add, cli_find
 from surfactant.cmd.cli_commands import Cli
-from surfactant.sbomtypes import SBOM
+from surfactant.sbomtypes import SBOM, SBOMStore
 
 
 @pytest.fixture(name="test_sbom")
@@ -188,9 +188,31 @@ def test_add_installpath(test_sbom):
             assert installPathPrefix in sw.installPath
 
 
-def test_cli_base_serialization(test_sbom):
-    serialized = Cli.serialize(test_sbom)
-    deserialized = Cli.deserialize(serialized)
+def test_cli_base_serialization(test_sbom, tmp_path):
+    Cli.save_sbom(test_sbom, tmp_path / "sbom_cli")
+    deserialized = Cli.load_sbom(tmp_path / "sbom_cli")
 
     # compare by graph contents and other fields, ignore object identity
     assert _compare_sboms(test_sbom, deserialized)
+
+
+def test_find_and_add_in_sbom_store(test_sbom, tmp_path):
+    store_path = tmp_path / "sbom.db"
+    with SBOMStore(store_path) as store:
+        store.save(test_sbom)
+    sw = test_sbom.software[1]
+    with SBOMStore(store_path) as store:
+        found = cli_find().execute_store(store, sha256=sw.sha256)
+        assert [found_sw.UUID for found_sw in found.software] == [sw.UUID]
+        container_path = sw.containerPath[0]
+        found = cli_find().execute_store(store, containerpath=container_path)
+        assert sw.UUID in [found_sw.UUID for found_sw in found.software]
+
+        cli_add().execute_store(store, installpath=(container_path, "/installed"))
+        cli_add().execute_store(
+            store, relationship={"xUUID": sw.UUID, "yUUID": "other", "relationship": "Uses"}
+        )
+    with SBOMStore(store_path) as store:
+        assert store.get_software(sw.UUID).installPath == [*sw.installPath, "/installed"]
+        assert (sw.UUID, "other", "Uses") in store.get_relationships(sw.UUID)
+        assert store.software_count == len(test_sbom.software)
@@ -0,0 +1,111 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import os
+import sys
+
+import pytest
+
+from surfactant import ContextEntry
+from surfactant.cmd.internal.file_walker import FileFilter, walk_dir
+
+
+@pytest.fixture(name="tree")
+def fixture_tree(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "c").mkdir()
+    (tmp_path / "top.txt").write_text("top")
+    (tmp_path / "a" / "one.bin").write_bytes(b"1")
+    (tmp_path / "a" / "b" / "two.BIN").write_bytes(b"22")
+    (tmp_path / "c" / "three.so").write_bytes(b"333")
+    if sys.platform != "win32":
+        (tmp_path / "link_to_a").symlink_to(tmp_path / "a")
+        (tmp_path / "c" / "link_to_one").symlink_to(tmp_path / "a" / "one.bin")
+        (tmp_path / "c" / "dead_link").symlink_to(tmp_path / "missing")
+    return tmp_path
+
+
+def test_walk_dir_matches_os_walk(tree):
+    walked = [
+        (cdir, sorted(d.name for d in dirs), sorted(f.name for f in files))
+        for cdir, dirs, files in walk_dir(tree)
+    ]
+    expected = [(cdir, sorted(dirs), sorted(files)) for cdir, dirs, files in os.walk(tree)]
+    assert sorted(walked) == sorted(expected)
+
+
+def test_walk_dir_caches_stat(tree):
+    sizes = {}
+    for _, _, files in walk_dir(tree):
+        for file_entry in files:
+            if file_entry.is_file() and not file_entry.is_symlink():
+                sizes[file_entry.name] = file_entry.stat().st_size
+    assert sizes == {"top.txt": 3, "one.bin": 1, "two.BIN": 2, "three.so": 3}
+
+
+def test_walk_dir_prunes_removed_dirs(tree):
+    walked = []
+    for cdir, dirs, _ in walk_dir(tree):
+        walked.append(os.path.relpath(cdir, tree))
+        dirs[:] = [d for d in dirs if d.name != "a"]
+    assert sorted(walked) == [".", "c"]
+
+
+def test_file_filter_from_context():
+    file_filter = FileFilter.from_context(
+        ContextEntry(extractPaths=[], includeFileExts=[".BIN"], excludeFileExts=[".so"])
+    )
+    assert file_filter.is_included("a/b/two.bin")
+    assert not file_filter.is_included("top.txt")
+    assert file_filter.is_excluded("c/three.SO")
+    assert not FileFilter().is_excluded("c/three.so")
+
+
+def _walk_files(top, **context_options):
+    file_filter = FileFilter.from_context(ContextEntry(extractPaths=[str(top)], **context_options))
+    walked_dirs = []
+    walked_files = []
+    for cdir, _, files in walk_dir(top, file_filter):
+        rel_dir = os.path.relpath(cdir, top).replace(os.sep, "/")
+        walked_dirs.append(rel_dir)
+        walked_files.extend(
+            f.name if rel_dir == "." else f"{rel_dir}/{f.name}" for f in files if not f.is_symlink()
+        )
+    return sorted(walked_dirs), sorted(walked_files)
+
+
+def test_walk_dir_exclude_paths(tree):
+    # directories matching a rule aren't walked into
+    assert _walk_files(tree, excludePaths=["b", "*.so"]) == (
+        [".", "a", "c"],
+        ["a/one.bin", "top.txt"],
+    )
+    assert _walk_files(tree, excludePaths=["a/b", r"re:\.txt$"]) == (
+        [".", "a", "c"],
+        ["a/one.bin", "c/three.so"],
+    )
+
+
+def test_walk_dir_include_paths(tree):
+    # directories that can't contain a match are skipped, and everything in a matching directory is included
+    assert _walk_files(tree, includePaths=["a/b"]) == ([".", "a", "a/b"], ["a/b/two.BIN"])
+    assert _walk_files(tree, includePaths=["*.so", "top.txt"]) == (
+        [".", "a", "a/b", "c"],
+        ["c/three.so", "top.txt"],
+    )
+
+
+def test_walk_dir_depth_size_and_hidden(tree):
+    (tree / ".hidden").mkdir()
+    (tree / ".hidden" / "file").write_text("hidden")
+    (tree / ".dotfile").write_text("hidden")
+    assert _walk_files(tree, maxDepth=1, skipHidden=True) == (
+        [".", "a", "c"],
+        ["a/one.bin", "c/three.so", "top.txt"],
+    )
+    assert _walk_files(tree, maxDepth=0) == (["."], [".dotfile", "top.txt"])
+    assert _walk_files(tree, maxFileSize=2) == (
+        [".", ".hidden", "a", "a/b", "c"],
+        ["a/b/two.BIN", "a/one.bin"],
+    )
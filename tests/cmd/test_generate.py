@@ -1,7 +1,13 @@
 import json
+import os
+import shutil
 from pathlib import Path
 
-from surfactant.cmd.generate import sbom
+import click
+import pytest
+
+from surfactant import ContextEntry
+from surfactant.cmd.generate import FileTask, sbom, schedule_file_tasks
 from tests.cmd import common
 
 testing_data = Path(Path(__file__).parent.parent, "data")
@@ -90,3 +96,313 @@ def test_generate_with_skip_install_path(tmp_path):
         assert software["installPath"] == []
 
     assert len(generated_sbom["relationships"]) == 0
+
+
+def _normalize_sbom(sbom_path: str) -> dict:
+    """Replace the random UUIDs and capture times in a generated SBOM with stable values."""
+    with open(sbom_path) as f:
+        generated_sbom = json.load(f)
+    uuid_names = {}
+    for software in generated_sbom["software"]:
+        uuid_names[software["UUID"]] = software["sha256"]
+        software["UUID"] = software["sha256"]
+        software["captureTime"] = None
+    generated_sbom["relationships"] = [
+        {
+            "xUUID": uuid_names.get(rel["xUUID"], rel["xUUID"]),
+            "yUUID": uuid_names.get(rel["yUUID"], rel["yUUID"]),
+            "relationship": rel["relationship"],
+        }
+        for rel in generated_sbom["relationships"]
+    ]
+    return generated_sbom
+
+
+def test_generate_parallel_matches_serial(tmp_path):
+    extract_path = Path(testing_data, "Windows_dll_test_no1").as_posix()
+    serial_path = str(Path(tmp_path, "serial.json"))
+    parallel_path = str(Path(tmp_path, "parallel.json"))
+
+    # pylint: disable=no-value-for-parameter
+    sbom([extract_path, serial_path], standalone_mode=False)
+    sbom(["--jobs", "2", extract_path, parallel_path], standalone_mode=False)
+    # pylint: enable
+
+    common.test_generate_result_no_install_prefix(parallel_path, extract_path)
+    assert _normalize_sbom(serial_path) == _normalize_sbom(parallel_path)
+
+
+def test_generate_streaming_matches_default(tmp_path):
+    extract_path = Path(testing_data, "Windows_dll_test_no1").as_posix()
+    default_path = str(Path(tmp_path, "default.json"))
+    streaming_path = str(Path(tmp_path, "streaming.json"))
+
+    # pylint: disable=no-value-for-parameter
+    sbom([extract_path, default_path], standalone_mode=False)
+    sbom(["--streaming", extract_path, streaming_path], standalone_mode=False)
+    # pylint: enable
+
+    common.test_generate_result_no_install_prefix(streaming_path, extract_path)
+    assert _normalize_sbom(default_path) == _normalize_sbom(streaming_path)
+
+
+def test_generate_hashes_hardlinks_and_symlink_targets_once(tmp_path, monkeypatch):
+    extract_path = Path(tmp_path, "specimen")
+    Path(extract_path, "lib").mkdir(parents=True)
+    target = Path(extract_path, "lib", "libtestlib.so")
+    shutil.copy(Path(testing_data, "ELF_shared_obj_test_no1", "lib", "libtestlib.so"), target)
+    os.link(target, Path(extract_path, "lib", "libtestlib-hardlink.so"))
+    os.symlink("libtestlib.so", Path(extract_path, "lib", "libtestlib-symlink.so"))
+    output_path = str(Path(tmp_path, "out.json"))
+
+    # pylint: disable=import-outside-toplevel
+    from surfactant.cmd.internal import hash_cache
+    from surfactant.sbomtypes import _software
+
+    # pylint: enable=import-outside-toplevel
+
+    hashed = []
+
+    def count_hashing(func):
+        def wrapper(filepath, *args, **kwargs):
+            hashed.append(filepath)
+            return func(filepath, *args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(_software, "calc_file_hashes", count_hashing(_software.calc_file_hashes))
+    monkeypatch.setattr(hash_cache, "FileContent", count_hashing(hash_cache.FileContent))
+    # pylint: disable-next=no-value-for-parameter
+    sbom(["--no_cache", extract_path.as_posix(), output_path], standalone_mode=False)
+
+    # the symlink target is hashed when the symlink is found, and the hardlink reuses its hashes
+    assert len(hashed) == 1
+    generated_sbom = _normalize_sbom(output_path)
+    assert len(generated_sbom["software"]) == 1
+    assert sorted(generated_sbom["software"][0]["fileName"]) == [
+        "libtestlib-hardlink.so",
+        "libtestlib-symlink.so",
+        "libtestlib.so",
+    ]
+
+
+def test_generate_low_memory_matches_default(tmp_path, monkeypatch):
+    extract_path = Path(testing_data, "ELF_shared_obj_test_no1").as_posix()
+    default_path = str(Path(tmp_path, "default.json"))
+    low_memory_path = str(Path(tmp_path, "low_memory.json"))
+
+    # pylint: disable-next=import-outside-toplevel
+    from surfactant.cmd import generate
+
+    # pylint: disable=no-value-for-parameter
+    sbom([extract_path, default_path], standalone_mode=False)
+
+    # metadata is moved to the database after each directory, before the extract path is done
+    monkeypatch.setattr(generate, "CHECKPOINT_BATCH_SIZE", 1)
+    spooled = []
+
+    class RecordingStore(generate.MetadataStore):
+        def spool(self, software_entries):
+            software_entries = list(software_entries)
+            spooled.append(len(software_entries))
+            super().spool(software_entries)
+
+    monkeypatch.setattr(generate, "MetadataStore", RecordingStore)
+    sbom(["--low_memory", extract_path, low_memory_path], standalone_mode=False)
+    # pylint: enable
+
+    assert spooled[:2] == [1, 1]
+    assert _normalize_sbom(default_path) == _normalize_sbom(low_memory_path)
+
+
+def test_generate_skips_extractors_for_duplicate_files(tmp_path, monkeypatch):
+    extract_path = Path(tmp_path, "specimen")
+    for copy_dir in ["a", "b", "c"]:
+        Path(extract_path, copy_dir).mkdir(parents=True)
+        shutil.copy(
+            Path(testing_data, "ELF_shared_obj_test_no1", "lib", "libtestlib.so"),
+            Path(extract_path, copy_dir),
+        )
+        shutil.copy(
+            Path(testing_data, "Windows_dll_test_no1", "testlib.dll"), Path(extract_path, copy_dir)
+        )
+    serial_path = str(Path(tmp_path, "serial.json"))
+    parallel_path = str(Path(tmp_path, "parallel.json"))
+
+    # pylint: disable-next=import-outside-toplevel
+    from surfactant.infoextractors import elf_file, pe_file
+
+    calls = {"elf": 0, "pe": 0}
+
+    def count_calls(name, func):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(elf_file, "extract_elf_info", count_calls("elf", elf_file.extract_elf_info))
+    monkeypatch.setattr(pe_file, "extract_pe_info", count_calls("pe", pe_file.extract_pe_info))
+    # pylint: disable=no-value-for-parameter
+    sbom(["--no_cache", extract_path.as_posix(), serial_path], standalone_mode=False)
+    sbom(
+        ["--no_cache", "--jobs", "2", extract_path.as_posix(), parallel_path], standalone_mode=False
+    )
+    # pylint: enable
+
+    # the ELF extractor only runs on the first copy, but the PE extractor looks for files next to each copy
+    assert calls == {"elf": 1, "pe": 3}
+    generated_sbom = _normalize_sbom(serial_path)
+    assert len(generated_sbom["software"]) == 2
+    for software in generated_sbom["software"]:
+        assert len(software["installPath"]) == 3
+    assert generated_sbom == _normalize_sbom(parallel_path)
+
+
+def test_generate_incremental_reuses_unchanged_files(tmp_path, monkeypatch):
+    extract_path = Path(testing_data, "Windows_dll_test_no1").as_posix()
+    manifest_path = str(Path(tmp_path, "manifest.json"))
+    first_path = str(Path(tmp_path, "first.json"))
+    reused_path = str(Path(tmp_path, "reused.json"))
+    no_input_path = str(Path(tmp_path, "no_input.json"))
+
+    # pylint: disable=no-value-for-parameter
+    sbom(["--incremental", manifest_path, extract_path, first_path], standalone_mode=False)
+    with open(manifest_path) as f:
+        assert len(json.load(f)["files"]) == 2
+
+    # unchanged files shouldn't be hashed again
+    def fail_hashing(*_args, **_kwargs):
+        raise AssertionError("unchanged file was hashed")
+
+    monkeypatch.setattr("surfactant.sbomtypes._software.calc_file_hashes", fail_hashing)
+    # with the previous output as the input SBOM, the existing entries are used as is
+    sbom(
+        ["--incremental", manifest_path, extract_path, reused_path, first_path],
+        standalone_mode=False,
+    )
+    # without it, entries are recreated with the recorded hashes and UUIDs
+    sbom(["--incremental", manifest_path, extract_path, no_input_path], standalone_mode=False)
+    # pylint: enable
+
+    with open(first_path) as f:
+        first_sbom = json.load(f)
+    with open(reused_path) as f:
+        reused_sbom = json.load(f)
+    with open(no_input_path) as f:
+        no_input_sbom = json.load(f)
+    assert reused_sbom["software"] == first_sbom["software"]
+    assert reused_sbom["relationships"] == first_sbom["relationships"]
+    for software in first_sbom["software"] + no_input_sbom["software"]:
+        software["captureTime"] = None
+    assert no_input_sbom["software"] == first_sbom["software"]
+    assert no_input_sbom["relationships"] == first_sbom["relationships"]
+
+
+def test_generate_resume_from_checkpoint(tmp_path, monkeypatch):
+    extract_path = Path(tmp_path, "specimen")
+    for copy_dir in ["a", "b", "c"]:
+        Path(extract_path, copy_dir).mkdir(parents=True)
+    shutil.copy(Path(testing_data, "ELF_shared_obj_test_no1", "lib", "libtestlib.so"), extract_path)
+    shutil.copy(Path(testing_data, "Windows_dll_test_no1", "testlib.dll"), Path(extract_path, "a"))
+    shutil.copy(
+        Path(testing_data, "Windows_dll_test_no1", "hello_world.exe"), Path(extract_path, "b")
+    )
+    Path(extract_path, "c", "notes.txt").write_text("not a binary")
+    default_path = str(Path(tmp_path, "default.json"))
+    resumed_path = str(Path(tmp_path, "resumed.json"))
+    checkpoint_path = Path(tmp_path, "checkpoint.json")
+    manifest_path = Path(tmp_path, "manifest.json")
+
+    # pylint: disable-next=import-outside-toplevel
+    from surfactant.cmd import generate
+
+    # pylint: disable=no-value-for-parameter
+    sbom([extract_path.as_posix(), default_path], standalone_mode=False)
+
+    # save a checkpoint after every directory, then fail partway through the extract path
+    monkeypatch.setattr(generate, "CHECKPOINT_BATCH_SIZE", 1)
+    add_file_tasks = generate.add_file_tasks
+    batches = []
+
+    def fail_on_third_batch(tasks, *args, **kwargs):
+        batches.append(tasks)
+        if len(batches) == 3:
+            raise RuntimeError("interrupted")
+        add_file_tasks(tasks, *args, **kwargs)
+
+    monkeypatch.setattr(generate, "add_file_tasks", fail_on_third_batch)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        sbom(
+            [
+                "--checkpoint",
+                str(checkpoint_path),
+                "--checkpoint_interval",
+                "0",
+                "--incremental",
+                str(manifest_path),
+                extract_path.as_posix(),
+                resumed_path,
+            ],
+            standalone_mode=False,
+        )
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    assert len(checkpoint["current"]["completed_dirs"]) == 2
+    assert len(checkpoint["sbom"]["software"]) == 2
+    assert len(checkpoint["manifest"]["files"]) == 2
+    assert not manifest_path.exists()
+
+    # the manifest entries in the checkpoint can't be dropped
+    with pytest.raises(click.UsageError, match="--incremental"):
+        sbom(
+            ["--resume", str(checkpoint_path), extract_path.as_posix(), resumed_path],
+            standalone_mode=False,
+        )
+
+    # only the files that weren't in the checkpoint are processed again
+    resumed_files = []
+
+    def record_files(tasks, *args, **kwargs):
+        resumed_files.extend(Path(task.filepath).name for task in tasks)
+        add_file_tasks(tasks, *args, **kwargs)
+
+    monkeypatch.setattr(generate, "add_file_tasks", record_files)
+    sbom(
+        [
+            "--resume",
+            str(checkpoint_path),
+            "--incremental",
+            str(manifest_path),
+            extract_path.as_posix(),
+            resumed_path,
+        ],
+        standalone_mode=False,
+    )
+    # pylint: enable
+
+    assert len(resumed_files) == 2
+    assert not checkpoint_path.exists()
+    assert _normalize_sbom(default_path) == _normalize_sbom(resumed_path)
+    # files processed before and after the checkpoint are all in the manifest
+    with open(manifest_path) as f:
+        assert len(json.load(f)["files"]) == 4
+
+
+def test_schedule_file_tasks_largest_first():
+    context = ContextEntry(extractPaths=["/specimen"])
+    sizes = [10, 5000, 20, 30, 40, 10, 3000, 50]
+    tasks = [
+        FileTask(
+            f"/specimen/file{i}",
+            context,
+            "/specimen",
+            stat_result=os.stat_result((0, 0, 0, 0, 0, 0, size, 0, 0, 0)),
+        )
+        for i, size in enumerate(sizes)
+    ]
+    batches = schedule_file_tasks(tasks, jobs=1)
+    # the large files are sent first and on their own; files of the same size stay in walk order
+    assert batches[:2] == [[1], [6]]
+    assert [i for batch in batches[2:] for i in batch] == [7, 4, 3, 2, 0, 5]
+    assert sorted(i for batch in batches for i in batch) == list(range(len(tasks)))
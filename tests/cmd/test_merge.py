@@ -13,7 +13,7 @@ import pytest
 
 from surfactant.cmd.merge import merge
 from surfactant.plugin.manager import get_plugin_manager
-from surfactant.sbomtypes import SBOM
+from surfactant.sbomtypes import SBOM, Software, StarRelationship, System
 from tests.cmd import common
 
 
@@ -56,6 +56,74 @@ def test_simple_merge_method():
     common.test_simple_merge_method(common.get_sbom1(), common.get_sbom2(), merged_sbom)
 
 
+def test_merge_remaps_duplicate_uuids():
+    container1, container2, lib1, lib2, app = [
+        f"{i}0000000-0000-4000-8000-000000000000" for i in range(5)
+    ]
+    sbom1 = SBOM()
+    sbom1.add_software(Software(UUID=container1, sha256="c" * 64))
+    sbom1.add_software(Software(UUID=lib1, sha256="1" * 64, containerPath=[f"{container1}/lib.so"]))
+    sbom1.create_relationship(container1, lib1, "Contains")
+    # an edge to a UUID that is only merged away later
+    sbom1.create_relationship(lib1, container2, "Uses")
+
+    sbom2 = SBOM(starRelationships={StarRelationship(app, container2, "Uses")})
+    sbom2.add_software(Software(UUID=container2, sha256="c" * 64))
+    sbom2.add_software(
+        Software(UUID=lib2, sha256="2" * 64, containerPath=[f"{container2}/lib2.so"])
+    )
+    sbom2.add_software(Software(UUID=app, sha256="1" * 64, containerPath=[f"{container2}/lib.so"]))
+    sbom2.create_relationship(container2, lib2, "Contains")
+    sbom2.create_relationship(container2, app, "Contains")
+    sbom2.create_relationship(app, lib2, "Uses")
+
+    sbom1.merge(sbom2)
+    # merging an SBOM with itself changes nothing
+    sbom1.merge(sbom1)
+
+    assert [sw.UUID for sw in sbom1.software] == [container1, lib1, lib2]
+    assert set(sbom1.graph.edges(keys=True)) == {
+        (container1, lib1, "Contains"),
+        (lib1, container1, "Uses"),
+        (container1, lib2, "Contains"),
+        (lib1, lib2, "Uses"),
+    }
+    assert sbom1.software[1].containerPath == [f"{container1}/lib.so"]
+    assert sbom1.software[2].containerPath == [f"{container1}/lib2.so"]
+    assert sbom1.find_software_by_container_path(container1) == sbom1.software[1:]
+    assert sbom1.starRelationships == {StarRelationship(lib1, container1, "Uses")}
+
+
+def test_merge_matches_systems():
+    sys1, sys2, sys3 = [f"{i}0000000-0000-4000-8000-000000000000" for i in range(1, 4)]
+
+    def system(uuid, name, description=None):
+        return System(UUID=uuid, name=name, description=description, captureStart=0, captureEnd=0)
+
+    sbom1 = SBOM(systems=[system(sys1, "first"), system(sys2, "second")])
+    sbom2 = SBOM(
+        systems=[
+            # same UUID and name
+            system(sys1, "first", "merged by UUID"),
+            # no UUID, so matched by name
+            system("", "second", "merged by name"),
+            # same UUID but a different name
+            system(sys2, "other"),
+            system(sys3, "third"),
+        ]
+    )
+    sbom1.merge(sbom2)
+
+    assert [(s.UUID, s.name) for s in sbom1.systems] == [
+        (sys1, "first"),
+        (sys2, "second"),
+        (sys2, "other"),
+        (sys3, "third"),
+    ]
+    assert sbom1.systems[0].description == "merged by UUID"
+    assert sbom1.systems[1].description == "merged by name"
+
+
 @pytest.mark.skip(reason="No way of validating this test yet")
 def test_merge_with_circular_dependency():
     sbom1 = common.get_sbom1()
@@ -0,0 +1,45 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from surfactant.cmd.generate import sbom
+from surfactant.cmd.profile import profile
+
+testing_data = Path(Path(__file__).parent.parent, "data")
+
+
+def test_generate_profile_report(tmp_path):
+    extract_path = Path(testing_data, "Windows_dll_test_no1").as_posix()
+    output_path = str(Path(tmp_path, "out.json"))
+    profile_path = str(Path(tmp_path, "profile.json"))
+
+    # pylint: disable=no-value-for-parameter
+    sbom(
+        ["--no_cache", "--profile", profile_path, extract_path, output_path], standalone_mode=False
+    )
+    # pylint: enable
+
+    with open(profile_path) as f:
+        report = json.load(f)
+    assert report["files"] == 2
+    assert report["phases"]["hashing"]["calls"] == 2
+    assert report["phases"]["identify_file_type"]["calls"] >= 2
+    assert report["plugins"]["extract_file_info"]["surfactant.infoextractors.pe_file"]["calls"] == 2
+    assert (
+        "surfactant.relationships.pe_relationship" in report["plugins"]["establish_relationships"]
+    )
+    assert report["filetypes"]["PE"]["calls"] == 2
+    assert sorted(Path(f["path"]).name for f in report["slowestFiles"]) == [
+        "hello_world.exe",
+        "testlib.dll",
+    ]
+
+    result = CliRunner().invoke(profile, [profile_path])
+    assert result.exit_code == 0
+    assert "extract_file_info: surfactant.infoextractors.pe_file" in result.output
+    assert "testlib.dll" in result.output
@@ -0,0 +1,169 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+import shutil
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import click
+import pytest
+
+from surfactant.cmd.generate import sbom
+from surfactant.cmd.internal.generate_utils import Shard, ShardParamType
+from surfactant.cmd.reduce import reduce_command
+
+testing_data = Path(Path(__file__).parent.parent, "data")
+
+
+def _summarize_sbom(sbom_path: str) -> dict:
+    """Describe an SBOM in a way that doesn't depend on the order entries were added in."""
+    with open(sbom_path) as f:
+        generated_sbom = json.load(f)
+    sha256_by_uuid = {
+        software["UUID"]: software["sha256"] for software in generated_sbom["software"]
+    }
+    return {
+        "software": {
+            software["sha256"]: (
+                sorted(software["fileName"]),
+                sorted(software["installPath"]),
+                sorted(json.dumps(md, sort_keys=True) for md in software["metadata"]),
+            )
+            for software in generated_sbom["software"]
+        },
+        "relationships": sorted(
+            (sha256_by_uuid[rel["xUUID"]], sha256_by_uuid[rel["yUUID"]], rel["relationship"])
+            for rel in generated_sbom["relationships"]
+        ),
+    }
+
+
+def _run_shards(extract_path: Path, tmp_path: Path, count: int) -> list:
+    """Generate an SBOM for each of `count` shards of an extract path (or context file), returning the
+    SBOM paths."""
+    # separate processes stand in for the machines each shard would run on
+    shard_paths = [str(Path(tmp_path, f"shard{i}.json")) for i in range(1, count + 1)]
+    shard_runs = [
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            [
+                sys.executable,
+                "-m",
+                "surfactant",
+                "generate",
+                "--no_cache",
+                "--shard",
+                f"{i}/{count}",
+                extract_path.as_posix(),
+                shard_path,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for i, shard_path in enumerate(shard_paths, start=1)
+    ]
+    assert [run.wait(timeout=300) for run in shard_runs] == [0] * count
+    return shard_paths
+
+
+def test_shard_param_type():
+    assert ShardParamType().convert("2/3", None, None) == Shard(2, 3)
+    for value in ["0/3", "4/3", "1-3"]:
+        with pytest.raises(click.BadParameter):
+            ShardParamType().convert(value, None, None)
+    # every file belongs to exactly one shard
+    keys = [f"/specimen/file{i}" for i in range(100)]
+    assert sorted(key for i in range(1, 4) for key in keys if Shard(i, 3).includes(key)) == sorted(
+        keys
+    )
+
+
+def test_sharded_generate_and_reduce(tmp_path):
+    extract_path = Path(tmp_path, "specimen")
+    for copy_dir in ["a", "b", "c", "d"]:
+        Path(extract_path, copy_dir).mkdir(parents=True)
+        shutil.copy(
+            Path(testing_data, "Windows_dll_test_no1", "testlib.dll"), Path(extract_path, copy_dir)
+        )
+    shutil.copy(
+        Path(testing_data, "Windows_dll_test_no1", "hello_world.exe"), Path(extract_path, "a")
+    )
+    shutil.copy(Path(testing_data, "ELF_shared_obj_test_no1", "lib", "libtestlib.so"), extract_path)
+    expected_path = str(Path(tmp_path, "expected.json"))
+    reduced_path = str(Path(tmp_path, "reduced.json"))
+
+    # pylint: disable=no-value-for-parameter
+    sbom([extract_path.as_posix(), expected_path], standalone_mode=False)
+    # pylint: enable
+
+    shard_paths = _run_shards(extract_path, tmp_path, 3)
+    shard_files = []
+    for shard_path in shard_paths:
+        with open(shard_path) as f:
+            partial_sbom = json.load(f)
+        assert not partial_sbom["relationships"]
+        shard_files.extend(name for sw in partial_sbom["software"] for name in sw["installPath"])
+    # every file was processed by one of the shards
+    assert len(shard_files) == len(set(shard_files)) == 6
+
+    # pylint: disable-next=no-value-for-parameter
+    reduce_command([*shard_paths, reduced_path], standalone_mode=False)
+    assert _summarize_sbom(reduced_path) == _summarize_sbom(expected_path)
+
+
+def test_sharded_generate_and_reduce_archive(tmp_path):
+    extract_path = Path(tmp_path, "specimen")
+    extract_path.mkdir()
+    # files extracted from an archive are processed by the shard that extracted the archive
+    with zipfile.ZipFile(Path(extract_path, "archive.zip"), "w") as archive:
+        for i in range(12):
+            archive.writestr(f"dir/f{i}.txt", f"file {i}\n")
+    Path(extract_path, "top.txt").write_text("top-level file\n")
+    expected_path = str(Path(tmp_path, "expected.json"))
+    reduced_path = str(Path(tmp_path, "reduced.json"))
+
+    # pylint: disable-next=no-value-for-parameter
+    sbom(["--no_cache", extract_path.as_posix(), expected_path], standalone_mode=False)
+    assert len(_summarize_sbom(expected_path)["software"]) == 14
+
+    shard_paths = _run_shards(extract_path, tmp_path, 2)
+    # pylint: disable-next=no-value-for-parameter
+    reduce_command([*shard_paths, reduced_path], standalone_mode=False)
+    assert _summarize_sbom(reduced_path) == _summarize_sbom(expected_path)
+
+
+def test_sharded_generate_and_reduce_archive_context(tmp_path):
+    archive_path = Path(tmp_path, "fw.zip")
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for i in range(12):
+            archive.writestr(f"dir/f{i}.txt", f"file {i}\n")
+    context_path = Path(tmp_path, "context.json")
+    context_path.write_text(json.dumps([{"archive": archive_path.as_posix(), "extractPaths": []}]))
+    expected_path = str(Path(tmp_path, "expected.json"))
+    reduced_path = str(Path(tmp_path, "reduced.json"))
+
+    # pylint: disable-next=no-value-for-parameter
+    sbom(["--no_cache", context_path.as_posix(), expected_path], standalone_mode=False)
+    assert len(_summarize_sbom(expected_path)["software"]) == 13
+
+    # the archive's contents are split between the shards, which each include the archive itself
+    shard_paths = _run_shards(context_path, tmp_path, 2)
+    archive_sha256 = next(
+        sha256
+        for sha256, (names, _, _) in _summarize_sbom(expected_path)["software"].items()
+        if names == ["fw.zip"]
+    )
+    shard_software = [
+        set(_summarize_sbom(shard_path)["software"]) - {archive_sha256}
+        for shard_path in shard_paths
+    ]
+    assert all(shard_software)
+    assert not shard_software[0] & shard_software[1]
+    assert len(shard_software[0] | shard_software[1]) == 12
+
+    # pylint: disable-next=no-value-for-parameter
+    reduce_command([*shard_paths, reduced_path], standalone_mode=False)
+    assert _summarize_sbom(reduced_path) == _summarize_sbom(expected_path)
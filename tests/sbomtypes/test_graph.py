@@ -0,0 +1,143 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import pickle
+import random
+
+import pytest
+
+from surfactant.sbomtypes import RelationshipGraph
+
+
+def test_relationship_graph_edges():
+    graph = RelationshipGraph([("a", "b", "Contains"), ("a", "c", "Uses"), ("c", "a", "Uses")])
+    graph.add_node("a", type="Software")
+    graph.add_edge("a", "b", "Contains")  # already there
+    graph.add_edge("a", "b", "Uses")
+    graph.add_edge("b", "b", "Uses")
+
+    assert graph.number_of_nodes() == 3
+    assert graph.number_of_edges() == 5
+    assert graph.nodes["a"] == {"type": "Software"}
+    assert not graph.nodes["b"]
+    assert graph.has_edge("a", "b") and graph.has_edge("a", "b", key="Uses")
+    assert not graph.has_edge("b", "a") and not graph.has_edge("a", "b", key="Missing")
+    assert graph.out_edges("a", keys=True) == [
+        ("a", "b", "Contains"),
+        ("a", "c", "Uses"),
+        ("a", "b", "Uses"),
+    ]
+    assert graph.in_edges("b") == [("a", "b"), ("a", "b"), ("b", "b")]
+    assert graph.in_edges("missing") == []
+    assert dict(graph.in_degree()) == {"a": 1, "b": 3, "c": 1}
+
+    graph.remove_node("b")
+    assert list(graph.edges(keys=True)) == [("a", "c", "Uses"), ("c", "a", "Uses")]
+    assert graph.out_degree("a") == 1
+    with pytest.raises(KeyError):
+        graph.remove_node("b")
+    graph.remove_edge("c", "a", "Uses")
+    assert list(graph.edges()) == [("a", "c")]
+    assert set(graph.to_networkx().edges(keys=True)) == {("a", "c", "Uses")}
+
+
+def test_relationship_graph_edge_order():
+    networkx = pytest.importorskip("networkx")
+    rng = random.Random(1)
+    edges = [
+        (f"n{rng.randrange(20)}", f"n{rng.randrange(20)}", rng.choice(["Uses", "Contains", "USES"]))
+        for _ in range(200)
+    ]
+    graph = RelationshipGraph(edges)
+    nx_graph = networkx.MultiDiGraph()
+    for u, v, key in edges:
+        if not nx_graph.has_edge(u, v, key):
+            nx_graph.add_edge(u, v, key)
+    graph.remove_node("n5")
+    nx_graph.remove_node("n5")
+    # edges are grouped by source and target node like a networkx graph, rather than in the order added
+    assert list(graph.edges(keys=True)) == list(nx_graph.edges(keys=True))
+    uses = list(graph.edges(keys=True, rel_type="uses"))
+    assert sorted(uses) == sorted(
+        edge for edge in nx_graph.edges(keys=True) if edge[2] != "Contains"
+    )
+    assert [u for u, _, _ in uses] == sorted((u for u, _, _ in uses), key=list(graph).index)
+
+
+def test_relationship_graph_compaction():
+    graph = RelationshipGraph((f"parent-{i}", f"child-{i % 10}", "Contains") for i in range(3000))
+    for i in range(3000):
+        if i % 3:
+            graph.remove_node(f"parent-{i}")
+    # compaction renumbers the nodes and edges without changing anything visible
+    assert graph.number_of_edges() == len(list(graph.edges())) == 1000
+    assert graph.in_degree("child-3") == 100
+    graph.add_edge("parent-1", "child-3", "Contains")
+    copy = pickle.loads(pickle.dumps(graph))
+    assert list(copy.edges(keys=True)) == list(graph.edges(keys=True))
+    assert copy.in_edges("child-3")[0] == ("parent-3", "child-3")
+    assert copy.in_edges("child-3")[-1] == ("parent-1", "child-3")
+
+
+def test_relationship_graph_type_index():
+    graph = RelationshipGraph(
+        [
+            ("pkg", "a", "Contains"),
+            ("pkg", "b", "Uses"),
+            ("pkg", "b", "CONTAINS"),
+            ("a", "b", "Uses"),
+            ("other", "a", "contains"),
+        ]
+    )
+    assert graph.number_of_edges_of_type("Contains") == 3
+    assert list(graph.edges(rel_type="contains")) == [("pkg", "a"), ("pkg", "b"), ("other", "a")]
+    assert graph.out_edges("pkg", rel_type="Contains") == [("pkg", "a"), ("pkg", "b")]
+    assert graph.out_edges("pkg", rel_type="Missing") == []
+    assert graph.in_edges("b", keys=True, rel_type="uses") == [
+        ("pkg", "b", "Uses"),
+        ("a", "b", "Uses"),
+    ]
+    # exact keys are still separate edges
+    assert graph.has_edge("pkg", "b", key="CONTAINS") and not graph.has_edge(
+        "pkg", "b", key="Contains"
+    )
+
+    assert graph.find_edge("pkg") == ("pkg", "a", "Contains")
+    assert graph.find_edge(v="b", rel_type="contains") == ("pkg", "b", "CONTAINS")
+    assert graph.find_edge("pkg", "b") == ("pkg", "b", "Uses")
+    assert graph.find_edge(rel_type="USES") == ("pkg", "b", "Uses")
+    assert graph.find_edge("a", "pkg") is None
+    assert graph.find_edge("missing") is None
+
+    graph.remove_node("pkg")
+    assert graph.number_of_edges_of_type("Contains") == 1
+    assert graph.find_edge(rel_type="Uses") == ("a", "b", "Uses")
+    assert graph.find_edge() == ("a", "b", "Uses")
+
+
+def test_relationship_graph_cycles():
+    networkx = pytest.importorskip("networkx")
+    rng = random.Random(0)
+    graph = RelationshipGraph(
+        (f"n{rng.randrange(300)}", f"n{rng.randrange(300)}", rng.choice(["Uses", "Contains"]))
+        for _ in range(400)
+    )
+    # a long chain doesn't recurse
+    graph.add_edges_from((f"chain{i}", f"chain{i + 1}", "Uses") for i in range(5000))
+    graph.add_edge("loop", "loop", "Uses")
+    roots, components = graph.roots_and_cycles()
+
+    nx_graph = graph.to_networkx()
+    assert roots == [node for node, degree in nx_graph.in_degree() if degree == 0]
+    expected = [
+        component
+        for component in networkx.strongly_connected_components(nx_graph)
+        if len(component) > 1 or nx_graph.has_edge(*component, *component)
+    ]
+    assert sorted(map(sorted, components)) == sorted(map(sorted, expected))
+    for component in components:
+        cycle = graph.find_cycle(component)
+        assert cycle[0] == component[0] and set(cycle) <= set(component)
+        assert all(graph.has_edge(u, v) for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+    assert graph.find_cycle(["chain0", "chain1"]) == []
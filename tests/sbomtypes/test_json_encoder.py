@@ -0,0 +1,49 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import io
+import json
+
+import pytest
+
+from surfactant.sbomtypes import SBOM, Software, _json_encoder
+
+
+def _make_sbom() -> SBOM:
+    sbom = SBOM()
+    for i in range(3):
+        sbom.add_software(
+            Software(
+                UUID=f"uuid-{i}",
+                sha256=f"{i}" * 64,
+                size=2**70 if i == 2 else i,
+                fileName=[f"lib{i}.so"],
+                installPath=[f"/usr/lib/lib{i}.so", 'C:\\Program Files\\é😀\x7f\x01\n"q"'],
+                metadata=[
+                    {
+                        "floats": [1e16, 1e-05, 0.1, -0.0, 2.0, 1.5e300],
+                        "nested": {"empty": {}, "list": [], "deeper": [[1, [2]], {"k": None}]},
+                        "text": 'ends like a number": 1.5',
+                        "flag": True,
+                    },
+                    {1: "key that isn't a string"} if i == 1 else {},
+                ],
+            )
+        )
+    sbom.create_relationship("uuid-0", "uuid-1", "Contains")
+    return sbom
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_write_json_matches_json_dumps(monkeypatch, use_orjson, indent):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json_encoder, "orjson", None)
+    sbom = _make_sbom()
+    out = io.StringIO()
+    sbom.write_json(out, indent=indent)
+    assert out.getvalue() == json.dumps(sbom.to_dict_override(), indent=indent)
+    assert sbom.to_json(indent=indent) == out.getvalue()
@@ -0,0 +1,97 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import copy
+import io
+import pickle
+
+import pytest
+
+from surfactant.sbomtypes import (
+    SBOM,
+    MetadataSpool,
+    MetadataStore,
+    Relationship,
+    Software,
+    SpooledMetadata,
+)
+
+
+def test_spooled_metadata_behaves_like_list(tmp_path):
+    spool = MetadataSpool(str(tmp_path))
+    sw = Software(sha256="abc", metadata=[{"a": 1}, {"b": 2}])
+    spool.spool([sw])
+    assert isinstance(sw.metadata, SpooledMetadata)
+    assert len(sw.metadata) == 2
+    assert sw.metadata == [{"a": 1}, {"b": 2}]
+
+    sw.metadata.append({"c": 3})
+    assert {"c": 3} in sw.metadata
+    del sw.metadata[0]
+    assert list(sw.metadata) == [{"b": 2}, {"c": 3}]
+
+    # copies and pickles are plain lists that don't depend on the spool
+    assert copy.deepcopy(sw.metadata) == [{"b": 2}, {"c": 3}]
+    assert pickle.loads(pickle.dumps(sw.metadata)) == [{"b": 2}, {"c": 3}]
+    spool.close()
+
+
+def test_write_json_with_spooled_metadata():
+    sbom = SBOM()
+    sbom.add_software(Software(UUID="1", sha256="abc", metadata=[{"a": 1}]))
+    sbom.add_software(Software(UUID="2", sha256="def"))
+    sbom.add_relationship(Relationship("1", "2", "Contains"))
+    expected = sbom.to_json(indent=2)
+
+    spool = MetadataSpool()
+    spool.spool(sbom.software)
+    outfile = io.StringIO()
+    sbom.write_json(outfile, indent=2)
+    spool.close()
+    assert outfile.getvalue() == expected
+
+
+def test_metadata_store_keyed_by_uuid(tmp_path):
+    store = MetadataStore(directory=str(tmp_path))
+    sw = Software(UUID="1", sha256="abc", metadata=[{"a": 1}])
+    store.spool([sw, Software(UUID="2", sha256="def")])
+    assert isinstance(sw.metadata, SpooledMetadata)
+    assert sw.metadata == [{"a": 1}]
+
+    # changes replace the stored copy instead of adding another
+    sw.metadata.append({"b": 2})
+    sw.metadata[0] = {"a": 3}
+    assert list(sw.metadata) == [{"a": 3}, {"b": 2}]
+    assert store.load("1") == [{"a": 3}, {"b": 2}]
+    # pylint: disable-next=protected-access
+    assert store._db.execute("SELECT COUNT(*) FROM metadata").fetchone() == (1,)
+    store.close()
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("store", [False, True])
+def test_spooled_metadata_loaded_once(tmp_path, monkeypatch, store):
+    spool = MetadataStore(directory=str(tmp_path)) if store else MetadataSpool(str(tmp_path))
+    first = Software(UUID="1", sha256="abc", metadata=[{"n": i} for i in range(100)])
+    second = Software(UUID="2", sha256="def", metadata=[{"n": -1}])
+    spool.spool([first, second])
+    reads = []
+    read = spool.read
+    monkeypatch.setattr(spool, "read", lambda key: reads.append(key) or read(key))
+
+    # an indexed loop only reads the metadata once
+    assert [first.metadata[i]["n"] for i in range(len(first.metadata))] == list(range(100))
+    assert len(reads) == 1
+
+    # changes to the items are written back once another entry's metadata is loaded
+    first.metadata[0]["n"] = "changed"
+    for item in first.metadata:
+        item["seen"] = True
+    assert second.metadata[0] == {"n": -1}
+    assert len(reads) == 2
+    # ...so reading them again gets the changed copy
+    assert first.metadata[0] == {"n": "changed", "seen": True}
+    assert all(item["seen"] for item in first.metadata)
+    assert len(reads) == 3
+    spool.close()
@@ -0,0 +1,67 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+from pathlib import Path
+
+import pytest
+
+from surfactant.sbomtypes import (
+    SBOM,
+    File,
+    Software,
+    SoftwareComponent,
+    SoftwareComponentProvenance,
+    StarRelationship,
+    System,
+    SystemProvenance,
+    load_sbom_json,
+)
+
+sample_sboms = Path(Path(__file__).parent.parent, "data", "sample_sboms")
+
+
+def _assert_same_sbom(sbom_json: str):
+    loaded = load_sbom_json(sbom_json)
+    expected = SBOM.from_json(sbom_json)
+    for name in ["systems", "hardware", "software", "analysisData", "observations"]:
+        assert getattr(loaded, name) == getattr(expected, name)
+    assert loaded.starRelationships == expected.starRelationships
+    assert sorted(loaded.graph.edges(keys=True)) == sorted(
+        (rel["xUUID"], rel["yUUID"], rel["relationship"])
+        for rel in json.loads(sbom_json)["relationships"]
+    )
+    for sw in loaded.software:
+        assert loaded.graph.nodes[sw.UUID]["type"] == "Software"
+    return loaded
+
+
+@pytest.mark.parametrize("sbom_file", sorted(sample_sboms.glob("*.json")), ids=lambda p: p.name)
+def test_load_sample_sboms(sbom_file):
+    _assert_same_sbom(sbom_file.read_text())
+
+
+def test_load_nested_entries():
+    sbom = SBOM(
+        systems=[System(UUID="system", provenance=[SystemProvenance("name")])],
+        starRelationships={StarRelationship("a", "b", "Contains")},
+    )
+    sbom.add_software(
+        Software(
+            UUID="sw",
+            sha256="0" * 64,
+            supplementaryFiles=[File("path", "desc", "category", "user", "0", "source")],
+            components=[
+                SoftwareComponent("component", provenance=[SoftwareComponentProvenance("name")])
+            ],
+            metadata=[{"nested": [{"values": [1, 2]}]}],
+        )
+    )
+    sbom.create_relationship("system", "sw", "Includes")
+    sbom.create_relationship("sw", "missing", "Uses")
+    sbom_json = sbom.to_json()
+    loaded = _assert_same_sbom(sbom_json)
+    assert loaded.to_json() == sbom_json
+    assert isinstance(loaded.software[0].components[0].provenance[0], SoftwareComponentProvenance)
+    assert loaded.find_software("0" * 64) is loaded.software[0]
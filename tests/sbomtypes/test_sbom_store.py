@@ -0,0 +1,54 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+from pathlib import Path
+
+import pytest
+
+from surfactant.input_readers import sqlite_reader
+from surfactant.output import sqlite_writer
+from surfactant.sbomtypes import SBOMStore, Software, load_sbom_json
+
+helics_sbom = Path(Path(__file__).parent.parent, "data", "sample_sboms", "helics_sbom.json")
+
+
+def test_sbom_store_roundtrip(tmp_path):
+    sbom = load_sbom_json(helics_sbom.read_text())
+    store_path = tmp_path / "sbom.db"
+    # the writer replaces whatever was in the output file
+    store_path.write_text("{}")
+    with open(store_path, "w") as f:
+        sqlite_writer.write_sbom(sbom, f)
+    with open(store_path, "r") as f:
+        loaded = sqlite_reader.read_sbom(f)
+    assert loaded.to_json(indent=2) == sbom.to_json(indent=2)
+
+    with SBOMStore(store_path) as store:
+        sw = sbom.software[2]
+        assert store.get_software(sw.UUID) == sw
+        assert store.find_software_by_hash(md5=sw.md5) == [sw]
+        assert store.find_software_by_path("fileName", sw.fileName[0]) == [sw]
+        assert store.find_software_by_path("fileName", sw.fileName[0][1:]) == []
+        assert store.find_software_by_path("fileName", sw.fileName[0][:-1], match="prefix") == [sw]
+        assert store.find_software_by_path("fileName", sw.fileName[0][1:], match="contains") == [sw]
+        with pytest.raises(ValueError):
+            store.find_software_by_path("fileName", sw.fileName[0], match="glob")
+        # entries with the same UUID are replaced
+        sw.fileName.append("renamed")
+        store.add_software(sw)
+        store.add_software(Software(UUID="new", sha256="0" * 64, fileName=["renamed"]))
+        store.add_relationship("new", sw.UUID, "Uses")
+    with SBOMStore(store_path) as store:
+        assert [found.UUID for found in store.find_software_by_path("fileName", "renamed")] == [
+            sw.UUID,
+            "new",
+        ]
+        assert store.software_count == len(sbom.software) + 1
+        assert ("new", sw.UUID, "Uses") in store.get_relationships(sw.UUID)
+        assert store.load().find_software("0" * 64).UUID == "new"
+
+
+def test_sbom_store_rejects_other_files(tmp_path):
+    with pytest.raises(ValueError):
+        SBOMStore(helics_sbom)
@@ -0,0 +1,36 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from surfactant.sbomtypes import Software
+
+testing_data = Path(Path(__file__).parent.parent, "data")
+
+
+def test_software_entries_share_collection_info():
+    lib_path = Path(testing_data, "ELF_shared_obj_test_no1", "lib", "libtestlib.so")
+    sw1 = Software.create_software_from_file(str(lib_path))
+    sw2 = Software.create_software_from_file(str(lib_path))
+    assert sw1.metadata[0] is sw2.metadata[0]
+    assert sw1.fileName[0] is sw2.fileName[0]
+
+    # output is the same as for a regular dict
+    collection_info = json.loads(sw1.to_json())["metadata"][0]
+    assert list(collection_info) == ["collectedBy", "collectionPlatform", "fileInfo"]
+    assert collection_info == dict(sw1.metadata[0])
+    assert list(sw1.to_dict()["metadata"][0]["fileInfo"]) == ["mode", "hidden"]
+
+    # the shared copy can't be changed, and is still shared after pickling
+    with pytest.raises(TypeError):
+        sw1.metadata[0]["collectedBy"] = "other"
+    with pytest.raises(TypeError):
+        sw1.metadata[0]["fileInfo"].update(hidden=True)
+    unpickled = pickle.loads(pickle.dumps(sw1))
+    assert unpickled == sw1
+    assert unpickled.metadata[0] is sw1.metadata[0]
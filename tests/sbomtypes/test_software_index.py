@@ -0,0 +1,110 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import pickle
+
+from surfactant.sbomtypes import SBOM, Software
+
+CONTAINER_UUID = "0d2b1c4e-6a8f-4f1e-9c3b-2a7d5e8f1b6c"
+
+
+def _make_sbom() -> SBOM:
+    sbom = SBOM()
+    sbom.add_software(
+        Software(
+            UUID="1",
+            sha256="a256",
+            sha1="a1",
+            md5="a5",
+            fileName=["libfoo.so"],
+            installPath=["/usr/lib/libfoo.so"],
+        )
+    )
+    sbom.add_software(
+        Software(
+            UUID="2",
+            sha256="b256",
+            fileName=["FOO.DLL"],
+            installPath=["C:\\Windows\\System32\\FOO.DLL"],
+            containerPath=[f"{CONTAINER_UUID}/System32/FOO.DLL"],
+        )
+    )
+    return sbom
+
+
+def test_software_lookups():
+    sbom = _make_sbom()
+    assert sbom.find_software("a256").UUID == "1"
+    assert sbom.find_software_by_uuid("2").sha256 == "b256"
+    assert sbom.find_software_by_hash(sha1="a1").UUID == "1"
+    assert sbom.find_software_by_hash(sha256="b256", md5="a5").UUID == "1"
+    assert sbom.find_software_by_hash(sha256="missing") is None
+    assert [sw.UUID for sw in sbom.find_software_by_file_name("libfoo.so")] == ["1"]
+    assert [sw.UUID for sw in sbom.find_software_by_install_path("/usr/lib/libfoo.so")] == ["1"]
+    assert [sw.UUID for sw in sbom.find_software_in_install_directory("/usr/lib/")] == ["1"]
+    assert [sw.UUID for sw in sbom.find_software_in_install_directory("C:\\Windows\\System32")] == [
+        "2"
+    ]
+    assert [sw.UUID for sw in sbom.find_software_by_container_path(CONTAINER_UUID)] == ["2"]
+    assert not sbom.find_software_by_container_path(f"{CONTAINER_UUID}/other")
+
+
+def test_software_index_stays_consistent():
+    sbom = _make_sbom()
+    # merging a duplicate adds its paths to the existing entry
+    sbom.add_software_entries(
+        [
+            Software(
+                UUID="3", sha256="a256", fileName=["libfoo.so.1"], installPath=["/lib/libfoo.so.1"]
+            )
+        ]
+    )
+    assert [sw.UUID for sw in sbom.find_software_by_file_name("libfoo.so.1")] == ["1"]
+    assert sbom.find_software_by_uuid("3") is None
+
+    # entries appended directly to the list are still found
+    sbom.software.append(Software(UUID="4", sha256="d256", fileName=["libfoo.so"]))
+    assert [sw.UUID for sw in sbom.find_software_by_file_name("libfoo.so")] == ["1", "4"]
+
+    # changed entries are reindexed, and values they no longer have aren't found
+    sw = sbom.find_software_by_uuid("4")
+    sw.fileName = ["libbar.so"]
+    sbom.reindex_software(sw)
+    assert [sw.UUID for sw in sbom.find_software_by_file_name("libfoo.so")] == ["1"]
+    assert [sw.UUID for sw in sbom.find_software_by_file_name("libbar.so")] == ["4"]
+
+    # merging SBOMs and loading them again keeps the index up to date
+    other = SBOM()
+    other.add_software(Software(UUID="5", sha256="e256", fileName=["libbaz.so"]))
+    other.add_software(Software(UUID="6", sha1="a1", fileName=["libfoo-copy.so"]))
+    sbom.merge(other)
+    assert sbom.find_software_by_uuid("5").fileName == ["libbaz.so"]
+    assert [sw.UUID for sw in sbom.find_software_by_file_name("libfoo-copy.so")] == ["1"]
+    loaded = SBOM.from_json(sbom.to_json())
+    assert loaded.find_software_by_uuid("5").sha256 == "e256"
+    assert [sw.UUID for sw in loaded.find_software_by_file_name("libfoo.so")] == ["1"]
+    assert "software_index" not in sbom.to_dict()
+    # the index is rebuilt for the unpickled software entries
+    index = pickle.loads(pickle.dumps(sbom.software_index))
+    assert [sw.UUID for sw in index.find("fileName", "libfoo.so")] == ["1"]
+
+
+def test_software_index_finds_new_owner_of_changed_hash():
+    sbom = _make_sbom()
+    sbom.add_software(Software(UUID="3", sha256="c256"))
+    # entry 1 gives up its hash and entry 3 takes it, in the order that leaves entry 1 indexed
+    first = sbom.find_software_by_uuid("1")
+    third = sbom.find_software_by_uuid("3")
+    third.sha256 = "a256"
+    sbom.reindex_software(third)
+    first.sha256 = "c256"
+    sbom.reindex_software(first)
+    assert sbom.find_software("a256").UUID == "3"
+    assert sbom.find_software("c256").UUID == "1"
+
+    # changed without being reindexed, the entry with the value is still found
+    third.UUID = "2"
+    sbom.find_software_by_uuid("2").UUID = "4"
+    assert sbom.find_software_by_uuid("2") is third
+    assert sbom.find_software_by_uuid("3") is None
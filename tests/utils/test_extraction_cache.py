@@ -0,0 +1,167 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import importlib.metadata
+import queue
+import sqlite3
+import types
+
+import pytest
+
+import surfactant
+import surfactant.plugin
+from surfactant.configmanager import ConfigManager
+from surfactant.extraction_cache import ExtractionCache, open_extraction_cache
+from surfactant.plugin.manager import get_plugin_manager
+from surfactant.sbomtypes import SBOM, Software
+
+
+def _make_plugin(name: str, cacheable: bool):
+    plugin = types.ModuleType(name)
+    plugin.calls = 0
+
+    @surfactant.plugin.hookimpl
+    def extract_file_info(software, filetype, software_field_hints):
+        plugin.calls += 1
+        if "TEST" not in filetype:
+            return None
+        software_field_hints.append(("name", f"{name}-name", 50))
+        return {name: software.sha256, 1: ("tuple", b"bytes")}
+
+    plugin.extract_file_info = extract_file_info
+    if cacheable:
+
+        @surfactant.plugin.hookimpl
+        def cacheable_extraction():
+            return True
+
+        plugin.cacheable_extraction = cacheable_extraction
+    return plugin
+
+
+@pytest.fixture(name="pm")
+def fixture_pm():
+    pm = get_plugin_manager()
+    # only the test plugins should be run
+    for plugin in list(pm.get_plugins()):
+        pm.unregister(plugin)
+    pm.register(_make_plugin("cached_plugin", True), name="cached_plugin")
+    pm.register(_make_plugin("uncached_plugin", False), name="uncached_plugin")
+    return pm
+
+
+def _hook_kwargs(sha256="abc123", filetype=None):
+    return {
+        "sbom": SBOM(),
+        "software": Software(sha256=sha256),
+        "filename": "unused",
+        "filetype": filetype or ["TEST"],
+        "context_queue": queue.Queue(),
+        "current_context": None,
+        "children": [],
+        "software_field_hints": [],
+        "omit_unrecognized_types": False,
+        "file_content": None,
+    }
+
+
+def _extract(pm, cache, sha256="abc123", filetype=None):
+    hook_kwargs = _hook_kwargs(sha256, filetype)
+    results = cache.extract_file_info(pm, **hook_kwargs)
+    return results, hook_kwargs["software_field_hints"]
+
+
+def test_results_reused_across_runs(tmp_path, pm):
+    cached_plugin = pm.get_plugin("cached_plugin")
+    uncached_plugin = pm.get_plugin("uncached_plugin")
+    expected = _extract(pm, ExtractionCache(tmp_path / "unused.db"))
+    # the results should match a normal hook call
+    hook_kwargs = _hook_kwargs()
+    assert expected[0] == pm.hook.extract_file_info(**hook_kwargs)
+    assert expected[1] == hook_kwargs["software_field_hints"]
+
+    cached_plugin.calls = uncached_plugin.calls = 0
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        assert _extract(pm, cache) == expected
+        assert (cache.hits, cache.misses) == (0, 1)
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        assert _extract(pm, cache) == expected
+        assert (cache.hits, cache.misses) == (1, 0)
+        # a different file type or hash isn't a hit, and results of None aren't cached
+        _extract(pm, cache, filetype=["OTHER"])
+        _extract(pm, cache, sha256="def456")
+        assert (cache.hits, cache.misses) == (1, 1)
+    assert cached_plugin.calls == 3
+    assert uncached_plugin.calls == 4
+
+
+def test_cached_results_keep_types(tmp_path, pm):
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        _extract(pm, cache)
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        results, field_hints = _extract(pm, cache)
+        assert cache.hits == 1
+    assert results[-1] == {"cached_plugin": "abc123", 1: ("tuple", b"bytes")}
+    assert field_hints[-1] == ("name", "cached_plugin-name", 50)
+
+
+def test_results_in_old_format_are_cleared(tmp_path, pm):
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        _extract(pm, cache)
+    with sqlite3.connect(tmp_path / "cache.db") as conn:
+        conn.execute("PRAGMA user_version = 1")
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        assert cache.stats()["entries"] == 0
+
+
+def test_cache_disabled_by_default(monkeypatch):
+    settings = {}
+    monkeypatch.setattr(
+        ConfigManager(),
+        "get",
+        lambda section, option, fallback=None: settings.get(option, fallback),
+    )
+    assert open_extraction_cache() is None
+
+
+def test_prune_removes_least_recently_used(tmp_path, pm):
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        for i in range(4):
+            _extract(pm, cache, sha256=f"hash{i}")
+        cache.commit()
+        stats = cache.stats()
+        assert stats["entries"] == 4
+        assert stats["plugins"] == {"cached_plugin": 4}
+        entry_size = stats["size"] // 4
+        # reusing the first result makes it the most recently used
+        with sqlite3.connect(cache.path) as conn:
+            conn.execute("UPDATE results SET last_used = last_used - 10")
+        _extract(pm, cache, sha256="hash0")
+        assert cache.prune(2 * entry_size) == 2
+        assert [
+            sha256
+            for sha256 in ("hash0", "hash1", "hash2", "hash3")
+            if cache.lookup(sha256, ["TEST"])
+        ] == [
+            "hash0",
+            "hash3",
+        ]
+        assert cache.clear() == 2
+        assert cache.stats()["entries"] == 0
+
+
+def test_plugin_version_from_source_checkout(tmp_path, pm, monkeypatch):
+    def not_installed(name):
+        raise importlib.metadata.PackageNotFoundError(name)
+
+    monkeypatch.setattr(importlib.metadata, "version", not_installed)
+    monkeypatch.setattr(surfactant, "__version__", "1.2.3.dev4")
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        assert cache.get_plugin_key(pm, pm.get_plugin("cached_plugin"))[1] == "1.2.3.dev4"
+    # without any version, the plugin's results aren't cached
+    monkeypatch.setattr(surfactant, "__version__", "")
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        assert cache.get_plugin_key(pm, pm.get_plugin("cached_plugin")) is None
+        _extract(pm, cache)
+        assert (cache.hits, cache.misses) == (0, 0)
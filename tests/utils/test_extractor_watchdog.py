@@ -0,0 +1,168 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import os
+import queue
+import time
+from pathlib import Path
+
+import pluggy
+import pytest
+
+import surfactant.plugin
+from surfactant.extraction_cache import ExtractionCache
+from surfactant.extractor_watchdog import ExtractorWatchdog, is_timeout_note
+from surfactant.infoextractors import file_decompression
+from surfactant.plugin import hookspecs
+from surfactant.sbomtypes import SBOM, Software
+
+
+class SlowPlugin:  # pylint: disable=too-few-public-methods
+    @surfactant.plugin.hookimpl
+    def extract_file_info(self, software, filename, software_field_hints, context_queue):
+        if "extract" in filename:
+            # start extracting an archive, leaving the directory's location next to the file
+            extract_dir = file_decompression.create_extract_dir()
+            Path(extract_dir, "partial.bin").write_bytes(b"partial")
+            Path(filename).write_text(extract_dir)
+        if "slow" in filename:
+            time.sleep(30)
+        software.name = "sandboxed"
+        software_field_hints.append(("version", "1.0", 50))
+        context_queue.put(filename)
+        return {"slowPlugin": filename}
+
+
+class FailingPlugin:  # pylint: disable=too-few-public-methods
+    @surfactant.plugin.hookimpl
+    def extract_file_info(self, filename):
+        if "fail" in filename:
+            raise ValueError(f"bad input: {filename}")
+
+
+def make_test_plugin_manager() -> pluggy.PluginManager:
+    # module level, so the sandbox process can create the same plugin manager
+    pm = pluggy.PluginManager("surfactant")
+    pm.add_hookspecs(hookspecs)
+    pm.register(SlowPlugin(), name="slow_plugin")
+    pm.register(FailingPlugin(), name="failing_plugin")
+    return pm
+
+
+def _hook_kwargs(filename):
+    return {
+        "sbom": SBOM(),
+        "software": Software(sha256=filename),
+        "filename": filename,
+        "filetype": ["TEST"],
+        "context_queue": queue.Queue(),
+        "current_context": None,
+        "children": [],
+        "software_field_hints": [],
+        "omit_unrecognized_types": False,
+        "file_content": None,
+    }
+
+
+@pytest.fixture(name="pm")
+def fixture_pm():
+    return make_test_plugin_manager()
+
+
+def test_watchdog_runs_plugins_in_sandbox(pm):
+    with ExtractorWatchdog(default_timeout=20, pm_factory=make_test_plugin_manager) as watchdog:
+        watchdog.instrument(pm)
+        hook_kwargs = _hook_kwargs("fast.bin")
+        watchdog.start_file()
+        assert pm.hook.extract_file_info(**hook_kwargs) == [{"slowPlugin": "fast.bin"}]
+        # changes made in the sandbox are copied back
+        assert hook_kwargs["software"].name == "sandboxed"
+        assert hook_kwargs["software_field_hints"] == [("version", "1.0", 50)]
+        assert hook_kwargs["context_queue"].get_nowait() == "fast.bin"
+        # exceptions are passed on like a normal hook call
+        watchdog.start_file()
+        with pytest.raises(ValueError, match="bad input"):
+            pm.hook.extract_file_info(**_hook_kwargs("fail.bin"))
+
+
+def test_watchdog_times_out_plugin(pm):
+    with ExtractorWatchdog(
+        plugin_timeouts={"slow_plugin": 1.0}, pm_factory=make_test_plugin_manager
+    ) as watchdog:
+        watchdog.instrument(pm)
+        watchdog.start_file()
+        start = time.monotonic()
+        results = pm.hook.extract_file_info(**_hook_kwargs("slow.bin"))
+        assert time.monotonic() - start < 10
+        assert results == [
+            {
+                "extractorTimeout": {
+                    "plugin": "slow_plugin",
+                    "timeoutSeconds": 1.0,
+                    "limit": "extractor_seconds",
+                }
+            }
+        ]
+        assert watchdog.timeouts == 1
+        # the sandbox is restarted for the next file
+        watchdog.start_file()
+        assert pm.hook.extract_file_info(**_hook_kwargs("fast.bin")) == [{"slowPlugin": "fast.bin"}]
+
+
+def test_watchdog_file_budget(pm):
+    with ExtractorWatchdog(file_timeout=1.0, pm_factory=make_test_plugin_manager) as watchdog:
+        watchdog.instrument(pm)
+        watchdog.start_file()
+        results = pm.hook.extract_file_info(**_hook_kwargs("slow.bin"))
+        assert len(results) == 1 and is_timeout_note(results[0])
+        assert results[0]["extractorTimeout"]["limit"] == "file_seconds"
+        # the rest of the extractors are skipped once the budget is used up
+        assert pm.hook.extract_file_info(**_hook_kwargs("fail.bin")) == []
+
+
+def test_timeout_notes_not_cached(pm, tmp_path):
+    with (
+        ExtractorWatchdog(
+            plugin_timeouts={"slow_plugin": 1.0}, pm_factory=make_test_plugin_manager
+        ) as watchdog,
+        ExtractionCache(tmp_path / "cache.db") as cache,
+    ):
+        watchdog.instrument(pm)
+        hookimpl = next(
+            impl
+            for impl in pm.hook.extract_file_info.get_hookimpls()
+            if impl.plugin_name == "slow_plugin"
+        )
+        watchdog.start_file()
+        hook_kwargs = _hook_kwargs("slow.bin")
+        # pylint: disable-next=protected-access
+        result = cache._extract_and_store(hookimpl, ("slow_plugin", "1", "{}"), hook_kwargs)
+        assert is_timeout_note(result)
+        assert not cache.lookup("slow.bin", ["TEST"])
+
+
+def test_watchdog_removes_unfinished_extract_dirs(pm, tmp_path, monkeypatch):
+    created = []
+    create_extract_dir = file_decompression.create_extract_dir
+    monkeypatch.setattr(
+        file_decompression,
+        "create_extract_dir",
+        lambda: created.append(create_extract_dir()) or created[-1],
+    )
+    with ExtractorWatchdog(
+        plugin_timeouts={"slow_plugin": 1.0}, pm_factory=make_test_plugin_manager
+    ) as watchdog:
+        watchdog.instrument(pm)
+        # a directory that isn't used is removed once the extractor finishes
+        watchdog.start_file()
+        pm.hook.extract_file_info(**_hook_kwargs("fast.bin"))
+        assert created and not os.path.exists(created[-1])
+
+        # the directory an extractor was extracting to when it timed out is removed
+        marker = Path(tmp_path, "slow-extract.zip")
+        watchdog.start_file()
+        results = pm.hook.extract_file_info(**_hook_kwargs(str(marker)))
+        assert is_timeout_note(results[0])
+        assert marker.read_text() == created[-1]
+        assert not os.path.exists(created[-1])
@@ -0,0 +1,100 @@
+# Copyright 2025 Lawrence Livermore National Security, LLC
+# See the top-level LICENSE file for details.
+#
+# SPDX-License-Identifier: MIT
+import builtins
+import hashlib
+import inspect
+
+import pytest
+
+from surfactant import fileinfo
+from surfactant.configmanager import ConfigManager
+from surfactant.fileinfo import FileContent, calc_file_hashes, get_hash_algorithms, sha256sum
+from surfactant.plugin.manager import get_plugin_manager
+
+
+@pytest.mark.parametrize("threshold", [fileinfo.MMAP_THRESHOLD, 0])
+def test_file_content_matches_file(tmp_path, monkeypatch, threshold):
+    # a threshold of 0 forces the mmap code path
+    monkeypatch.setattr(fileinfo, "MMAP_THRESHOLD", threshold)
+    data = b"MZ\x90\x00" + bytes(range(256)) * 4
+    path = tmp_path / "sample.bin"
+    path.write_bytes(data)
+
+    with FileContent(path) as content:
+        assert content.size == len(data)
+        assert content.read() == data
+        assert content.read(2, 2) == data[2:4]
+        with content.open() as f:
+            assert f.read(2) == b"MZ"
+            f.seek(-4, 2)
+            assert f.read() == data[-4:]
+        assert calc_file_hashes(path, content) == calc_file_hashes(path)
+
+
+def test_file_content_empty_file(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    with FileContent(path) as content:
+        assert content.read() == b""
+        assert calc_file_hashes(path, content) == calc_file_hashes(path)
+
+
+def test_threaded_hashes_match_hashlib(tmp_path, monkeypatch):
+    # a threshold of 0 hashes with each algorithm in its own thread
+    monkeypatch.setattr(fileinfo, "THREADED_HASH_THRESHOLD", 0)
+    data = bytes(range(256)) * 8192
+    path = tmp_path / "large.bin"
+    path.write_bytes(data)
+    assert calc_file_hashes(path) == {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "md5": hashlib.md5(data).hexdigest(),
+    }
+    assert sha256sum(path) == hashlib.sha256(data).hexdigest()
+
+
+def test_hash_algorithms_setting(tmp_path, monkeypatch):
+    settings = {"hash_algorithms": "md5, crc32"}
+    monkeypatch.setattr(
+        ConfigManager(),
+        "get",
+        lambda section, option, fallback=None: settings.get(option, fallback),
+    )
+    # sha256 is always calculated, and unknown algorithms are ignored
+    assert get_hash_algorithms() == ("sha256", "md5")
+    path = tmp_path / "sample.bin"
+    path.write_bytes(b"sample")
+    hashes = calc_file_hashes(path)
+    assert hashes["sha256"] == hashlib.sha256(b"sample").hexdigest()
+    assert hashes["sha1"] is None
+    assert hashes["md5"] == hashlib.md5(b"sample").hexdigest()
+
+
+def test_hooks_use_shared_file_content(tmp_path, monkeypatch):
+    pm = get_plugin_manager()
+    # pluggy never passes arguments that have a default value to a hook implementation
+    for hook in (pm.hook.identify_file_type, pm.hook.extract_file_info):
+        for hookimpl in hook.get_hookimpls():
+            if "file_content" in inspect.signature(hookimpl.function).parameters:
+                assert "file_content" in hookimpl.argnames, hookimpl.plugin_name
+
+    path = tmp_path / "sample.hex"
+    path.write_bytes(b":10010000214601360121470136007EFE09D2190140\n:00000001FF\n")
+    opened = []
+    real_open = builtins.open
+
+    def recording_open(file, *args, **kwargs):
+        opened.append(str(file))
+        return real_open(file, *args, **kwargs)
+
+    with FileContent(str(path)) as content:
+        content.read()
+        monkeypatch.setattr(builtins, "open", recording_open)
+        filetype = pm.hook.identify_file_type(
+            filepath=str(path), context=None, file_content=content
+        )
+        monkeypatch.undo()
+    assert "INTEL_HEX" in filetype
+    assert str(path) not in opened